@@ -56,7 +56,17 @@ ALLOWED_HOSTS = os.environ.get("DJANGO_ALLOWED_HOSTS", "").split(",")
 IS_TESTING = os.environ.get("IS_TESTING", "False") == "True"
 IGDB_CLIENT_ID = os.environ.get("IGDB_CLIENT_ID", "dummy")
 IGDB_CLIENT_SECRET = os.environ.get("IGDB_CLIENT_SECRET", "dummy")
-IGDB_BASE_URL = "https://api.igdb.com/v4"
+# Se pueden apuntar al servidor local (manage.py igdb_standin) para pruebas de carga
+IGDB_BASE_URL = os.environ.get("IGDB_BASE_URL", "https://api.igdb.com/v4")
+TWITCH_TOKEN_URL = os.environ.get("TWITCH_TOKEN_URL", "https://id.twitch.tv/oauth2/token")
+# Cuota de IGDB compartida por todos los procesos (token bucket en Redis)
+IGDB_PETICIONES_POR_SEGUNDO = float(os.environ.get("IGDB_PETICIONES_POR_SEGUNDO", "4"))
+# Hilos del recorrido completo del catálogo (comparten la cuota anterior)
+IGDB_SYNC_HILOS = int(os.environ.get("IGDB_SYNC_HILOS", "4"))
+# Enruta detalle, tiempo, buscar_id y precios a sus vistas async. Solo tiene
+# sentido sirviendo por ASGI, p. ej.:
+#   gunicorn gestor_videojuegos.asgi:application -k uvicorn.workers.UvicornWorker
+VISTAS_ASYNC = os.environ.get("VISTAS_ASYNC", "False") == "True"
 
 # Application definition
 
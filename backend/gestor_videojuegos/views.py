@@ -1,16 +1,23 @@
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 
+from juegos.cache_igdb import controlar_sincronizacion, estado_sincronizacion
+
+
 @api_view(["GET", "POST"])
-@permission_classes([AllowAny])
-def forzar_cache_juegos(request):
+@permission_classes([IsAdminUser])
+def sincronizacion_catalogo(request):
     """
-    Endpoint obsoleto.
-    El sistema ahora usa caché bajo demanda.
+    Estado del trabajador de sincronización con IGDB (fase, tramos, ritmo,
+    llamadas, ETA y errores). Con POST aplica una acción:
+    {"accion": "iniciar" | "pausar" | "reanudar", "modo": "incremental" | "completa"}
     """
-    return Response({
-        "message": "Sistema de caché actualizado a bajo demanda. No es necesario forzar actualización.",
-        "descargando": False,
-        "completado": True
-    })
+    if request.method == "POST":
+        try:
+            controlar_sincronizacion(
+                request.data.get("accion"), request.data.get("modo", "incremental")
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+    return Response(estado_sincronizacion())
@@ -10,6 +10,13 @@ from .models import (
     Planificacion,
     PlanificacionCompletada,
     JuegoDev,
+    Idioma,
+    EstadoSincronizacion,
+    PopularidadJuego,
+    Genero,
+    Plataforma,
+    Tema,
+    Compania,
 )
 
 
@@ -20,4 +27,10 @@ admin.site.register(DuracionJuego)
 admin.site.register(Planificacion)
 admin.site.register(PlanificacionCompletada)
 admin.site.register(JuegoDev)
-
+admin.site.register(Idioma)
+admin.site.register(EstadoSincronizacion)
+admin.site.register(PopularidadJuego)
+admin.site.register(Genero)
+admin.site.register(Plataforma)
+admin.site.register(Tema)
+admin.site.register(Compania)
@@ -4,17 +4,11 @@ from django.apps import AppConfig
 
 
 class JuegosConfig(AppConfig):
-    """Inicializa la app y arranca la programación de la caché."""
+    """Configuración de la app.
+
+    No arranca hilos: la sincronización con IGDB es un proceso aparte
+    (``manage.py sincronizar_catalogo``).
+    """
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "juegos"
-
-    def ready(self):
-        import os
-
-        if os.environ.get("DISABLE_IGDB_CACHE"):
-            return
-
-        from .cache_igdb import iniciar_programacion
-
-        iniciar_programacion()
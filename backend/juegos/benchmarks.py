@@ -0,0 +1,440 @@
+"""Escenarios de benchmark del catálogo, ejecutables con ``manage.py benchmark``.
+
+Cada escenario recibe las opciones del comando y devuelve un diccionario con
+las métricas a mostrar. No consumen cuota de IGDB: simulan las respuestas.
+"""
+
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import requests
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+
+from .igdb_client import igdb
+from .models import Juego
+
+ESCENARIOS = {}
+
+
+def escenario(nombre):
+    """Registra una función como escenario de benchmark."""
+    def decorador(func):
+        ESCENARIOS[nombre] = func
+        return func
+    return decorador
+
+
+def _respuesta_json(datos):
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = json.dumps(datos).encode()
+    return resp
+
+
+class _IGDBSimulado:
+    """Sustituye ``igdb.post`` contando llamadas y añadiendo latencia fija."""
+
+    def __init__(self, responder, latencia):
+        self.responder = responder
+        self.latencia = latencia
+        self.llamadas = 0
+        self._lock = threading.Lock()
+
+    def post(self, endpoint, cuerpo, **_):
+        with self._lock:
+            self.llamadas += 1
+        time.sleep(self.latencia)
+        return _respuesta_json(self.responder(endpoint, cuerpo))
+
+
+def _concurrente(n, func):
+    """Lanza ``n`` hilos que ejecutan ``func`` a la vez y devuelve los segundos."""
+    barrera = threading.Barrier(n)
+
+    def tarea():
+        barrera.wait()
+        try:
+            func()
+        finally:
+            connection.close()
+
+    hilos = [threading.Thread(target=tarea) for _ in range(n)]
+    inicio = time.perf_counter()
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    return time.perf_counter() - inicio
+
+
+@escenario("single_flight")
+def bench_single_flight(n=50, latencia=0.2, **_):
+    """N peticiones concurrentes al detalle de un juego con la caché vacía."""
+    from .igdb_views.services import (
+        _descargar_detalle_juego,
+        _detalle_cache_key,
+        obtener_detalle_juego,
+    )
+
+    juego_id = 999_999_001
+    clave = _detalle_cache_key(juego_id)
+    resultados = {"concurrencia": n, "latencia_igdb_s": latencia}
+    modos = (
+        ("sin_coalescencia", _descargar_detalle_juego),
+        ("single_flight", obtener_detalle_juego),
+    )
+    try:
+        for modo, func in modos:
+            cache.delete(clave)
+            simulado = _IGDBSimulado(
+                lambda endpoint, cuerpo: [{"id": juego_id, "name": "Benchmark"}],
+                latencia,
+            )
+            with patch.object(igdb, "post", simulado.post):
+                segundos = _concurrente(n, lambda: func(juego_id))
+            resultados[f"{modo}_llamadas_igdb"] = simulado.llamadas
+            resultados[f"{modo}_segundos"] = round(segundos, 3)
+    finally:
+        cache.delete(clave)
+        Juego.objects.filter(id=juego_id).delete()
+    return resultados
+
+
+# Hilos equivalentes a ``gunicorn -w 4`` con workers síncronos
+TRABAJADORES_SYNC = 4
+
+
+@escenario("async")
+def bench_async(n=50, latencia=0.2, **_):
+    """N consultas a un IGDB local con latencia: cliente síncrono frente a async.
+
+    El síncrono usa ``TRABAJADORES_SYNC`` hilos, como otros tantos workers de
+    gunicorn bloqueados en cada llamada; el asíncrono mantiene las N en vuelo
+    en un único event loop. Limitador y circuito se desactivan para medir
+    solo el transporte.
+    """
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    from .igdb_client import AsyncIGDBClient, IGDBClient
+    from .igdb_rate_limit import limitador
+    from .standin.catalogo import Catalogo
+    from .standin.servidor import IGDBStandin, arrancar_en_hilo
+
+    async def sin_espera(*args, **kwargs):
+        return 0
+
+    servidor, url = arrancar_en_hilo(IGDBStandin(catalogo=Catalogo(1000), latencia=latencia))
+    base_url = f"{url}/v4"
+    cuerpo = lambda i: f"fields name; where id = {i % 1000 + 1};"
+    resultados = {"peticiones": n, "latencia_igdb_s": latencia}
+    try:
+        with override_settings(IS_TESTING=False), \
+                patch("juegos.igdb_client.obtener_token_igdb", return_value="standin"), \
+                patch.object(limitador, "adquirir", return_value=0), \
+                patch.object(limitador, "aadquirir", sin_espera), \
+                patch("juegos.igdb_client.circuito"):
+            sincrono = IGDBClient(base_url=base_url)
+            inicio = time.perf_counter()
+            with ThreadPoolExecutor(TRABAJADORES_SYNC) as pool:
+                list(pool.map(lambda i: sincrono.consultar("games", cuerpo(i)), range(n)))
+            segundos_sync = time.perf_counter() - inicio
+
+            asincrono = AsyncIGDBClient(base_url=base_url, tamano_pool=n)
+
+            async def todas():
+                await asyncio.gather(*(asincrono.consultar("games", cuerpo(i)) for i in range(n)))
+
+            inicio = time.perf_counter()
+            asyncio.run(todas())
+            segundos_async = time.perf_counter() - inicio
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+    resultados["sync_segundos"] = round(segundos_sync, 3)
+    resultados["sync_peticiones_por_segundo"] = round(n / segundos_sync, 1)
+    resultados["async_segundos"] = round(segundos_async, 3)
+    resultados["async_peticiones_por_segundo"] = round(n / segundos_async, 1)
+    return resultados
+
+
+def _guardar_fila_a_fila(juegos):
+    """Ruta anterior a ``ingesta``: ``update_or_create`` por juego."""
+    from .ingesta import CAMPOS_ACTUALIZABLES, transformar
+
+    for j in juegos:
+        juego = transformar(j)
+        Juego.objects.update_or_create(
+            id=juego.id,
+            defaults={c: getattr(juego, c) for c in CAMPOS_ACTUALIZABLES if c != "updated_at"},
+        )
+
+
+@escenario("ingesta")
+def bench_ingesta(n=5000, **_):
+    """Filas por segundo guardando N juegos fila a fila frente a en bloque.
+
+    Se mide la inserción inicial, una pasada que cambia todas las filas y otra
+    con los mismos datos (que la ingesta en bloque descarta por hash), en
+    lotes de 500 como la sincronización.
+    """
+    from .cache_igdb import BATCH_SIZE, CAMPOS_SYNC
+    from .ingesta import guardar_juegos
+    from .standin.apicalypse import proyectar
+    from .standin.catalogo import Catalogo
+
+    desplazamiento = 900_000_000
+    catalogo = Catalogo(n)
+    juegos = [
+        {**proyectar(catalogo.juegos.documento(i), CAMPOS_SYNC.split(",")), "id": desplazamiento + i}
+        for i in range(1, n + 1)
+    ]
+    cambiados = [{**j, "summary": f"{j.get('summary')} (editado)"} for j in juegos]
+    pasadas = (("insercion", juegos), ("actualizacion", cambiados), ("sin_cambios", cambiados))
+    resultados = {"filas": n}
+    modos = (("fila_a_fila", _guardar_fila_a_fila), ("bulk", guardar_juegos))
+    try:
+        for modo, guardar in modos:
+            Juego.objects.filter(id__gt=desplazamiento).delete()
+            for pasada, datos in pasadas:
+                inicio = time.perf_counter()
+                for i in range(0, n, BATCH_SIZE):
+                    guardar(datos[i:i + BATCH_SIZE])
+                segundos = time.perf_counter() - inicio
+                resultados[f"{modo}_{pasada}_filas_por_segundo"] = round(n / segundos)
+    finally:
+        Juego.objects.filter(id__gt=desplazamiento).delete()
+    return resultados
+
+
+def _pagina_sin_cache(parametros, calcular):
+    """Sustituto de ``cache_listados.obtener_pagina`` que siempre va a la DB."""
+    from .cache_listados import serializar
+
+    juegos, datos = calcular()
+    return [serializar(j) for j in juegos], datos
+
+
+def _sin_cache_listados():
+    """Mide el listado contra la DB, sin la caché de páginas delante."""
+    return patch("juegos.igdb_views.views.obtener_pagina", _pagina_sin_cache)
+
+
+def _percentiles(tiempos):
+    ordenados = sorted(tiempos)
+    return {
+        "p50_ms": round(ordenados[len(ordenados) // 2] * 1000, 2),
+        "p95_ms": round(ordenados[int(len(ordenados) * 0.95)] * 1000, 2),
+    }
+
+
+@escenario("busqueda")
+def bench_busqueda(n=200, **_):
+    """Latencia de ``listar_juegos`` buscando por nombre sobre el catálogo local.
+
+    Las consultas son nombres existentes truncados (``"ancient ar"``) para
+    ejercitar la búsqueda por prefijo. Se compara con la ruta anterior:
+    ``name__icontains``, un ``count()`` y la página ordenada por popularidad.
+    El fallback a IGDB se desactiva para medir solo la base de datos.
+    """
+    import random
+
+    from rest_framework.test import APIRequestFactory
+
+    from .busqueda import palabras
+    from .igdb_views.views import listar_juegos
+
+    nombres = list(Juego.vigentes.order_by("?").values_list("name", flat=True)[:n])
+    if not nombres:
+        return {"error": "Catálogo local vacío"}
+    azar = random.Random(0)
+    consultas = []
+    for nombre in nombres:
+        trozos = palabras(nombre) or [nombre]
+        ultima = trozos[-1][:max(3, azar.randint(1, len(trozos[-1])))]
+        consultas.append(" ".join(trozos[:-1] + [ultima]))
+
+    def anterior(q):
+        qs = Juego.vigentes.filter(name__icontains=q)
+        qs.count()
+        list(qs.order_by("-popularidad")[:60])
+        qs.count()
+
+    factory = APIRequestFactory()
+    modos = (
+        ("icontains", anterior),
+        ("busqueda", lambda q: listar_juegos(factory.get("/api/juegos/populares/", {"q": q}))),
+    )
+    resultados = {"juegos": Juego.vigentes.count(), "consultas": len(consultas), "motor": connection.vendor}
+    with patch("juegos.igdb_views.services._buscar_en_igdb_y_guardar"), _sin_cache_listados():
+        for modo, func in modos:
+            tiempos = []
+            for q in consultas:
+                inicio = time.perf_counter()
+                func(q)
+                tiempos.append(time.perf_counter() - inicio)
+            for clave, valor in _percentiles(tiempos).items():
+                resultados[f"{modo}_{clave}"] = valor
+    return resultados
+
+
+@escenario("filtros")
+def bench_filtros(n=200, **_):
+    """Latencia de ``listar_juegos`` filtrando por género, plataforma y ambos.
+
+    Los ids se eligen al azar entre los de las tablas de clasificaciones, así
+    que hace falta un catálogo con ellas rellenas (``reconstruir_clasificaciones``).
+    """
+    import random
+
+    from rest_framework.test import APIRequestFactory
+
+    from .igdb_views.views import listar_juegos
+    from .models import Genero, Plataforma
+
+    generos = list(Genero.objects.values_list("id", flat=True))
+    plataformas = list(Plataforma.objects.values_list("id", flat=True))
+    if not generos or not plataformas:
+        return {"error": "Sin clasificaciones: ejecuta reconstruir_clasificaciones"}
+    azar = random.Random(0)
+    factory = APIRequestFactory()
+    modos = (
+        ("genero", lambda: {"genero": azar.choice(generos)}),
+        ("plataforma", lambda: {"plataforma": azar.choice(plataformas)}),
+        ("genero_y_plataforma", lambda: {
+            "genero": azar.choice(generos), "plataforma": azar.choice(plataformas),
+        }),
+    )
+    resultados = {"juegos": Juego.vigentes.count(), "consultas": n, "motor": connection.vendor}
+    for modo, parametros in modos:
+        tiempos = []
+        for _ in range(n):
+            peticion = factory.get("/api/juegos/populares/", parametros())
+            inicio = time.perf_counter()
+            with _sin_cache_listados():
+                listar_juegos(peticion)
+            tiempos.append(time.perf_counter() - inicio)
+        for clave, valor in _percentiles(tiempos).items():
+            resultados[f"{modo}_{clave}"] = valor
+    return resultados
+
+
+@escenario("paginacion")
+def bench_paginacion(n=20, **_):
+    """Milisegundos por página de ``listar_juegos`` con ``pagina`` frente a ``cursor``.
+
+    Se mide la primera página, una intermedia y la última del orden por
+    popularidad (media de N peticiones). El cursor de cada página se construye
+    a partir de la fila anterior, como si se hubiera llegado navegando.
+    """
+    from rest_framework.test import APIRequestFactory
+
+    from .igdb_views.services import buscar_y_cachear, claves_orden
+    from .igdb_views.views import listar_juegos
+    from .paginacion import SIGUIENTE, codificar
+
+    por_pagina = 60
+    total = Juego.vigentes.filter(es_adulto=False).count()
+    ultima = max((total - 1) // por_pagina + 1, 1)
+    claves = claves_orden()
+    factory = APIRequestFactory()
+
+    def medir(parametros):
+        inicio = time.perf_counter()
+        with _sin_cache_listados():
+            for _ in range(n):
+                listar_juegos(factory.get(
+                    "/api/juegos/populares/", {"por_pagina": por_pagina, **parametros}
+                ))
+        return round((time.perf_counter() - inicio) / n * 1000, 2)
+
+    resultados = {"juegos": total, "peticiones_por_medida": n}
+    for pagina in sorted({1, ultima // 2 or 1, ultima}):
+        cursor = ""
+        if pagina > 1:
+            previa = buscar_y_cachear()[(pagina - 1) * por_pagina - 1]
+            cursor = codificar(claves, previa, SIGUIENTE)
+        resultados[f"pagina_{pagina}_offset_ms"] = medir({"pagina": pagina})
+        resultados[f"pagina_{pagina}_cursor_ms"] = medir({"cursor": cursor})
+    return resultados
+
+
+@escenario("conteos")
+def bench_conteos(n=50, **_):
+    """Milisegundos de ``COUNT(*)`` frente a ``juegos.conteos.contar`` en caliente.
+
+    Cuenta el listado sin filtros y N combinaciones de género del catálogo.
+    """
+    from .conteos import contar
+    from .igdb_views.services import buscar_y_cachear
+    from .models import Genero
+    from .version_catalogo import incrementar_version
+
+    generos = list(Genero.objects.values_list("id", flat=True)[:n]) or [None]
+    casos = [{}] + [{"genero": str(g)} for g in generos if g is not None]
+
+    def medir(func):
+        inicio = time.perf_counter()
+        for filtros in casos:
+            func(buscar_y_cachear(**filtros), filtros)
+        return round((time.perf_counter() - inicio) / len(casos) * 1000, 2)
+
+    # Versión nueva: ninguno de los conteos está en caché
+    incrementar_version()
+    resultados = {"casos": len(casos), "motor": connection.vendor}
+    resultados["count_ms"] = medir(lambda qs, filtros: qs.count())
+    resultados["contar_en_frio_ms"] = medir(lambda qs, filtros: contar(qs, **filtros))
+    resultados["contar_en_caliente_ms"] = medir(lambda qs, filtros: contar(qs, **filtros))
+    return resultados
+
+
+@escenario("cache_listados")
+def bench_cache_listados(n=500, **_):
+    """Latencia y consultas SQL de N peticiones anónimas al listado.
+
+    Las peticiones se reparten entre unas pocas decenas de combinaciones de
+    orden y página, como el tráfico de ``/api/juegos/populares/``. Se compara
+    sin la caché de páginas y con ella tras invalidarla (``INCR`` de versión).
+    """
+    import random
+
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIRequestFactory
+
+    from .igdb_views.views import listar_juegos
+    from .version_catalogo import incrementar_version
+
+    azar = random.Random(0)
+    combinaciones = [
+        {"orden": orden, "pagina": pagina}
+        for orden in ("popular", "fecha", "nombre_asc")
+        for pagina in range(1, 11)
+    ]
+    peticiones = [azar.choice(combinaciones) for _ in range(n)]
+    factory = APIRequestFactory()
+
+    def medir():
+        tiempos = []
+        with CaptureQueriesContext(connection) as consultas:
+            for parametros in peticiones:
+                inicio = time.perf_counter()
+                listar_juegos(factory.get("/api/juegos/populares/", parametros))
+                tiempos.append(time.perf_counter() - inicio)
+        return tiempos, len(consultas)
+
+    resultados = {"peticiones": n, "combinaciones": len(combinaciones)}
+    with _sin_cache_listados():
+        tiempos, consultas = medir()
+    resultados.update({f"sin_cache_{k}": v for k, v in _percentiles(tiempos).items()})
+    resultados["sin_cache_consultas_sql"] = consultas
+
+    incrementar_version()
+    tiempos, consultas = medir()
+    resultados.update({f"con_cache_{k}": v for k, v in _percentiles(tiempos).items()})
+    resultados["con_cache_consultas_sql"] = consultas
+    return resultados
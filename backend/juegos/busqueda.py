@@ -0,0 +1,87 @@
+"""Búsqueda de juegos por nombre.
+
+En MySQL se usa el índice FULLTEXT ``juego_name_ft`` (migración 0017) en modo
+booleano: cada palabra de la consulta es obligatoria y se busca como prefijo
+(``+witch* +wild*``), y ``MATCH ... AGAINST`` da la relevancia. Así se evita
+el ``LIKE '%q%'`` de ``name__icontains``, que recorre la tabla entera.
+
+InnoDB no indexa palabras de menos de ``innodb_ft_min_token_size`` letras ni
+las de su lista de palabras vacías, así que esas no se exigen. Si no queda
+ninguna palabra indexable (``"ff"``) se busca por prefijo del nombre, que sí
+usa el índice normal de ``name``.
+
+Con otros motores (sqlite en desarrollo y tests) cada palabra se filtra con
+``icontains`` y la relevancia premia la coincidencia exacta y la de prefijo.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+NOMBRE_INDICE_FULLTEXT = "juego_name_ft"
+# Valor por defecto de ``innodb_ft_min_token_size``
+MIN_LONGITUD_PALABRA = 3
+# Lista de palabras vacías por defecto de InnoDB
+PALABRAS_VACIAS = frozenset({
+    "a", "about", "an", "are", "as", "at", "be", "by", "com", "de", "en",
+    "for", "from", "how", "i", "in", "is", "it", "la", "of", "on", "or",
+    "that", "the", "this", "to", "was", "what", "when", "where", "who",
+    "will", "with", "und", "www",
+})
+_PALABRA = re.compile(r"\w+")
+
+
+def normalizar(q):
+    """Consulta en minúsculas y con los espacios colapsados, tal como se busca.
+
+    Conserva los signos (``"f.f"`` no es ``"f f"`` en la búsqueda por
+    prefijo), así que sirve de clave para las cachés de resultados.
+    """
+    return " ".join(q.lower().split())
+
+
+def palabras(q):
+    """Palabras de la consulta, en minúsculas y sin signos."""
+    return _PALABRA.findall(q.lower())
+
+
+def _expresion_booleana(q):
+    indexables = [
+        p for p in palabras(q)
+        if len(p) >= MIN_LONGITUD_PALABRA and p not in PALABRAS_VACIAS
+    ]
+    return " ".join(f"+{p}*" for p in indexables)
+
+
+def filtrar_por_nombre(qs, q):
+    """Filtra ``qs`` por nombre y le añade la anotación ``relevancia``.
+
+    Mayor ``relevancia`` significa mejor coincidencia; la escala depende del
+    motor, así que solo sirve para ordenar.
+    """
+    q = normalizar(q)
+    if connection.vendor == "mysql":
+        expresion = _expresion_booleana(q)
+        if not expresion:
+            return qs.filter(name__istartswith=q).annotate(
+                relevancia=Value(1, output_field=IntegerField())
+            )
+        tabla = qs.model._meta.db_table
+        relevancia = RawSQL(
+            f"MATCH({tabla}.name) AGAINST (%s IN BOOLEAN MODE)", [expresion]
+        )
+        return qs.annotate(relevancia=relevancia).filter(relevancia__gt=0)
+
+    condicion = Q()
+    for palabra in palabras(q) or [q]:
+        condicion &= Q(name__icontains=palabra)
+    return qs.filter(condicion).annotate(
+        relevancia=Case(
+            When(name__iexact=q, then=Value(3)),
+            When(name__istartswith=q, then=Value(2)),
+            default=Value(1),
+            output_field=IntegerField(),
+        )
+    )
@@ -1,80 +1,445 @@
-"""Módulo encargado de sincronizar el catálogo de IGDB con la base de datos local."""
+"""Módulo encargado de sincronizar el catálogo de IGDB con la base de datos local.
+
+En régimen normal la sincronización es incremental: solo pide a IGDB los
+juegos con ``updated_at`` posterior a la marca guardada en
+``EstadoSincronizacion``, así que su coste depende del número de cambios y no
+del tamaño del catálogo. El recorrido completo solo se hace bajo demanda
+(``solicitar_sincronizacion_completa``).
+
+La sincronización corre en un proceso propio (``manage.py
+sincronizar_catalogo``), nunca dentro de los workers web. Puede haber varias
+instancias: solo la que tiene la concesión de ``lider_sync`` trabaja.
+"""
 
 import logging
 import threading
 import time
-from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from django.conf import settings
-from .igdb_views.services import _guardar_juegos_batch, _headers
-from .igdb_views.utils import IGDB_BASE_URL, safe_post
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.utils import timezone
+
+from . import ingesta
+from .control_sync import despertar, esperar, esperar_si_pausada, pausada, pausar, reanudar
+from .idiomas import sincronizar_idiomas
+from .igdb_client import igdb
+from .igdb_rate_limit import FONDO
+from .igdb_views.services import _guardar_juegos_batch
+from .lider_sync import Concesion
+from .models import EstadoSincronizacion
+from .popularidad import popularidad_pendiente, sincronizar_popularidad
+from .reconciliacion import reconciliacion_pendiente, reconciliar
+from .version_catalogo import version_aplazada
 
 logger = logging.getLogger(__name__)
 
 # Configuración
 BATCH_SIZE = 500
 DELAY_BETWEEN_BATCHES = 0.5  # Segundos de espera entre lotes para no saturar CPU/Red
-_SYNC_THREAD_STARTED = False
-_STOP_SYNC = False
+# Pausa entre pasadas incrementales
+INTERVALO_INCREMENTAL = 15 * 60
+# Al terminar un recorrido completo la marca se sitúa un poco antes de su
+# inicio para no perder cambios ocurridos durante el propio recorrido
+MARGEN_MARCA = 3600
+ESTADO_CATALOGO = "catalogo"
+# Puntos de control de cada tramo de ids durante un recorrido completo
+PREFIJO_TRAMO = f"{ESTADO_CATALOGO}:tramo:"
+# Más tramos que hilos para repartir bien la carga si unos tienen más juegos
+TRAMOS_POR_HILO = 4
+# Clasificaciones expandidas con su nombre para rellenar ``juegos.clasificaciones``;
+# de ``involved_companies`` hace falta la compañía, no solo el id de la participación,
+# y ``age_ratings.rating`` decide ``es_adulto``
+CAMPOS_SYNC = (
+    "id,name,slug,summary,cover.url,first_release_date,updated_at,"
+    "total_rating,total_rating_count,genres.name,platforms.name,themes.name,"
+    "involved_companies.company.name,involved_companies.developer,"
+    "involved_companies.publisher,age_ratings.rating,language_supports.language"
+)
+
+# Clave con el propietario, la fase y la hora del último latido del líder
+CLAVE_LATIDO = "igdb_sync:latido"
+# Cada cuánto reintenta tomar la concesión una instancia en espera
+ESPERA_CANDIDATO = 30
+# Errores recientes publicados en el latido
+MAX_ERRORES = 20
+# Fases del trabajador en las que está descargando de IGDB
+FASES_DESCARGA = ("completa", "incremental", "popularidad", "reconciliacion")
+
+# Detiene la pasada en curso (al terminar o al perder la concesión)
+_STOP_SYNC = threading.Event()
+# Detiene el trabajador por completo
+_TERMINAR = threading.Event()
+_fase = None
+_inicio_lider = None
+_errores = deque(maxlen=MAX_ERRORES)
+
 
 def stop_sync():
-    """Detiene la sincronización en el próximo ciclo."""
-    global _STOP_SYNC
-    _STOP_SYNC = True
+    """Detiene la sincronización en el próximo ciclo y termina el trabajador."""
+    _TERMINAR.set()
+    _STOP_SYNC.set()
 
-def _worker_sync_catalog():
-    """
-    Tarea de fondo que recorre IODB y actualiza la base de datos local.
-    Diseñado para ser interrumpible y 'amable' con los recursos.
-    """
-    global _STOP_SYNC
-    logger.info("Iniciando sincronización de catálogo IGDB en segundo plano...")
-
-    offset = 0
-    # Intentar retomar desde donde quedamos o verificar total (simple start from 0 for robustness)
-    # Para optimización futura: Guardar offset en DB o Cache.
-    
-    headers = _headers()
-    fields = (
-        "id,name,slug,summary,cover.url,first_release_date,"
-        "total_rating,total_rating_count,genres,platforms,involved_companies,themes"
+
+def _registrar_error(mensaje):
+    logger.error(mensaje)
+    _errores.append({"hora": time.time(), "error": mensaje})
+
+
+def _estado():
+    estado, _ = EstadoSincronizacion.objects.get_or_create(nombre=ESTADO_CATALOGO)
+    return estado
+
+
+def solicitar_sincronizacion_completa():
+    """Pide un recorrido completo del catálogo en la próxima pasada."""
+    EstadoSincronizacion.objects.update_or_create(
+        nombre=ESTADO_CATALOGO, defaults={"completa_solicitada": True}
     )
-    
-    while not _STOP_SYNC:
-        try:
-            query = f"fields {fields}; limit {BATCH_SIZE}; offset {offset}; sort id asc;"
-            res = safe_post(f"{IGDB_BASE_URL}/games", headers, query)
-            
-            if res.status_code != 200:
-                logger.error(f"Error IGDB Sync: {res.status_code} - {res.text}")
-                time.sleep(60) # Esperar un minuto si hay error de API
-                continue
-            
-            juegos = res.json()
+
+
+def _pedir_lote(where, sort):
+    query = f"fields {CAMPOS_SYNC}; where {where}; sort {sort}; limit {BATCH_SIZE};"
+    return igdb.consultar("games", query, prioridad=FONDO)
+
+
+def _guardar_lote(juegos):
+    r = _guardar_juegos_batch(juegos)
+    logger.info(
+        f"Lote de {r['procesados']} juegos: {r['insertados']} nuevos, "
+        f"{r['actualizados']} actualizados, {r['sin_cambios']} sin cambios, "
+        f"{len(r['fallidos'])} fallidos"
+    )
+    return r
+
+
+@version_aplazada()
+def sincronizar_incremental():
+    """Descarga los juegos modificados desde la última marca y la avanza.
+
+    IGDB solo ordena por un campo, así que se alternan dos consultas: los
+    juegos que comparten exactamente la marca se recorren por id y el resto
+    por ``updated_at``. La marca se guarda tras cada lote, de modo que una
+    interrupción se reanuda en el último lote confirmado. Devuelve el número
+    de juegos procesados.
+    """
+    estado = _estado()
+    total = 0
+    while esperar_si_pausada(_STOP_SYNC):
+        # 1. Juegos con ``updated_at`` igual a la marca aún no vistos
+        juegos = _pedir_lote(
+            f"updated_at = {estado.marca_updated_at} & id > {estado.ultimo_id}", "id asc"
+        )
+        if juegos:
+            _guardar_lote(juegos)
+            estado.ultimo_id = max(j["id"] for j in juegos)
+        else:
+            # 2. Siguiente tramo de cambios posteriores a la marca
+            juegos = _pedir_lote(f"updated_at > {estado.marca_updated_at}", "updated_at asc")
             if not juegos:
-                logger.info("Sincronización IGDB completada (no más juegos).")
                 break
-                
-            _guardar_juegos_batch(juegos)
-            logger.info(f"Sincronizados {len(juegos)} juegos. Offset actual: {offset}")
-            
-            offset += len(juegos)
-            time.sleep(DELAY_BETWEEN_BATCHES)
-            
+            _guardar_lote(juegos)
+            marca = max(j["updated_at"] for j in juegos)
+            estado.marca_updated_at = marca
+            if len(juegos) < BATCH_SIZE:
+                # Lote incompleto: tenemos todos los juegos con esa marca
+                estado.ultimo_id = max(j["id"] for j in juegos if j["updated_at"] == marca)
+            else:
+                # Puede haber más con la misma marca fuera del lote; el paso 1
+                # los recorrerá por id (repite unos pocos, la escritura es idempotente)
+                estado.ultimo_id = 0
+        estado.save(update_fields=["marca_updated_at", "ultimo_id", "actualizado"])
+        total += len(juegos)
+        _STOP_SYNC.wait(DELAY_BETWEEN_BATCHES)
+
+    if total:
+        logger.info(
+            f"Sincronización incremental: {total} juegos, marca updated_at={estado.marca_updated_at}"
+        )
+    return total
+
+
+def _planificar_tramos():
+    """Divide el espacio de ids de IGDB en tramos y crea su punto de control."""
+    inicio = int(time.time())
+    ultimo = igdb.consultar("games", "fields id; sort id desc; limit 1;", prioridad=FONDO)
+    if not ultimo:
+        return []
+    limite = ultimo[0]["id"] + 1
+    hilos = getattr(settings, "IGDB_SYNC_HILOS", 4)
+    tamano = -(-ultimo[0]["id"] // (hilos * TRAMOS_POR_HILO))
+    tramos = [
+        EstadoSincronizacion(
+            nombre=f"{PREFIJO_TRAMO}{n}",
+            ultimo_id=desde - 1,
+            id_hasta=min(desde + tamano, limite),
+            # Marca que quedará al terminar, fijada al inicio del recorrido
+            marca_updated_at=inicio - MARGEN_MARCA,
+        )
+        for n, desde in enumerate(range(1, limite, tamano))
+    ]
+    EstadoSincronizacion.objects.bulk_create(tramos)
+    return tramos
+
+
+@version_aplazada()
+def _sincronizar_tramo(tramo):
+    """Recorre por id los juegos de un tramo guardando el avance tras cada lote."""
+    total = 0
+    try:
+        while tramo.ultimo_id + 1 < tramo.id_hasta and esperar_si_pausada(_STOP_SYNC):
+            juegos = _pedir_lote(
+                f"id >= {tramo.ultimo_id + 1} & id < {tramo.id_hasta}", "id asc"
+            )
+            if juegos:
+                _guardar_lote(juegos)
+                total += len(juegos)
+            if len(juegos) < BATCH_SIZE:
+                tramo.ultimo_id = tramo.id_hasta - 1
+            else:
+                tramo.ultimo_id = max(j["id"] for j in juegos)
+            EstadoSincronizacion.objects.filter(nombre=tramo.nombre).update(
+                ultimo_id=tramo.ultimo_id, actualizado=timezone.now()
+            )
+            _STOP_SYNC.wait(DELAY_BETWEEN_BATCHES)
+    finally:
+        # Cada hilo abre su propia conexión a la DB
+        connections.close_all()
+    return total
+
+
+def sincronizar_completo():
+    """Recorre todo el catálogo de IGDB y reinicia la marca incremental.
+
+    El espacio de ids se reparte en tramos (``where id >= a & id < b``) que
+    procesa en paralelo un pool de ``IGDB_SYNC_HILOS`` hilos; todos comparten
+    el limitador de IGDB. Cada tramo guarda su avance, así que un recorrido
+    interrumpido se reanuda tramo a tramo en la siguiente llamada. Devuelve
+    el número de juegos procesados.
+    """
+    tramos = list(EstadoSincronizacion.objects.filter(nombre__startswith=PREFIJO_TRAMO))
+    if tramos:
+        logger.info(f"Reanudando recorrido completo del catálogo IGDB ({len(tramos)} tramos)...")
+    else:
+        logger.info("Iniciando recorrido completo del catálogo IGDB...")
+        tramos = _planificar_tramos()
+
+    total = 0
+    fallos = 0
+    pendientes = [t for t in tramos if t.ultimo_id + 1 < t.id_hasta]
+    with ThreadPoolExecutor(max_workers=getattr(settings, "IGDB_SYNC_HILOS", 4)) as pool:
+        for futuro in as_completed([pool.submit(_sincronizar_tramo, t) for t in pendientes]):
+            try:
+                total += futuro.result()
+            except Exception as e:
+                _registrar_error(f"Error en un tramo del recorrido completo: {e}")
+                fallos += 1
+    if _STOP_SYNC.is_set() or fallos:
+        # Interrumpido: la marca no se toca, la petición sigue pendiente y
+        # los tramos conservan su avance
+        return total
+
+    marca = tramos[0].marca_updated_at if tramos else int(time.time()) - MARGEN_MARCA
+    with transaction.atomic():
+        EstadoSincronizacion.objects.filter(nombre__startswith=PREFIJO_TRAMO).delete()
+        EstadoSincronizacion.objects.update_or_create(
+            nombre=ESTADO_CATALOGO,
+            defaults={
+                "marca_updated_at": marca,
+                "ultimo_id": 0,
+                "completa_solicitada": False,
+                "ultima_completa": timezone.now(),
+            },
+        )
+    logger.info(f"Recorrido completo del catálogo IGDB terminado: {total} juegos.")
+    return total
+
+
+def _latir(concesion, fin):
+    """Renueva la concesión y publica el latido hasta que ``fin`` se active.
+
+    Si la concesión se pierde (Redis reiniciado, proceso congelado más de su
+    TTL) detiene la sincronización en curso para no competir con el nuevo líder.
+    """
+    intervalo = concesion.ttl / 3
+    while True:
+        if not concesion.renovar():
+            logger.warning("Concesión de sincronización perdida; se detiene la pasada en curso.")
+            _STOP_SYNC.set()
+            return
+        llamadas = igdb.metricas().values()
+        cache.set(
+            CLAVE_LATIDO,
+            {
+                "propietario": concesion.propietario,
+                "fase": _fase,
+                "desde": _inicio_lider,
+                "latido": time.time(),
+                "filas": ingesta.metricas(),
+                "igdb": {
+                    campo: sum(m[campo] for m in llamadas)
+                    for campo in ("llamadas", "errores", "limitadas")
+                },
+                "errores": list(_errores),
+            },
+            concesion.ttl * 2,
+        )
+        if fin.wait(intervalo):
+            return
+
+
+def _sincronizar_como_lider(una_vez):
+    """Bucle de sincronización mientras se conserve la concesión."""
+    global _fase
+    # Los idiomas se refrescan al tomar el liderazgo: son pocos y el detalle
+    # los resuelve en local
+    try:
+        sincronizar_idiomas()
+    except Exception as e:
+        _registrar_error(f"Error sincronizando idiomas de IGDB: {e}")
+
+    while not _STOP_SYNC.is_set():
+        espera = INTERVALO_INCREMENTAL
+        try:
+            if _estado().completa_solicitada:
+                _fase = "completa"
+                sincronizar_completo()
+            else:
+                _fase = "incremental"
+                sincronizar_incremental()
+            if popularidad_pendiente() and not _STOP_SYNC.is_set():
+                _fase = "popularidad"
+                sincronizar_popularidad(_STOP_SYNC)
+            if reconciliacion_pendiente() and not _STOP_SYNC.is_set():
+                _fase = "reconciliacion"
+                reconciliar(_STOP_SYNC)
+            _fase = "esperando"
         except Exception as e:
-            logger.error(f"Excepción en IGDB Sync: {e}")
-            time.sleep(60)
+            _registrar_error(f"Excepción en IGDB Sync: {e}")
+            _fase = "error"
+            espera = 60
+        if una_vez:
+            break
+        esperar(_STOP_SYNC, espera)
+
+
+def ejecutar_trabajador(concesion=None, una_vez=False):
+    """Proceso de sincronización: compite por la concesión y sincroniza si la gana.
 
-    logger.info("Hilo de sincronización IGDB detenido.")
+    Las instancias sin concesión esperan y lo reintentan, de modo que toman
+    el relevo cuando el líder termina o su concesión caduca. Con ``una_vez``
+    se hace un único intento y una única pasada. Termina con ``stop_sync``.
+    """
+    global _fase, _inicio_lider
+    concesion = concesion or Concesion()
+    _TERMINAR.clear()
+    while not _TERMINAR.is_set():
+        _STOP_SYNC.clear()
+        if not concesion.adquirir():
+            if una_vez:
+                logger.info(f"Sincronización en curso en {concesion.titular()}; no se hace nada.")
+                return False
+            _TERMINAR.wait(ESPERA_CANDIDATO)
+            continue
+
+        logger.info(f"Concesión de sincronización tomada por {concesion.propietario}.")
+        # Las métricas del latido cuentan desde que este proceso es líder
+        _inicio_lider = time.time()
+        ingesta.reiniciar_metricas()
+        igdb.reiniciar_metricas()
+        _errores.clear()
+        fin_latido = threading.Event()
+        latido = threading.Thread(target=_latir, args=(concesion, fin_latido), daemon=True)
+        latido.start()
+        try:
+            _sincronizar_como_lider(una_vez)
+        finally:
+            fin_latido.set()
+            latido.join()
+            _fase = None
+            concesion.liberar()
+            cache.delete(CLAVE_LATIDO)
+            logger.info("Concesión de sincronización liberada.")
+        if una_vez:
+            return True
+    return True
 
-def iniciar_programacion():
-    """Inicia el hilo de sincronización si no está corriendo."""
-    global _SYNC_THREAD_STARTED
-    if _SYNC_THREAD_STARTED:
-        return
-    
-    _SYNC_THREAD_STARTED = True
-    t = threading.Thread(target=_worker_sync_catalog, daemon=True)
-    t.start()
 
+def estado_sincronizacion():
+    """Resumen para administración: fase, tramos, ritmo, llamadas a IGDB y errores.
+
+    Se construye con el último latido del líder y los puntos de control de la
+    DB, así que sirve desde cualquier proceso. Incluye ``descargando`` y
+    ``completado`` como el antiguo ``forzar_cache``.
+    """
+    latido = cache.get(CLAVE_LATIDO)
+    estado = EstadoSincronizacion.objects.filter(nombre=ESTADO_CATALOGO).first()
+    tramos = sorted(
+        (
+            {"tramo": int(t.nombre[len(PREFIJO_TRAMO):]), "ultimo_id": t.ultimo_id, "id_hasta": t.id_hasta}
+            for t in EstadoSincronizacion.objects.filter(nombre__startswith=PREFIJO_TRAMO)
+        ),
+        key=lambda t: t["tramo"],
+    )
+    pendientes = sum(max(0, t["id_hasta"] - 1 - t["ultimo_id"]) for t in tramos)
+
+    filas_por_segundo = None
+    eta = None
+    if latido and latido.get("desde"):
+        filas = latido["filas"]
+        segundos = latido["latido"] - latido["desde"]
+        procesadas = filas.get("insertados", 0) + filas.get("actualizados", 0) + filas.get("sin_cambios", 0)
+        if segundos > 0:
+            filas_por_segundo = round(procesadas / segundos, 1)
+        if pendientes and filas_por_segundo:
+            # Aproximada: supone ids densos en los tramos pendientes
+            eta = round(pendientes / filas_por_segundo)
+
+    fase = latido["fase"] if latido else None
+    en_pausa = pausada()
+    completado = bool(
+        estado and estado.ultima_completa and not estado.completa_solicitada and not tramos
+    )
+    return {
+        "trabajador": {
+            "activo": latido is not None,
+            "propietario": latido and latido["propietario"],
+            "fase": fase,
+            "ultimo_latido": latido and latido["latido"],
+        },
+        "pausada": en_pausa,
+        "marca": {
+            "updated_at": estado.marca_updated_at if estado else None,
+            "ultimo_id": estado.ultimo_id if estado else None,
+            "completa_solicitada": bool(estado and estado.completa_solicitada),
+            "ultima_completa": estado and estado.ultima_completa,
+        },
+        "tramos": tramos,
+        "ids_pendientes": pendientes,
+        "filas": latido["filas"] if latido else {},
+        "filas_por_segundo": filas_por_segundo,
+        "eta_segundos": eta,
+        "igdb": latido["igdb"] if latido else {},
+        "errores": latido["errores"] if latido else [],
+        "descargando": fase in FASES_DESCARGA and not en_pausa,
+        "completado": completado,
+    }
 
 
+def controlar_sincronizacion(accion, modo="incremental"):
+    """Aplica ``iniciar`` (``modo`` incremental o completa), ``pausar`` o ``reanudar``."""
+    if accion == "iniciar":
+        if modo == "completa":
+            solicitar_sincronizacion_completa()
+        elif modo != "incremental":
+            raise ValueError(f"Modo desconocido: {modo}")
+        reanudar()
+        despertar()
+    elif accion == "pausar":
+        pausar()
+    elif accion == "reanudar":
+        reanudar()
+    else:
+        raise ValueError(f"Acción desconocida: {accion}")
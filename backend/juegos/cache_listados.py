@@ -0,0 +1,94 @@
+"""Caché de páginas del listado del catálogo.
+
+El tráfico anónimo repite las mismas combinaciones de búsqueda, orden y
+página. Cada página se guarda de forma compacta: solo la lista de ids y los
+datos de paginación (totales, cursores), con una clave derivada de los
+parámetros normalizados. Los juegos se guardan aparte, uno por clave, ya
+serializados, y al servir una página se recuperan todos con un ``get_many``;
+los que falten se leen de la DB en una sola consulta.
+
+Todas las claves incluyen la versión del catálogo
+(``juegos.version_catalogo``), así que la sincronización invalida la caché
+entera con un ``INCR`` en lugar de buscar y borrar claves.
+"""
+
+import hashlib
+import json
+import logging
+
+from django.core.cache import cache
+
+from .conteos import firma_filtros
+from .models import Juego
+from .single_flight import single_flight
+from .version_catalogo import version_catalogo
+
+logger = logging.getLogger(__name__)
+
+LISTADO_TTL = 600
+FILA_TTL = 3600
+
+
+def serializar(juego):
+    """Juego tal como aparece en el listado."""
+    return {
+        "id": juego.id,
+        "name": juego.name,
+        "cover": {"url": juego.cover_url} if juego.cover_url else {},
+        "summary": juego.summary,
+        "popularidad": juego.popularidad,
+        "first_release_date": juego.first_release_date.timestamp() if juego.first_release_date else None,
+    }
+
+
+def clave_pagina(version, q="", genero=None, plataforma=None, publisher=None,
+                 filtro_adulto=True, **pagina):
+    """Clave de una página; ``pagina`` son el orden y la posición (número o cursor)."""
+    firma = json.dumps(
+        [firma_filtros(q, genero, plataforma, publisher, filtro_adulto), pagina],
+        sort_keys=True, separators=(",", ":"),
+    )
+    resumen = hashlib.blake2b(firma.encode(), digest_size=12).hexdigest()
+    return f"listado:{version}:{resumen}"
+
+
+def _clave_fila(version, juego_id):
+    return f"listado:{version}:juego:{juego_id}"
+
+
+def hidratar(ids, version):
+    """Juegos serializados de ``ids`` en el mismo orden, desde la caché o la DB."""
+    claves = {juego_id: _clave_fila(version, juego_id) for juego_id in ids}
+    guardadas = cache.get_many(list(claves.values()))
+    filas = {juego_id: guardadas[clave] for juego_id, clave in claves.items() if clave in guardadas}
+    faltan = [juego_id for juego_id in ids if juego_id not in filas]
+    if faltan:
+        nuevas = {j.id: serializar(j) for j in Juego.objects.filter(id__in=faltan)}
+        cache.set_many({claves[i]: fila for i, fila in nuevas.items()}, FILA_TTL)
+        filas.update(nuevas)
+    return [filas[juego_id] for juego_id in ids if juego_id in filas]
+
+
+def obtener_pagina(parametros, calcular):
+    """Devuelve ``(juegos serializados, datos de paginación)`` de una página.
+
+    ``parametros`` son los argumentos de ``clave_pagina`` (sin la versión) y
+    ``calcular()`` devuelve ``(instancias de Juego, datos)`` cuando la página
+    no está en caché. Solo un worker la calcula a la vez (``single_flight``).
+    """
+    version = version_catalogo()
+    clave = clave_pagina(version, **parametros)
+    guardada = cache.get(clave)
+    if guardada is None:
+        def calcular_y_guardar():
+            juegos, datos = calcular()
+            filas = [serializar(j) for j in juegos]
+            cache.set_many({_clave_fila(version, f["id"]): f for f in filas}, FILA_TTL)
+            pagina = {"ids": [f["id"] for f in filas], "datos": datos}
+            cache.set(clave, pagina, LISTADO_TTL)
+            return {**pagina, "filas": filas}
+
+        guardada = single_flight(clave, calcular_y_guardar)
+        if "filas" in guardada:
+            return guardada["filas"], guardada["datos"]
+    return hidratar(guardada["ids"], version), guardada["datos"]
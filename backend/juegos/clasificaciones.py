@@ -0,0 +1,208 @@
+"""Géneros, plataformas, temas y compañías de los juegos en tablas normalizadas.
+
+``Juego`` guarda estas listas tal cual llegan de IGDB en campos JSON, que
+sirven para leer pero no para filtrar. Cada vez que la ingesta escribe un
+juego se reconstruyen sus filas en las tablas intermedias de ``generos``,
+``plataformas``, ``temas`` y ``companias``, de modo que los filtros del
+listado son joins por índice. Las entradas de ``Genero``, ``Plataforma``...
+se crean al verlas por primera vez; el nombre se guarda si IGDB lo envía
+expandido (``genres.name``).
+
+Aquí se decide también ``Juego.es_adulto`` a partir de temas y clasificaciones
+por edades.
+"""
+
+import logging
+
+from django.db import transaction
+
+from .models import Compania, Genero, Juego, JuegoCompania, Plataforma, Tema
+from .version_catalogo import incrementar_version
+
+logger = logging.getLogger(__name__)
+
+LOTE_RECONSTRUCCION = 2000
+# Tema "Erotic" de IGDB y valor AO (Adults Only, ESRB) de ``age_ratings.rating``
+TEMA_EROTICO = 42
+CLASIFICACION_AO = 12
+
+# Campo JSON de ``Juego`` -> (modelo de la clasificación, relación en ``Juego``)
+RELACIONES = {
+    "genres": (Genero, "generos"),
+    "platforms": (Plataforma, "plataformas"),
+    "themes": (Tema, "temas"),
+}
+
+
+def _entradas(valores):
+    """``{id: nombre}`` de una lista de IGDB con ids sueltos u objetos ``{id, name}``."""
+    entradas = {}
+    for valor in valores or []:
+        if isinstance(valor, dict):
+            if valor.get("id") is not None:
+                entradas[valor["id"]] = valor.get("name") or entradas.get(valor["id"], "")
+        elif valor is not None:
+            entradas.setdefault(valor, "")
+    return entradas
+
+
+def es_adulto(themes, age_ratings):
+    """Indica si un juego de IGDB es contenido adulto por sus temas o su clasificación."""
+    if TEMA_EROTICO in _entradas(themes):
+        return True
+    for clasificacion in age_ratings or []:
+        if isinstance(clasificacion, dict) and clasificacion.get("rating") == CLASIFICACION_AO:
+            return True
+    return False
+
+
+def _participaciones(involved_companies):
+    """``{compania_id: (nombre, desarrolladora, distribuidora)}`` de ``involved_companies``.
+
+    Sin ``involved_companies.company`` IGDB solo envía ids de la participación,
+    que no identifican a la compañía, así que se ignoran.
+    """
+    participaciones = {}
+    for valor in involved_companies or []:
+        if not isinstance(valor, dict) or valor.get("company") is None:
+            continue
+        compania = valor["company"]
+        nombre = ""
+        if isinstance(compania, dict):
+            nombre = compania.get("name") or ""
+            compania = compania.get("id")
+        if compania is None:
+            continue
+        previo = participaciones.get(compania, ("", False, False))
+        participaciones[compania] = (
+            nombre or previo[0],
+            previo[1] or bool(valor.get("developer")),
+            previo[2] or bool(valor.get("publisher")),
+        )
+    return participaciones
+
+
+def _guardar_entradas(modelo, entradas):
+    """Crea las entradas nuevas y actualiza el nombre de las que lo traen."""
+    # Import diferido: ``ingesta`` importa este módulo
+    from .ingesta import upsert
+
+    con_nombre = [modelo(id=i, name=n) for i, n in entradas.items() if n]
+    sin_nombre = [modelo(id=i) for i, n in entradas.items() if not n]
+    if con_nombre:
+        upsert(con_nombre, ["name"], modelo=modelo)
+    if sin_nombre:
+        modelo.objects.bulk_create(sin_nombre, ignore_conflicts=True)
+
+
+def relacionar(juegos, nuevos=()):
+    """Reescribe las filas de clasificación de ``juegos`` desde sus campos JSON.
+
+    Los juegos ya deben estar guardados. Todo el lote se resuelve con un par
+    de sentencias por tabla; los ids de ``nuevos`` no pueden tener filas
+    previas, así que no se borran.
+    """
+    if not juegos:
+        return
+    ids = [j.id for j in juegos if j.id not in nuevos]
+    with transaction.atomic():
+        for campo, (modelo, relacion) in RELACIONES.items():
+            intermedia = getattr(Juego, relacion).through
+            destino = f"{modelo._meta.model_name}_id"
+            entradas = {}
+            filas = []
+            for juego in juegos:
+                propias = _entradas(getattr(juego, campo))
+                entradas.update({i: n or entradas.get(i, "") for i, n in propias.items()})
+                filas.extend(intermedia(juego_id=juego.id, **{destino: i}) for i in propias)
+            _guardar_entradas(modelo, entradas)
+            if ids:
+                intermedia.objects.filter(juego_id__in=ids).delete()
+            intermedia.objects.bulk_create(filas)
+
+        companias = {}
+        filas = []
+        for juego in juegos:
+            for compania, (nombre, desarrolladora, distribuidora) in _participaciones(
+                juego.involved_companies
+            ).items():
+                companias[compania] = nombre or companias.get(compania, "")
+                filas.append(JuegoCompania(
+                    juego_id=juego.id, compania_id=compania,
+                    desarrolladora=desarrolladora, distribuidora=distribuidora,
+                ))
+        _guardar_entradas(Compania, companias)
+        if ids:
+            JuegoCompania.objects.filter(juego_id__in=ids).delete()
+        JuegoCompania.objects.bulk_create(filas)
+
+
+def id_filtro(valor):
+    """Id de IGDB de un parámetro de filtro; ``None`` si no es numérico."""
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def filtrar(qs, genero=None, plataforma=None, publisher=None):
+    """Aplica los filtros del listado como joins con las tablas intermedias.
+
+    Los valores son ids de IGDB (como texto, tal cual llegan en la URL); los
+    que no son numéricos se ignoran.
+    """
+    if (genero := id_filtro(genero)) is not None:
+        qs = qs.filter(generos=genero)
+    if (plataforma := id_filtro(plataforma)) is not None:
+        qs = qs.filter(plataformas=plataforma)
+    if (publisher := id_filtro(publisher)) is not None:
+        qs = qs.filter(juegocompania__compania=publisher, juegocompania__distribuidora=True)
+    return qs
+
+
+def reconstruir(tamano_lote=LOTE_RECONSTRUCCION):
+    """Rellena las tablas de clasificación desde los JSON de todo ``Juego``.
+
+    Para catálogos guardados antes de existir estas tablas. Recorre ``Juego``
+    por clave primaria y devuelve cuántos juegos ha procesado.
+    """
+    campos = ["id", *RELACIONES, "involved_companies"]
+    total = 0
+    ultimo_id = None
+    while True:
+        qs = Juego.objects.order_by("id").only(*campos)
+        if ultimo_id is not None:
+            qs = qs.filter(id__gt=ultimo_id)
+        juegos = list(qs[:tamano_lote])
+        if not juegos:
+            if total:
+                incrementar_version()
+            return total
+        relacionar(juegos)
+        total += len(juegos)
+        ultimo_id = juegos[-1].id
+        logger.info(f"Clasificaciones: {total} juegos reconstruidos")
+
+
+def marcar_adultos(tamano_lote=LOTE_RECONSTRUCCION):
+    """Marca ``es_adulto`` en los juegos guardados antes de existir el campo.
+
+    Solo se dispone de los temas guardados; la clasificación por edades llega
+    con la siguiente sincronización de cada juego. No desmarca ninguno.
+    Devuelve cuántos juegos ha marcado.
+    """
+    marcados = 0
+    ultimo_id = None
+    while True:
+        qs = Juego.objects.order_by("id").values_list("id", "themes")
+        if ultimo_id is not None:
+            qs = qs.filter(id__gt=ultimo_id)
+        filas = list(qs[:tamano_lote])
+        if not filas:
+            if marcados:
+                incrementar_version()
+            return marcados
+        adultos = [i for i, themes in filas if es_adulto(themes, None)]
+        if adultos:
+            marcados += Juego.objects.filter(id__in=adultos, es_adulto=False).update(es_adulto=True)
+        ultimo_id = filas[-1][0]
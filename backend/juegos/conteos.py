@@ -0,0 +1,108 @@
+"""Número de resultados de los listados del catálogo, cacheado.
+
+Cada combinación de filtros se cuenta una vez por versión del catálogo
+(``juegos.version_catalogo``) y el resultado se guarda en la caché compartida
+con la firma normalizada de los filtros como clave. Un ``COUNT(*)`` en frío
+se coordina con ``single_flight`` para que no lo repitan todos los workers.
+Como la clave lleva la versión del catálogo, el conteo puede guardarse mucho
+tiempo.
+
+El total del catálogo sin filtros (``total_sin_filtrar``) recorrería la tabla
+entera, así que se parte de la estimación de filas que mantiene el motor
+(``information_schema.TABLES`` en MySQL, ``pg_class`` en PostgreSQL) y se le
+restan los juegos que el listado nunca muestra, retirados y de contenido
+adulto, contados con exactitud: son pocos y los cuenta un índice. El
+resultado se marca como aproximado.
+"""
+
+import hashlib
+import json
+import logging
+
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+
+from .busqueda import normalizar
+from .clasificaciones import id_filtro
+from .models import Juego
+from .single_flight import single_flight
+from .version_catalogo import version_catalogo
+
+logger = logging.getLogger(__name__)
+
+CONTEO_TTL = 86400
+
+
+def firma_filtros(q="", genero=None, plataforma=None, publisher=None, filtro_adulto=True):
+    """Representación canónica de los filtros: misma firma, mismos resultados."""
+    return json.dumps({
+        "q": normalizar(q or ""),
+        "genero": id_filtro(genero),
+        "plataforma": id_filtro(plataforma),
+        "publisher": id_filtro(publisher),
+        "adulto": bool(filtro_adulto),
+    }, sort_keys=True, separators=(",", ":"))
+
+
+def _filas_estimadas(modelo):
+    """Filas de la tabla según las estadísticas del motor; ``None`` si no hay."""
+    tabla = modelo._meta.db_table
+    if connection.vendor == "mysql":
+        sql = (
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+        )
+    elif connection.vendor == "postgresql":
+        sql = "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass"
+    else:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [tabla])
+            fila = cursor.fetchone()
+    except DatabaseError as e:
+        logger.warning(f"No se pudo leer la estimación de filas de {tabla}: {e}")
+        return None
+    # PostgreSQL devuelve -1 si la tabla nunca se ha analizado, e InnoDB 0
+    # hasta que actualiza las estadísticas de una tabla nueva
+    if not fila or fila[0] is None or fila[0] <= 0:
+        return None
+    return int(fila[0])
+
+
+def _cacheado(resumen, calcular):
+    """Resultado de ``calcular()`` guardado por versión del catálogo."""
+    clave = f"conteo:{version_catalogo()}:{resumen}"
+    guardado = cache.get(clave)
+    if guardado is not None:
+        return guardado
+
+    def calcular_y_guardar():
+        resultado = calcular()
+        cache.set(clave, resultado, CONTEO_TTL)
+        return resultado
+
+    return single_flight(clave, calcular_y_guardar)
+
+
+def contar(qs, q="", genero=None, plataforma=None, publisher=None, filtro_adulto=True):
+    """Número de resultados de ``qs``, el listado con esos filtros."""
+    firma = firma_filtros(q, genero, plataforma, publisher, filtro_adulto)
+    resumen = hashlib.blake2b(firma.encode(), digest_size=12).hexdigest()
+    return _cacheado(resumen, lambda: qs.order_by().count())
+
+
+def contar_catalogo(filtro_adulto=True):
+    """Devuelve ``(total, aproximado)`` de los juegos que muestra el listado sin filtros."""
+    visibles = Juego.vigentes.filter(es_adulto=False) if filtro_adulto else Juego.vigentes.all()
+
+    def calcular():
+        estimado = _filas_estimadas(Juego)
+        if estimado is None:
+            return visibles.order_by().count(), False
+        ocultos = Juego.objects.filter(eliminado=True).count()
+        if filtro_adulto:
+            ocultos += Juego.vigentes.filter(es_adulto=True).count()
+        return max(estimado - ocultos, 0), True
+
+    return tuple(_cacheado(f"catalogo:{int(bool(filtro_adulto))}", calcular))
@@ -0,0 +1,51 @@
+"""Señales de control del trabajador de sincronización, compartidas vía Redis.
+
+El trabajador corre en otro proceso (``manage.py sincronizar_catalogo``), así
+que la API de administración no puede llamarle directamente: deja una marca
+en la caché y el trabajador la consulta entre lotes y durante sus esperas.
+"""
+
+from django.core.cache import cache
+
+CLAVE_PAUSA = "igdb_sync:pausa"
+CLAVE_INICIAR = "igdb_sync:iniciar"
+# Cada cuánto se consultan las marcas mientras se espera
+INTERVALO_CONTROL = 5
+
+
+def pausar():
+    cache.set(CLAVE_PAUSA, True, None)
+
+
+def reanudar():
+    cache.delete(CLAVE_PAUSA)
+
+
+def pausada():
+    return bool(cache.get(CLAVE_PAUSA))
+
+
+def despertar():
+    """Pide al trabajador que empiece una pasada sin esperar a su intervalo."""
+    cache.set(CLAVE_INICIAR, True, 3600)
+
+
+def esperar_si_pausada(detener):
+    """Bloquea mientras la sincronización esté en pausa o hasta ``detener``.
+
+    Devuelve ``False`` si se activó ``detener``.
+    """
+    while pausada() and not detener.is_set():
+        detener.wait(INTERVALO_CONTROL)
+    return not detener.is_set()
+
+
+def esperar(detener, segundos):
+    """Espera ``segundos`` salvo que se pida una pasada o se active ``detener``."""
+    restante = segundos
+    while restante > 0 and not detener.is_set():
+        if cache.get(CLAVE_INICIAR):
+            cache.delete(CLAVE_INICIAR)
+            return
+        detener.wait(min(INTERVALO_CONTROL, restante))
+        restante -= INTERVALO_CONTROL
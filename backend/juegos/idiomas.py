@@ -0,0 +1,90 @@
+"""Tabla local de idiomas de IGDB y resolución de nombres sin red.
+
+La lista de idiomas de IGDB es pequeña y casi estática, así que se copia a la
+tabla ``Idioma`` durante la sincronización del catálogo y cada proceso la
+mantiene en un diccionario en memoria. Así el detalle de un juego solo
+necesita los ids de ``language_supports.language`` para devolver los nombres.
+"""
+
+import logging
+import threading
+import time
+
+from .igdb_client import igdb
+from .igdb_rate_limit import FONDO
+from .models import Idioma
+
+logger = logging.getLogger(__name__)
+
+# Tiempo mínimo entre recargas del diccionario al encontrar ids desconocidos
+RECARGA_MINIMA = 300
+
+_nombres = {}
+_cargado_en = None
+_lock = threading.Lock()
+
+
+def recargar_idiomas():
+    """Vuelve a leer la tabla ``Idioma`` en el diccionario del proceso."""
+    global _nombres, _cargado_en
+    _nombres = {
+        i: nombre or nativo
+        for i, nombre, nativo in Idioma.objects.values_list("id", "name", "native_name")
+    }
+    _cargado_en = time.monotonic()
+
+
+def _puede_recargar():
+    return _cargado_en is None or time.monotonic() - _cargado_en > RECARGA_MINIMA
+
+
+def nombres_idiomas(ids):
+    """Nombres de los idiomas ``ids`` sin repetir y en el orden recibido."""
+    ids = [i for i in ids or [] if i is not None]
+    if not ids:
+        return []
+    if any(i not in _nombres for i in ids) and _puede_recargar():
+        with _lock:
+            if _puede_recargar():
+                recargar_idiomas()
+
+    nombres = []
+    for i in ids:
+        nombre = _nombres.get(i)
+        if nombre and nombre not in nombres:
+            nombres.append(nombre)
+    return nombres
+
+
+def ids_idiomas(language_supports):
+    """Extrae los ids de idioma de ``language_supports.language`` de IGDB."""
+    ids = []
+    for soporte in language_supports or []:
+        if not isinstance(soporte, dict):
+            continue
+        idioma = soporte.get("language")
+        if isinstance(idioma, dict):
+            idioma = idioma.get("id")
+        if idioma is not None and idioma not in ids:
+            ids.append(idioma)
+    return ids
+
+
+def sincronizar_idiomas():
+    """Copia la tabla ``languages`` de IGDB a la DB local."""
+    datos = igdb.consultar(
+        "languages", "fields id,name,native_name,locale; limit 500;", prioridad=FONDO
+    )
+    for d in datos:
+        Idioma.objects.update_or_create(
+            id=d["id"],
+            defaults={
+                "name": d.get("name") or "",
+                "native_name": d.get("native_name") or "",
+                "locale": d.get("locale") or "",
+            },
+        )
+    with _lock:
+        recargar_idiomas()
+    logger.info(f"Sincronizados {len(datos)} idiomas de IGDB")
+    return len(datos)
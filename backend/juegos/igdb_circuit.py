@@ -0,0 +1,93 @@
+"""Circuit breaker compartido para las llamadas a IGDB.
+
+Si IGDB empieza a fallar o a responder demasiado lento, seguir enviándole
+peticiones solo consigue tener a todos los workers de gunicorn bloqueados
+esperando. El circuito cuenta los fallos (errores de red, 5xx y respuestas
+más lentas que ``latencia_maxima``) en una ventana de tiempo; al superar el
+umbral se abre y las llamadas fallan al instante para que los servicios
+sirvan datos obsoletos de Redis o de la DB.
+
+Pasado el enfriamiento el circuito queda semiabierto: una única petición de
+sonda en todo el clúster llega a IGDB. Si va bien se cierra y, si falla,
+vuelve a abrirse otro periodo. El estado vive en la caché compartida para que
+todos los workers lo vean a la vez.
+"""
+
+import logging
+import time
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+FALLOS_KEY = "igdb_circuito:fallos"
+ABIERTO_KEY = "igdb_circuito:abierto_hasta"
+SONDA_KEY = "igdb_circuito:sonda"
+
+UMBRAL_FALLOS = 5
+VENTANA = 30
+ENFRIAMIENTO = 30
+LATENCIA_MAXIMA = 5.0
+# Tiempo que se conserva el estado semiabierto si nadie llega a sondear
+TTL_ESTADO = 3600
+
+CERRADO = "cerrado"
+ABIERTO = "abierto"
+SEMIABIERTO = "semiabierto"
+
+
+class CircuitBreaker:
+    """Circuito con estado en Redis y sonda única en semiabierto."""
+
+    def __init__(self, umbral_fallos=UMBRAL_FALLOS, ventana=VENTANA,
+                 enfriamiento=ENFRIAMIENTO, latencia_maxima=LATENCIA_MAXIMA):
+        self.umbral_fallos = umbral_fallos
+        self.ventana = ventana
+        self.enfriamiento = enfriamiento
+        self.latencia_maxima = latencia_maxima
+
+    def estado(self):
+        abierto_hasta = cache.get(ABIERTO_KEY)
+        if abierto_hasta is None:
+            return CERRADO
+        return ABIERTO if time.time() < abierto_hasta else SEMIABIERTO
+
+    def permitir(self):
+        """Indica si se puede llamar a IGDB ahora mismo."""
+        estado = self.estado()
+        if estado == CERRADO:
+            return True
+        if estado == SEMIABIERTO:
+            # Solo una sonda a la vez; caduca por si el proceso muere
+            return cache.add(SONDA_KEY, 1, self.enfriamiento)
+        return False
+
+    def registrar(self, duracion, error=False):
+        """Anota el resultado de una llamada que sí llegó a realizarse."""
+        if error or duracion > self.latencia_maxima:
+            self._registrar_fallo()
+        elif cache.get(ABIERTO_KEY) is not None:
+            cache.delete_many([ABIERTO_KEY, FALLOS_KEY, SONDA_KEY])
+            logger.info("Circuito de IGDB cerrado: la sonda respondió correctamente")
+
+    def _registrar_fallo(self):
+        if self.estado() == SEMIABIERTO:
+            self._abrir("la sonda ha fallado")
+            return
+        cache.add(FALLOS_KEY, 0, self.ventana)
+        try:
+            fallos = cache.incr(FALLOS_KEY)
+        except ValueError:
+            # La clave caducó entre add e incr: empieza una ventana nueva
+            cache.set(FALLOS_KEY, 1, self.ventana)
+            fallos = 1
+        if fallos >= self.umbral_fallos and self.estado() == CERRADO:
+            self._abrir(f"{fallos} fallos en {self.ventana}s")
+
+    def _abrir(self, motivo):
+        cache.set(ABIERTO_KEY, time.time() + self.enfriamiento, self.enfriamiento + TTL_ESTADO)
+        cache.delete_many([FALLOS_KEY, SONDA_KEY])
+        logger.warning(f"Circuito de IGDB abierto {self.enfriamiento}s: {motivo}")
+
+
+circuito = CircuitBreaker()
@@ -0,0 +1,374 @@
+"""Cliente HTTP compartido para todas las llamadas salientes a IGDB.
+
+Mantiene un único ``requests.Session`` por proceso con un pool de conexiones
+keep-alive, de modo que las peticiones consecutivas reutilizan la conexión TLS
+con ``api.igdb.com`` en lugar de negociar una nueva cada vez. También
+centraliza cabeceras, token, timeouts, reintentos y métricas por endpoint.
+
+``AsyncIGDBClient`` ofrece lo mismo sobre ``httpx.AsyncClient`` para las
+vistas asíncronas servidas por ASGI, compartiendo token, limitador, circuito
+y métricas con el cliente síncrono.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+import weakref
+
+import httpx
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .igdb_circuit import circuito
+from .igdb_rate_limit import INTERACTIVA, EsperaAgotada, limitador
+from .igdb_token import gestor_token, obtener_token_igdb
+
+logger = logging.getLogger(__name__)
+
+# (conexión, lectura) en segundos
+TIMEOUT_POR_DEFECTO = (5, 30)
+TAMANO_POOL = 20
+MAX_REINTENTOS_429 = 5
+ESPERA_MAXIMA_429 = 30
+
+
+class IGDBError(Exception):
+    """Error al comunicarse con IGDB (red, HTTP o reintentos agotados)."""
+
+
+class IGDBNoDisponible(IGDBError):
+    """El circuito está abierto: no se llega a contactar con IGDB."""
+
+
+_DATOS_SIMULADOS = [{"id": 0, "name": "Dummy App", "cover": {"url": "dummy"}}]
+
+
+def _respuesta_simulada():
+    """Respuesta fija usada cuando ``IS_TESTING`` está activo."""
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = json.dumps(_DATOS_SIMULADOS).encode()
+    return resp
+
+
+def _espera_429(resp, intento):
+    espera = resp.headers.get("Retry-After")
+    espera = int(espera) if espera and espera.isdigit() else 2 ** intento
+    return min(espera, ESPERA_MAXIMA_429)
+
+
+class MultiQuery:
+    """Agrupa varias consultas con nombre en una sola petición ``/multiquery``.
+
+    Ejemplo::
+
+        mq = MultiQuery().add("generos", "genres", "fields id,name; limit 500;")
+        resultados = igdb.multiquery(mq)  # {"generos": [...]}
+    """
+
+    MAX_CONSULTAS = 10
+
+    def __init__(self):
+        self._consultas = []
+
+    def add(self, nombre, endpoint, cuerpo):
+        if len(self._consultas) >= self.MAX_CONSULTAS:
+            raise ValueError(f"IGDB admite como máximo {self.MAX_CONSULTAS} consultas por multiquery")
+        if '"' in nombre or any(nombre == n for n, _, _ in self._consultas):
+            raise ValueError(f"Nombre de subconsulta inválido o repetido: {nombre}")
+        self._consultas.append((nombre, endpoint.strip("/"), " ".join(cuerpo.split())))
+        return self
+
+    def __len__(self):
+        return len(self._consultas)
+
+    def nombres(self):
+        return [nombre for nombre, _, _ in self._consultas]
+
+    def cuerpo(self):
+        return "\n".join(
+            f'query {endpoint} "{nombre}" {{ {cuerpo} }};'
+            for nombre, endpoint, cuerpo in self._consultas
+        )
+
+    def repartir(self, respuesta):
+        """Convierte la respuesta de IGDB en ``{nombre: resultados}``."""
+        resultados = {nombre: [] for nombre in self.nombres()}
+        for bloque in respuesta or []:
+            if isinstance(bloque, dict) and bloque.get("name") in resultados:
+                resultados[bloque["name"]] = bloque.get("result") or []
+        return resultados
+
+
+class _ClienteBase:
+    """Configuración, cabeceras, token y métricas comunes a ambos clientes."""
+
+    def __init__(self, base_url=None, timeout=TIMEOUT_POR_DEFECTO,
+                 tamano_pool=TAMANO_POOL, max_reintentos_429=MAX_REINTENTOS_429):
+        self._base_url = base_url
+        self.timeout = timeout
+        self.tamano_pool = tamano_pool
+        self.max_reintentos_429 = max_reintentos_429
+        self._lock = threading.Lock()
+        self._metricas = {}
+        self._metricas_lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return (self._base_url or settings.IGDB_BASE_URL).rstrip("/")
+
+    def _headers(self, token):
+        return {
+            "Client-ID": settings.IGDB_CLIENT_ID,
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/json",
+            "Content-Type": "text/plain",
+        }
+
+    def _token(self, rechazado=None):
+        try:
+            if rechazado:
+                return gestor_token.invalidar(rechazado)
+            return obtener_token_igdb()
+        except requests.RequestException as e:
+            raise IGDBError(f"No se pudo obtener el token de IGDB: {e}") from e
+
+    def _registrar(self, endpoint, duracion, error=False, limitada=False):
+        with self._metricas_lock:
+            m = self._metricas.setdefault(
+                endpoint,
+                {"llamadas": 0, "errores": 0, "limitadas": 0, "latencia_total": 0.0,
+                 "latencia_max": 0.0},
+            )
+            m["llamadas"] += 1
+            if error:
+                m["errores"] += 1
+            if limitada:
+                m["limitadas"] += 1
+            m["latencia_total"] += duracion
+            m["latencia_max"] = max(m["latencia_max"], duracion)
+
+    def metricas(self):
+        """Devuelve llamadas, errores, 429 y latencias (segundos) por endpoint."""
+        with self._metricas_lock:
+            return {
+                endpoint: {
+                    **m,
+                    "latencia_media": m["latencia_total"] / m["llamadas"] if m["llamadas"] else 0.0,
+                }
+                for endpoint, m in self._metricas.items()
+            }
+
+    def reiniciar_metricas(self):
+        with self._metricas_lock:
+            self._metricas.clear()
+
+
+class IGDBClient(_ClienteBase):
+    """Cliente thread-safe con pool de conexiones para la API v4 de IGDB."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._session = None
+
+    def _get_session(self):
+        """Crea la sesión compartida de forma perezosa (una por proceso)."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    # Reintentos a nivel de transporte solo para fallos de
+                    # conexión y 5xx; los 429 se gestionan en ``post``.
+                    reintentos = Retry(
+                        total=3,
+                        connect=3,
+                        read=1,
+                        backoff_factor=0.5,
+                        status_forcelist=(500, 502, 503, 504),
+                        allowed_methods=frozenset(["POST"]),
+                        raise_on_status=False,
+                    )
+                    adapter = HTTPAdapter(
+                        pool_connections=2,
+                        pool_maxsize=self.tamano_pool,
+                        max_retries=reintentos,
+                    )
+                    session = requests.Session()
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    def post(self, endpoint, cuerpo, prioridad=INTERACTIVA):
+        """Envía una consulta Apicalypse a ``endpoint`` y devuelve la respuesta.
+
+        Si el circuito está abierto falla al instante con ``IGDBNoDisponible``.
+        Cada intento pide turno al limitador compartido con la ``prioridad``
+        indicada. Reintenta los 429 respetando ``Retry-After`` y, una sola vez,
+        los 401 con un token renovado. Lanza
+        ``IGDBError`` si la red falla o se agotan los reintentos; otros códigos
+        HTTP se devuelven tal cual para que el llamador decida.
+        """
+        if getattr(settings, "IS_TESTING", False):
+            return _respuesta_simulada()
+
+        endpoint = endpoint.strip("/")
+        url = f"{self.base_url}/{endpoint}"
+        session = self._get_session()
+        token = self._token()
+        token_renovado = False
+        intento = 0
+        while intento <= self.max_reintentos_429:
+            if not circuito.permitir():
+                raise IGDBNoDisponible(f"Circuito abierto: IGDB /{endpoint} no disponible")
+            try:
+                limitador.adquirir(prioridad)
+            except EsperaAgotada as e:
+                raise IGDBError(str(e)) from e
+            inicio = time.monotonic()
+            try:
+                resp = session.post(
+                    url, headers=self._headers(token), data=cuerpo.strip(), timeout=self.timeout
+                )
+            except requests.RequestException as e:
+                duracion = time.monotonic() - inicio
+                self._registrar(endpoint, duracion, error=True)
+                circuito.registrar(duracion, error=True)
+                raise IGDBError(f"Error de red consultando IGDB /{endpoint}: {e}") from e
+
+            duracion = time.monotonic() - inicio
+            self._registrar(
+                endpoint, duracion, error=resp.status_code >= 400, limitada=resp.status_code == 429
+            )
+            circuito.registrar(duracion, error=resp.status_code >= 500)
+            if resp.status_code == 401 and not token_renovado:
+                logger.warning("IGDB rechazó el token (401); se renueva y se reintenta")
+                token = self._token(rechazado=token)
+                token_renovado = True
+                continue
+            if resp.status_code != 429:
+                return resp
+
+            espera = _espera_429(resp, intento)
+            logger.warning(
+                "IGDB /%s respondió 429. Reintento %s/%s en %ss",
+                endpoint, intento + 1, self.max_reintentos_429, espera,
+            )
+            time.sleep(espera)
+            intento += 1
+
+        raise IGDBError(f"IGDB /{endpoint}: demasiados 429 ({self.max_reintentos_429} reintentos)")
+
+    def consultar(self, endpoint, cuerpo, prioridad=INTERACTIVA):
+        """Como ``post`` pero exige un 200 y devuelve el JSON decodificado."""
+        resp = self.post(endpoint, cuerpo, prioridad=prioridad)
+        if resp.status_code != 200:
+            raise IGDBError(f"IGDB /{endpoint} respondió {resp.status_code}: {resp.text[:200]}")
+        return resp.json()
+
+    def multiquery(self, consulta, prioridad=INTERACTIVA):
+        """Ejecuta un ``MultiQuery`` en un solo viaje y reparte los resultados."""
+        return consulta.repartir(self.consultar("multiquery", consulta.cuerpo(), prioridad=prioridad))
+
+
+class AsyncIGDBClient(_ClienteBase):
+    """Variante asíncrona sobre ``httpx.AsyncClient`` para vistas ASGI.
+
+    Un ``AsyncClient`` queda ligado al event loop en el que se crea, así que
+    se mantiene uno por loop (en ASGI hay uno solo por proceso). El token se
+    obtiene en un hilo porque su renovación usa ``requests``; limitador y
+    circuito solo hacen un viaje corto a Redis y se llaman directamente.
+    """
+
+    def __init__(self, *args, transport=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._transport = transport
+        self._clientes = weakref.WeakKeyDictionary()
+
+    def _get_client(self):
+        loop = asyncio.get_running_loop()
+        cliente = self._clientes.get(loop)
+        if cliente is None:
+            conexion, lectura = self.timeout
+            cliente = httpx.AsyncClient(
+                timeout=httpx.Timeout(lectura, connect=conexion),
+                limits=httpx.Limits(max_connections=self.tamano_pool * 5,
+                                    max_keepalive_connections=self.tamano_pool),
+                transport=self._transport or httpx.AsyncHTTPTransport(retries=3),
+            )
+            self._clientes[loop] = cliente
+        return cliente
+
+    async def _atoken(self, rechazado=None):
+        return await sync_to_async(self._token, thread_sensitive=False)(rechazado)
+
+    async def post(self, endpoint, cuerpo, prioridad=INTERACTIVA):
+        """Igual que ``IGDBClient.post`` pero sin bloquear el event loop."""
+        if getattr(settings, "IS_TESTING", False):
+            return httpx.Response(200, json=_DATOS_SIMULADOS)
+
+        endpoint = endpoint.strip("/")
+        url = f"{self.base_url}/{endpoint}"
+        cliente = self._get_client()
+        token = await self._atoken()
+        token_renovado = False
+        intento = 0
+        while intento <= self.max_reintentos_429:
+            if not circuito.permitir():
+                raise IGDBNoDisponible(f"Circuito abierto: IGDB /{endpoint} no disponible")
+            try:
+                await limitador.aadquirir(prioridad)
+            except EsperaAgotada as e:
+                raise IGDBError(str(e)) from e
+            inicio = time.monotonic()
+            try:
+                resp = await cliente.post(url, headers=self._headers(token), content=cuerpo.strip())
+            except httpx.HTTPError as e:
+                duracion = time.monotonic() - inicio
+                self._registrar(endpoint, duracion, error=True)
+                circuito.registrar(duracion, error=True)
+                raise IGDBError(f"Error de red consultando IGDB /{endpoint}: {e}") from e
+
+            duracion = time.monotonic() - inicio
+            self._registrar(
+                endpoint, duracion, error=resp.status_code >= 400, limitada=resp.status_code == 429
+            )
+            circuito.registrar(duracion, error=resp.status_code >= 500)
+            if resp.status_code == 401 and not token_renovado:
+                logger.warning("IGDB rechazó el token (401); se renueva y se reintenta")
+                token = await self._atoken(rechazado=token)
+                token_renovado = True
+                continue
+            if resp.status_code != 429:
+                return resp
+
+            espera = _espera_429(resp, intento)
+            logger.warning(
+                "IGDB /%s respondió 429. Reintento %s/%s en %ss",
+                endpoint, intento + 1, self.max_reintentos_429, espera,
+            )
+            await asyncio.sleep(espera)
+            intento += 1
+
+        raise IGDBError(f"IGDB /{endpoint}: demasiados 429 ({self.max_reintentos_429} reintentos)")
+
+    async def consultar(self, endpoint, cuerpo, prioridad=INTERACTIVA):
+        """Como ``post`` pero exige un 200 y devuelve el JSON decodificado."""
+        resp = await self.post(endpoint, cuerpo, prioridad=prioridad)
+        if resp.status_code != 200:
+            raise IGDBError(f"IGDB /{endpoint} respondió {resp.status_code}: {resp.text[:200]}")
+        return resp.json()
+
+    async def multiquery(self, consulta, prioridad=INTERACTIVA):
+        """Ejecuta un ``MultiQuery`` en un solo viaje y reparte los resultados."""
+        datos = await self.consultar("multiquery", consulta.cuerpo(), prioridad=prioridad)
+        return consulta.repartir(datos)
+
+
+# Instancias compartidas por todo el proceso.
+igdb = IGDBClient()
+igdb_async = AsyncIGDBClient()
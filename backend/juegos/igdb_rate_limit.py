@@ -0,0 +1,250 @@
+"""Limitador de peticiones a IGDB compartido por todos los procesos.
+
+IGDB permite unas 4 peticiones por segundo por ``Client-ID``. Como cada
+worker de gunicorn y el trabajador de sincronización comparten esa cuota, el
+límite se implementa como un token bucket en Redis evaluado atómicamente con
+un script Lua.
+
+Hay dos carriles de prioridad: las peticiones interactivas (las que atienden
+a un usuario) y las de fondo (sincronización). Las de fondo nunca consumen
+los últimos ``reserva`` tokens y ceden el turno mientras haya alguna
+petición interactiva esperando, de modo que la sincronización no puede dejar
+sin cuota al tráfico de usuarios.
+
+Si la caché configurada no es Redis (desarrollo, tests) se usa un bucket
+local al proceso con la misma semántica.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVA = "interactiva"
+FONDO = "fondo"
+
+# Se prefijan con ``cache.make_key``, como el resto de claves de la caché
+BUCKET_KEY = "igdb_rate:bucket"
+ESPERANDO_KEY = "igdb_rate:interactivas_esperando"
+# Si un proceso muere mientras espera, el contador caduca solo.
+ESPERANDO_TTL = 5
+
+# Devuelve 0 si se concede un token o los milisegundos a esperar si no.
+_SCRIPT_LUA = """
+local tasa = tonumber(ARGV[1])
+local capacidad = tonumber(ARGV[2])
+local fondo = tonumber(ARGV[3]) == 1
+local reserva = tonumber(ARGV[4])
+local t = redis.call('TIME')
+local ahora = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local datos = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(datos[1]) or capacidad
+local ts = tonumber(datos[2]) or ahora
+tokens = math.min(capacidad, tokens + math.max(0, ahora - ts) * tasa)
+local minimo = 1
+if fondo then
+  minimo = 1 + reserva
+  if tonumber(redis.call('GET', KEYS[2]) or '0') > 0 then
+    minimo = capacidad + 1
+  end
+end
+local espera = 0
+if tokens >= minimo then
+  tokens = tokens - 1
+else
+  espera = math.ceil((math.min(minimo, capacidad) - tokens) / tasa * 1000)
+  if fondo then espera = math.max(espera, math.ceil(1000 / tasa)) end
+  if espera < 1 then espera = 1 end
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', ahora)
+redis.call('EXPIRE', KEYS[1], 60)
+return espera
+"""
+
+
+class EsperaAgotada(Exception):
+    """No se obtuvo turno dentro del tiempo máximo de espera."""
+
+
+class _BucketRedis:
+    def __init__(self, conexion):
+        self.conexion = conexion
+        self.script = conexion.register_script(_SCRIPT_LUA)
+
+    def intentar(self, fondo, tasa, capacidad, reserva):
+        espera_ms = self.script(
+            keys=[cache.make_key(BUCKET_KEY), cache.make_key(ESPERANDO_KEY)],
+            args=[tasa, capacidad, 1 if fondo else 0, reserva],
+        )
+        return int(espera_ms) / 1000
+
+    def marcar_esperando(self, delta):
+        clave = cache.make_key(ESPERANDO_KEY)
+        pipe = self.conexion.pipeline()
+        pipe.incrby(clave, delta)
+        pipe.expire(clave, ESPERANDO_TTL)
+        pipe.execute()
+
+
+class _BucketLocal:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tokens = None
+        self.ts = None
+        self.esperando = 0
+
+    def intentar(self, fondo, tasa, capacidad, reserva):
+        with self.lock:
+            ahora = time.monotonic()
+            if self.tokens is None:
+                self.tokens, self.ts = capacidad, ahora
+            self.tokens = min(capacidad, self.tokens + max(0, ahora - self.ts) * tasa)
+            self.ts = ahora
+            minimo = 1
+            if fondo:
+                minimo = capacidad + 1 if self.esperando > 0 else 1 + reserva
+            if self.tokens >= minimo:
+                self.tokens -= 1
+                return 0
+            espera = (min(minimo, capacidad) - self.tokens) / tasa
+            if fondo:
+                espera = max(espera, 1 / tasa)
+            return max(espera, 0.001)
+
+    def marcar_esperando(self, delta):
+        with self.lock:
+            self.esperando = max(0, self.esperando + delta)
+
+
+class LimitadorIGDB:
+    """Token bucket compartido con carriles interactivo y de fondo."""
+
+    def __init__(self, tasa=None, capacidad=None, reserva=1, espera_maxima=30,
+                 espera_maxima_fondo=300):
+        self._tasa = tasa
+        self._capacidad = capacidad
+        self.reserva = reserva
+        self.espera_maxima = espera_maxima
+        self.espera_maxima_fondo = espera_maxima_fondo
+        self._bucket = None
+        self._lock = threading.Lock()
+        self._metricas = {}
+        self._metricas_lock = threading.Lock()
+
+    @property
+    def tasa(self):
+        return self._tasa or getattr(settings, "IGDB_PETICIONES_POR_SEGUNDO", 4)
+
+    @property
+    def capacidad(self):
+        return self._capacidad or self.tasa
+
+    def _get_bucket(self):
+        if self._bucket is None:
+            with self._lock:
+                if self._bucket is None:
+                    try:
+                        from django_redis import get_redis_connection
+
+                        self._bucket = _BucketRedis(get_redis_connection("default"))
+                    except Exception as e:
+                        logger.info(
+                            "Caché sin Redis (%s); limitador de IGDB local al proceso.", e
+                        )
+                        self._bucket = _BucketLocal()
+        return self._bucket
+
+    def adquirir(self, prioridad=INTERACTIVA, espera_maxima=None):
+        """Bloquea hasta obtener turno y devuelve los segundos esperados.
+
+        Lanza ``EsperaAgotada`` si se supera ``espera_maxima``.
+        """
+        inicio = time.monotonic()
+        turnos = self._turnos(prioridad, espera_maxima)
+        try:
+            for espera in turnos:
+                time.sleep(espera)
+        finally:
+            turnos.close()
+        return time.monotonic() - inicio
+
+    async def aadquirir(self, prioridad=INTERACTIVA, espera_maxima=None):
+        """Versión asíncrona de ``adquirir``: espera sin bloquear el event loop."""
+        inicio = time.monotonic()
+        turnos = self._turnos(prioridad, espera_maxima)
+        try:
+            for espera in turnos:
+                await asyncio.sleep(espera)
+        finally:
+            turnos.close()
+        return time.monotonic() - inicio
+
+    def _turnos(self, prioridad, espera_maxima):
+        """Genera las esperas necesarias hasta obtener un token.
+
+        Quien lo consume duerme cada valor generado. La llamada al bucket es
+        un único viaje a Redis, así que se hace directamente también desde el
+        cliente asíncrono.
+        """
+        bucket = self._get_bucket()
+        fondo = prioridad == FONDO
+        if espera_maxima is None:
+            espera_maxima = self.espera_maxima_fondo if fondo else self.espera_maxima
+        inicio = time.monotonic()
+        marcado = False
+        try:
+            while True:
+                espera = bucket.intentar(fondo, self.tasa, self.capacidad, self.reserva)
+                if espera == 0:
+                    break
+                if not fondo and not marcado:
+                    bucket.marcar_esperando(1)
+                    marcado = True
+                transcurrido = time.monotonic() - inicio
+                if transcurrido + espera > espera_maxima:
+                    self._registrar(prioridad, transcurrido, agotada=True)
+                    raise EsperaAgotada(
+                        f"Sin turno para IGDB tras {transcurrido:.2f}s ({prioridad})"
+                    )
+                if marcado:
+                    # Refresca el TTL del contador mientras seguimos esperando.
+                    bucket.marcar_esperando(0)
+                yield espera
+        finally:
+            if marcado:
+                bucket.marcar_esperando(-1)
+
+        self._registrar(prioridad, time.monotonic() - inicio)
+
+    def _registrar(self, prioridad, espera, agotada=False):
+        with self._metricas_lock:
+            m = self._metricas.setdefault(
+                prioridad,
+                {"adquisiciones": 0, "agotadas": 0, "espera_total": 0.0, "espera_max": 0.0},
+            )
+            if agotada:
+                m["agotadas"] += 1
+            else:
+                m["adquisiciones"] += 1
+            m["espera_total"] += espera
+            m["espera_max"] = max(m["espera_max"], espera)
+
+    def metricas(self):
+        """Devuelve esperas (segundos) por carril de prioridad."""
+        with self._metricas_lock:
+            return {
+                prioridad: {
+                    **m,
+                    "espera_media": m["espera_total"] / m["adquisiciones"] if m["adquisiciones"] else 0.0,
+                }
+                for prioridad, m in self._metricas.items()
+            }
+
+
+# Instancia compartida por todo el proceso.
+limitador = LimitadorIGDB()
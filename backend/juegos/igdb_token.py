@@ -0,0 +1,106 @@
+"""Gestión del token de aplicación de Twitch usado por IGDB.
+
+El token se guarda en la caché compartida junto con su caducidad. Cuando le
+queda poco de vida, la primera petición que lo detecta lanza la renovación en
+un hilo de fondo bajo un lock de Redis y todas siguen usando el token vigente
+hasta que llega el nuevo, así que la renovación no añade latencia a ninguna
+petición. Solo si no hay token (primer arranque, caché vaciada) se renueva de
+forma síncrona, y aun así una única vez entre todos los workers.
+"""
+
+import logging
+import threading
+import time
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+from .single_flight import single_flight
+
+logger = logging.getLogger(__name__)
+
+TOKEN_CACHE_KEY = "igdb_token_info"
+LOCK_KEY = f"{TOKEN_CACHE_KEY}:lock"
+TTL_LOCK = 60
+# Se renueva cuando queda menos de este margen (o de media vida si es menor)
+MARGEN_RENOVACION = 24 * 3600
+
+
+class GestorTokenIGDB:
+    """Obtiene, cachea y renueva por adelantado el token de IGDB."""
+
+    def __init__(self, margen=MARGEN_RENOVACION):
+        self.margen = margen
+        self._renovando = threading.Event()
+
+    def obtener(self):
+        """Devuelve un token válido sin bloquear salvo que no exista ninguno."""
+        if getattr(settings, "IS_TESTING", False):
+            return "test_token_dummy_12345"
+
+        info = cache.get(TOKEN_CACHE_KEY)
+        ahora = time.time()
+        if info and info["expira"] > ahora:
+            if info["expira"] - ahora < min(self.margen, info["vida"] / 2):
+                self._renovar_en_segundo_plano()
+            return info["token"]
+
+        info = single_flight(TOKEN_CACHE_KEY, self._renovar, ttl_lock=TTL_LOCK)
+        return info["token"]
+
+    def invalidar(self, token_rechazado):
+        """Descarta ``token_rechazado`` (p. ej. tras un 401) y devuelve otro.
+
+        Si otro worker ya lo ha sustituido se reutiliza el nuevo sin pedir
+        uno más a Twitch.
+        """
+        info = cache.get(TOKEN_CACHE_KEY)
+        if info and info["token"] == token_rechazado:
+            cache.delete(TOKEN_CACHE_KEY)
+        return self.obtener()
+
+    def _renovar(self):
+        """Pide un token nuevo a Twitch y lo guarda en la caché compartida."""
+        auth = requests.post(
+            settings.TWITCH_TOKEN_URL,
+            data={
+                "client_id": settings.IGDB_CLIENT_ID,
+                "client_secret": settings.IGDB_CLIENT_SECRET,
+                "grant_type": "client_credentials",
+            },
+            timeout=(5, 15),
+        )
+        auth.raise_for_status()
+        data = auth.json()
+        vida = data.get("expires_in", 3600)
+        info = {"token": data["access_token"], "expira": time.time() + vida, "vida": vida}
+        cache.set(TOKEN_CACHE_KEY, info, timeout=vida)
+        logger.info("Token de IGDB renovado (caduca en %ss)", vida)
+        return info
+
+    def _renovar_en_segundo_plano(self):
+        if self._renovando.is_set() or not cache.add(LOCK_KEY, 1, TTL_LOCK):
+            return
+        self._renovando.set()
+
+        def tarea():
+            try:
+                self._renovar()
+                cache.delete(LOCK_KEY)
+            except Exception as e:
+                # El token actual sigue siendo válido; el lock se deja caducar
+                # para no reintentar contra Twitch en cada petición.
+                logger.warning(f"No se pudo renovar el token de IGDB: {e}")
+            finally:
+                self._renovando.clear()
+
+        threading.Thread(target=tarea, daemon=True, name="igdb-token").start()
+
+
+gestor_token = GestorTokenIGDB()
+
+
+def obtener_token_igdb():
+    """Recupera el token de autenticación de IGDB."""
+    return gestor_token.obtener()
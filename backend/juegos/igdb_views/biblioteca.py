@@ -1,17 +1,21 @@
 """Vistas relacionadas con la biblioteca personal de cada usuario."""
 
 import math
-import requests
-from django.conf import settings
 from rest_framework import permissions, viewsets
 from rest_framework.response import Response
 
-from .utils import obtener_token_igdb, IGDB_BASE_URL, chunked
+from .services import obtener_detalles_batch
 from ..models import Biblioteca
 from ..serializers import BibliotecaSerializer
 from actividad.utils import registrar_actividad, otorgar_logro
 
 
+CAMPOS_BIBLIOTECA = (
+    "id", "name", "summary", "cover", "first_release_date", "screenshots",
+    "platforms", "genres", "aggregated_rating", "rating_count", "websites",
+)
+
+
 class BibliotecaViewSet(viewsets.ModelViewSet):
     """CRUD de la biblioteca de juegos de un usuario."""
 
@@ -67,28 +71,7 @@ class BibliotecaViewSet(viewsets.ModelViewSet):
                 }
             )
 
-        token = obtener_token_igdb()
-        headers = {
-            "Client-ID": settings.IGDB_CLIENT_ID,
-            "Authorization": f"Bearer {token}",
-            "Accept": "application/json",
-            "Content-Type": "text/plain",
-        }
-
-        todos_juegos = []
-        campos = (
-            "id, name, summary, cover.url, first_release_date, "
-            "screenshots.url, platforms.name, genres.name, "
-            "aggregated_rating, rating_count, websites.url, websites.category"
-        )
-        for batch in chunked(game_ids, 500):
-            ids_str = ",".join(str(i) for i in batch)
-            q_str = f"fields {campos}; where id = ({ids_str}); limit {len(batch)};"
-            res = requests.post(f"{IGDB_BASE_URL}/games", headers=headers, data=q_str)
-            if res.status_code == 200:
-                todos_juegos.extend(res.json())
-            else:
-                print(f"[IGDB] Error al obtener datos de juegos: {res.text}")
+        todos_juegos = obtener_detalles_batch(game_ids, CAMPOS_BIBLIOTECA)
 
         return Response(
             {
@@ -1,38 +1,25 @@
 import logging
 import random
-from datetime import datetime, timedelta
+from datetime import timedelta
 from collections import Counter
-import requests
-from django.conf import settings
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.db.models import Avg, Count, Q
-from django.utils import timezone
 from ..models import Biblioteca, Juego, Valoracion
+from ..busqueda import filtrar_por_nombre
+from ..clasificaciones import filtrar
+from ..paginacion import ordenar
 from actividad.utils import registrar_actividad
-from .utils import (
-    IGDB_BASE_URL,
-    obtener_token_igdb,
-    chunked,
-)
+from ..igdb_client import igdb, igdb_async, IGDBError, MultiQuery
+from ..idiomas import ids_idiomas, nombres_idiomas
+from ..ingesta import guardar_juegos
+from ..single_flight import single_flight, single_flight_async
+from .utils import chunked
 
 
 logger = logging.getLogger(__name__)
 
-# ---------------------------------------------------------------------------
-# Utilidades IGDB
-# ---------------------------------------------------------------------------
-
-def _headers():
-    token = obtener_token_igdb()
-    return {
-        "Client-ID": settings.IGDB_CLIENT_ID,
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json",
-        "Content-Type": "text/plain",
-    }
-
-
 def buscar_y_cachear(q="", genero=None, plataforma=None, publisher=None,
                       filtro_adulto=True, orden="popular", asc=False, limite=60, offset=0):
     """
@@ -41,187 +28,294 @@ def buscar_y_cachear(q="", genero=None, plataforma=None, publisher=None,
     consulta a IGDB y guarda los resultados nuevos.
     """
     # 1. Construir QuerySet base
-    qs = Juego.objects.all()
+    qs = Juego.vigentes.all()
 
     if filtro_adulto:
-        # Excluir juegos con tema 42 (Erotica)
-        # Como themes es JSONField, usamos contains o icontains según la DB
-        # En MySQL JSON search puede ser limitado, pero asumimos temas como lista de enteros
-        pass 
-        # Nota: Filtrar JSON en MySQL/MariaDB puede requerir sintaxis específica.
-        # Por simplicidad y rendimiento, si 'themes' es lista de ints,
-        # lo hacemos en memoria si son pocos, o confiamos en que IGDB no nos mande basura.
-        # Para esta implementación, lo omitimos en la query DB compleja por ahora
-        # o lo manejamos post-fetch si el dataset es pequeño.
-        # IDEALMENTE: Usar capabilities de JSON de la DB.
+        # Excluir contenido adulto (tema 42 o clasificación AO), precalculado al guardar
+        qs = qs.filter(es_adulto=False)
     
-    if q.strip():
-        qs = qs.filter(name__icontains=q)
+    # Género, plataforma y distribuidora: joins con las tablas de clasificaciones
+    qs = filtrar(qs, genero=genero, plataforma=plataforma, publisher=publisher)
+
+    buscando = bool(q.strip())
+    if buscando:
+        qs = filtrar_por_nombre(qs, q)
     
     # 2. Si es una búsqueda por texto y tenemos pocos resultados, preguntar a IGDB
-    #    (Solo si estamos en la primera página para no spammear)
-    if q.strip() and offset == 0 and qs.count() < 10:
+    #    (Solo si estamos en la primera página para no spammear). Basta con
+    #    traer hasta 10 ids en vez de contar todas las coincidencias, y el QS
+    #    sigue sin evaluar, así que ya incluye lo que se guarde
+    if buscando and offset == 0 and len(qs.values_list("id", flat=True)[:10]) < 10:
         _buscar_en_igdb_y_guardar(q)
-        # Recargar QS después de guardar
-        qs = Juego.objects.filter(name__icontains=q)
 
-    # Filtros adicionales (post-query si son complejos con JSON, o en DB)
-    # Por eficiencia, aplicamos ordenamiento en DB
+    # Por eficiencia, aplicamos ordenamiento en DB. La vista pagina el QuerySet
+    return ordenar(qs, claves_orden(orden, asc, buscando))
+
+
+def claves_orden(orden="popular", asc=False, buscando=False):
+    """Claves ``(campo, descendente)`` del orden del listado, terminadas en ``id``.
+
+    Son las mismas para ordenar y para los cursores de ``juegos.paginacion``.
+    """
     if orden == "nombre":
-        qs = qs.order_by(f"{'' if asc else '-'}name")
+        campos = ["name"]
     elif orden == "fecha":
-        qs = qs.order_by(f"{'' if asc else '-'}first_release_date")
+        campos = ["first_release_date"]
+    elif buscando and not asc:
+        # Al buscar, "popular" pone primero las mejores coincidencias
+        campos = ["relevancia", "popularidad"]
     else:  # popularidad
-        qs = qs.order_by(f"{'' if asc else '-'}popularidad")
-
-    # Paginación manual sobre el QuerySet
-    # Nota: Si el usuario usa filtros de JSON (genero, plataforma) que no indexamos,
-    # puede ser lento. Para MVP, aplicamos filtros en memoria sobre los resultados paginaados
-    # SI son muchos. Pero mejor intentemos filtrar en DB si es posible.
-    
-    # Para simplificar y dado el modelo JSONField:
-    # Retornamos el QS para que la vista pagine, PERO
-    # si necesitamos filtrar por JSON, lo hacemos aquí convirtiendo a lista (ojo performance).
-    
-    # ESTRATEGIA: Mover filtros a DB usando 'contains' si es posible, o ignorarlos por ahora
-    # y mejorar el modelo después.
-    
-    # Vamos a devolver el QS tal cual, asumiendo que el grosso del filtrado es por 'q'.
-    return qs
+        campos = ["popularidad"]
+    return [(campo, not asc) for campo in campos + ["id"]]
 
 
 def _buscar_en_igdb_y_guardar(query_text):
     """Consulta IGDB por nombre y guarda resultados en DB."""
     try:
-        headers = _headers()
         # Buscamos campos básicos para la lista
         fields = (
             "id,name,slug,summary,cover.url,first_release_date,"
             "total_rating,total_rating_count,"
-            "genres.name,platforms.name,involved_companies.company.name,themes.name"
+            "genres.name,platforms.name,themes.name,involved_companies.company.name,"
+            "involved_companies.developer,involved_companies.publisher,age_ratings.rating"
         )
         # Usamos search de IGDB
         igdb_query = (
             f'fields {fields}; search "{query_text}"; limit 50;'
         )
-        res = requests.post(f"{IGDB_BASE_URL}/games", headers=headers, data=igdb_query)
-        if res.status_code == 200:
-            datos = res.json()
-            _guardar_juegos_batch(datos)
+        datos = igdb.consultar("games", igdb_query)
+        _guardar_juegos_batch(datos)
     except Exception as e:
         logger.error(f"Error buscando en IGDB: {e}")
 
 
 def _guardar_juegos_batch(lista_juegos_igdb):
     """Guarda o actualiza una lista de juegos de IGDB en la DB local."""
-    for j in lista_juegos_igdb:
-        # Extraer campos
-        try:
-            defaults = {
-                "name": j.get("name", "Unknown"),
-                "slug": j.get("slug"),
-                "summary": j.get("summary"),
-                "cover_url": j.get("cover", {}).get("url"),
-                "popularidad": j.get("total_rating") or 0.0, # Usamos rating como proxy de popularidad si no viene pop
-                "aggregated_rating": j.get("total_rating"),
-                "rating_count": j.get("total_rating_count", 0),
-                "genres": j.get("genres", []),
-                "platforms": j.get("platforms", []),
-                "involved_companies": j.get("involved_companies", []),
-                "themes": j.get("themes", []),
-            }
-            
-            # Convertir fecha timestamp a datetime
-            ts = j.get("first_release_date")
-            if ts:
-                dt = datetime.fromtimestamp(ts)
-                defaults["first_release_date"] = timezone.make_aware(dt)
-            
-            Juego.objects.update_or_create(id=j["id"], defaults=defaults)
-        except Exception as e:
-            logger.error(f"Error guardando juego {j.get('id')}: {e}")
+    return guardar_juegos(lista_juegos_igdb)
+
+
+# Copia obsoleta del detalle que se sirve mientras IGDB no está disponible
+DETALLE_STALE_TTL = 30 * 24 * 3600
+DETALLE_TTL = 172800
+# Máximo de ids por consulta ``where id = (...)`` a IGDB
+LOTE_DETALLES = 500
+
+# Campos del detalle completo. Los nombres de idioma se resuelven con la tabla
+# local ``Idioma``, así que basta con pedir los ids en la misma consulta.
+# ``total_rating`` y ``total_rating_count`` son los que guarda la ingesta, como
+# en la sincronización, para que la fila no cambie según quién la escriba
+CAMPOS_DETALLE = """
+    id, name, slug, summary, storyline, first_release_date, cover.url,
+    screenshots.url, platforms.name, genres.name,
+    involved_companies.company.name, involved_companies.developer,
+    involved_companies.publisher, videos.video_id,
+    aggregated_rating, rating_count, total_rating, total_rating_count,
+    collection.name,
+    age_ratings.rating, themes.name, game_modes.name,
+    player_perspectives.name, websites.url, websites.category,
+    similar_games.name, similar_games.cover.url,
+    language_supports.language
+"""
+# Campos que la fila local de ``Juego`` puede servir sin ir a IGDB
+CAMPOS_DB = {
+    "id", "name", "slug", "summary", "first_release_date", "cover", "genres",
+    "platforms", "themes", "aggregated_rating", "rating_count", "idiomas",
+}
+
+
+def _detalle_cache_key(juego_id):
+    return f"igdb_detalle_{juego_id}"
+
+
+def _detalle_stale_key(juego_id):
+    return f"igdb_detalle_stale_{juego_id}"
+
+
+def _detalle_desde_fila(juego_db):
+    """Detalle parcial construido con una fila local de ``Juego``."""
+    return {
+        "id": juego_db.id,
+        "name": juego_db.name,
+        "slug": juego_db.slug,
+        "summary": juego_db.summary,
+        "first_release_date": int(juego_db.first_release_date.timestamp()) if juego_db.first_release_date else None,
+        "cover": {"url": juego_db.cover_url} if juego_db.cover_url else {},
+        "genres": juego_db.genres,
+        "platforms": juego_db.platforms,
+        "themes": juego_db.themes,
+        "aggregated_rating": juego_db.aggregated_rating,
+        "rating_count": juego_db.rating_count,
+        "idiomas": nombres_idiomas(juego_db.idiomas),
+    }
+
+
+def _detalle_desde_db(juego_id):
+    """Detalle de la DB local marcado como obsoleto, para cuando IGDB falla."""
+    try:
+        juego_db = Juego.objects.get(id=juego_id)
+    except Juego.DoesNotExist:
+        return None
+    return {**_detalle_desde_fila(juego_db), "is_cached_fallback": True, "is_stale": True}
 
 
 def obtener_detalle_juego(juego_id, force_update=False):
     """Recupera información detallada de IGDB para un juego."""
     # 1. Intentar obtener RESPUESTA COMPLETA de caché Redis
-    cache_key = f"igdb_detalle_{juego_id}"
-    if not force_update:
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return cached_data
-
-    # 2. Si no está en caché o force_update, consultar IGDB
-    headers = _headers()
-    # Pedimos todo lo necesario para mostrar detalle
-    query = f"""
-        fields id, name, slug, summary, storyline, first_release_date, cover.url,
-               screenshots.url, platforms.name, genres.name,
-               involved_companies.company.name, involved_companies.developer,
-               involved_companies.publisher, videos.video_id,
-               aggregated_rating, rating_count, collection.name,
-               age_ratings.rating, themes.name, game_modes.name,
-               player_perspectives.name, websites.url, websites.category,
-               similar_games.name, similar_games.cover.url,
-               language_supports;
-        where id = {juego_id};
-    """
-    res = requests.post(f"{IGDB_BASE_URL}/games", headers=headers, data=query.strip())
-    
-    if res.status_code != 200:
-        # Fallback: intentar DB local si IGDB falla, aunque sea incompleta
-        try:
-             juego_db = Juego.objects.get(id=juego_id)
-             return {
-                "id": juego_db.id,
-                "name": juego_db.name,
-                "slug": juego_db.slug,
-                "summary": juego_db.summary,
-                "first_release_date": int(juego_db.first_release_date.timestamp()) if juego_db.first_release_date else None,
-                "cover": {"url": juego_db.cover_url} if juego_db.cover_url else {},
-                "genres": juego_db.genres,
-                "platforms": juego_db.platforms,
-                "is_cached_fallback": True 
-             }
-        except Juego.DoesNotExist:
-             return None
-    
-    data = res.json()
+    cache_key = _detalle_cache_key(juego_id)
+    if force_update:
+        return _descargar_detalle_juego(juego_id)
+
+    cached_data = cache.get(cache_key)
+    if cached_data:
+        return cached_data
+
+    # 2. Si no está en caché, una sola petición entre todos los workers
+    #    consulta IGDB y el resto reutiliza su resultado
+    return single_flight(cache_key, lambda: _descargar_detalle_juego(juego_id))
+
+
+def _descargar_detalle_juego(juego_id):
+    """Consulta IGDB, actualiza la DB local y cachea el detalle completo."""
+    try:
+        data = igdb.consultar("games", _consulta_detalle(juego_id))
+    except IGDBError as e:
+        logger.warning(f"IGDB no disponible para detalle {juego_id}: {e}")
+        return _respaldo_detalle(juego_id)
+    return _procesar_detalle(juego_id, data)
+
+
+async def obtener_detalle_juego_async(juego_id):
+    """Versión asíncrona de ``obtener_detalle_juego`` para vistas ASGI."""
+    cache_key = _detalle_cache_key(juego_id)
+    cached_data = await cache.aget(cache_key)
+    if cached_data:
+        return cached_data
+    return await single_flight_async(cache_key, lambda: _descargar_detalle_juego_async(juego_id))
+
+
+async def _descargar_detalle_juego_async(juego_id):
+    # Solo la llamada a IGDB es asíncrona; el guardado en DB va a un hilo
+    try:
+        data = await igdb_async.consultar("games", _consulta_detalle(juego_id))
+    except IGDBError as e:
+        logger.warning(f"IGDB no disponible para detalle {juego_id}: {e}")
+        return await sync_to_async(_respaldo_detalle)(juego_id)
+    return await sync_to_async(_procesar_detalle)(juego_id, data)
+
+
+def _consulta_detalle(juego_id):
+    return f"fields {CAMPOS_DETALLE}; where id = {juego_id};"
+
+
+def _respaldo_detalle(juego_id):
+    """Última copia completa en Redis o, si no, la DB local, marcadas como obsoletas."""
+    stale = cache.get(_detalle_stale_key(juego_id))
+    if stale:
+        return {**stale, "is_stale": True}
+    return _detalle_desde_db(juego_id)
+
+
+def _procesar_detalle(juego_id, data):
+    """Guarda en DB y Redis la respuesta de IGDB para ``juego_id``."""
     if not data:
         return None
 
     juego_data = data[0]
     
-    # 3. Guardar en DB local para búsquedas/listados (solo datos parciales soportados por modelo)
+    # Guardar en DB local para búsquedas/listados (solo datos parciales soportados por modelo)
     # Esto asegura que búsquedas funcionen, aunque detalles dependan de Redis/IGDB
     try:
         _guardar_juegos_batch([juego_data])
     except Exception as e:
         logger.error(f"Error actualizando DB local en detalle: {e}")
 
-    # 4. Procesar idiomas extra
-    language_ids = juego_data.get("language_supports", [])
-    idiomas = []
-    if language_ids:
-        # (Lógica de idiomas se mantiene igual)
-        ids_str = ",".join(str(i) for i in language_ids[:20]) 
-        if ids_str:
-            q_ids = f"fields language.name,language.native_name; where id=({ids_str});"
-            res_ids = requests.post(f"{IGDB_BASE_URL}/language_support", headers=headers, data=q_ids)
-            if res_ids.status_code == 200:
-                for l in res_ids.json():
-                    lang = l.get("language") or {}
-                    name = lang.get("name") or lang.get("native_name")
-                    if name:
-                        idiomas.append(name)
-    juego_data["idiomas"] = idiomas
+    # Nombres de idioma desde la tabla local, sin más llamadas
+    juego_data["idiomas"] = nombres_idiomas(ids_idiomas(juego_data.get("language_supports")))
     
-    # 5. Guardar respuesta COMPLETA en Redis (TTL 48 horas)
-    cache.set(cache_key, juego_data, 172800)
+    # Guardar respuesta COMPLETA en Redis (TTL 48 horas) y una copia
+    # duradera para servirla si IGDB cae
+    cache.set(_detalle_cache_key(juego_id), juego_data, DETALLE_TTL)
+    cache.set(_detalle_stale_key(juego_id), juego_data, DETALLE_STALE_TTL)
     
     return juego_data
 
 
+def _proyectar(detalle, fields):
+    if not fields:
+        return detalle
+    return {k: v for k, v in detalle.items() if k in fields or k in ("id", "is_stale")}
+
+
+def obtener_detalles_batch(ids, fields=None):
+    """Detalle de muchos juegos a la vez, en el orden de ``ids``.
+
+    Orden de búsqueda: un ``get_many`` sobre las claves de detalle de Redis,
+    una única lectura de la DB local (solo si ``fields`` cabe en las columnas
+    de ``Juego``) y, para lo que falte, IGDB en lotes de ``LOTE_DETALLES`` ids.
+    Lo descargado se escribe en Redis con un solo ``set_many``. Los juegos que
+    no existen se omiten.
+    """
+    ids = list(dict.fromkeys(int(i) for i in ids))
+    fields = set(fields) if fields else None
+    encontrados = {}
+
+    # 1. Redis (MGET)
+    claves = {_detalle_cache_key(i): i for i in ids}
+    for clave, detalle in cache.get_many(list(claves)).items():
+        encontrados[claves[clave]] = detalle
+    faltan = [i for i in ids if i not in encontrados]
+
+    # 2. DB local, si basta con sus columnas
+    if faltan and fields and fields <= CAMPOS_DB:
+        for juego_db in Juego.objects.filter(id__in=faltan):
+            encontrados[juego_db.id] = _detalle_desde_fila(juego_db)
+        faltan = [i for i in ids if i not in encontrados]
+
+    # 3. IGDB en lotes, con respaldo obsoleto si no está disponible
+    descargados, fallidos = {}, []
+    for lote in chunked(faltan, LOTE_DETALLES):
+        ids_str = ",".join(str(i) for i in lote)
+        try:
+            datos = igdb.consultar(
+                "games",
+                f"fields {CAMPOS_DETALLE}; where id = ({ids_str}); limit {len(lote)};",
+            )
+        except IGDBError as e:
+            logger.warning(f"IGDB no disponible para {len(lote)} detalles: {e}")
+            fallidos.extend(lote)
+            continue
+        for juego_data in datos:
+            juego_data["idiomas"] = nombres_idiomas(
+                ids_idiomas(juego_data.get("language_supports"))
+            )
+            descargados[juego_data["id"]] = juego_data
+
+    if descargados:
+        try:
+            _guardar_juegos_batch(list(descargados.values()))
+        except Exception as e:
+            logger.error(f"Error actualizando DB local en detalles: {e}")
+        cache.set_many({_detalle_cache_key(i): d for i, d in descargados.items()}, DETALLE_TTL)
+        cache.set_many(
+            {_detalle_stale_key(i): d for i, d in descargados.items()}, DETALLE_STALE_TTL
+        )
+        encontrados.update(descargados)
+
+    if fallidos:
+        stale = cache.get_many([_detalle_stale_key(i) for i in fallidos])
+        for i in fallidos:
+            detalle = stale.get(_detalle_stale_key(i))
+            if detalle:
+                encontrados[i] = {**detalle, "is_stale": True}
+        sin_copia = [i for i in fallidos if i not in encontrados]
+        for juego_db in Juego.objects.filter(id__in=sin_copia):
+            encontrados[juego_db.id] = {
+                **_detalle_desde_fila(juego_db), "is_cached_fallback": True, "is_stale": True,
+            }
+
+    return [_proyectar(encontrados[i], fields) for i in ids if i in encontrados]
+
+
 def obtener_filtros():
     """Solicita a IGDB las opciones de filtro disponibles."""
     # Intentar obtener de caché Redis
@@ -230,37 +324,26 @@ def obtener_filtros():
     if cached_data:
         return cached_data
 
-    # Si no está en caché, consultar API
-    headers = _headers()
-    res_gen = requests.post(
-        f"{IGDB_BASE_URL}/genres",
-        headers=headers,
-        data="fields id,name; limit 500;",
+    # Si no está en caché, consultar API (las tres listas en un solo viaje)
+    consulta = (
+        MultiQuery()
+        .add("genres", "genres", "fields id,name; limit 500;")
+        .add("platforms", "platforms", "fields id,name; limit 500;")
+        .add("publishers", "companies", "fields id,name; where published = true; limit 500;")
     )
-    genres = res_gen.json() if res_gen.status_code == 200 else []
-
-    res_plat = requests.post(
-        f"{IGDB_BASE_URL}/platforms",
-        headers=headers,
-        data="fields id,name; limit 500;",
-    )
-    platforms = res_plat.json() if res_plat.status_code == 200 else []
-
-    res_pub = requests.post(
-        f"{IGDB_BASE_URL}/companies",
-        headers=headers,
-        data="fields id,name; where published = true; limit 500;",
-    )
-    publishers = res_pub.json() if res_pub.status_code == 200 else []
-
-    resultado = {
-        "genres": genres,
-        "platforms": platforms,
-        "publishers": publishers,
-    }
+    try:
+        resultado = igdb.multiquery(consulta)
+    except IGDBError as e:
+        # Sin cachear: el siguiente intento volverá a consultar IGDB
+        logger.warning(f"Error consultando filtros en IGDB: {e}")
+        stale = cache.get(f"{cache_key}_stale")
+        if stale:
+            return {**stale, "is_stale": True}
+        return consulta.repartir([])
     
     # Guardar en caché por 24 horas (86400 segundos)
     cache.set(cache_key, resultado, 86400)
+    cache.set(f"{cache_key}_stale", resultado, DETALLE_STALE_TTL)
     
     return resultado
 
@@ -278,27 +361,30 @@ def calcular_stats_bienvenida():
     bibliotecas = Biblioteca.objects.count()
     # Usar .count() es rápido en MyISAM/InnoDB (si count aprox) pero count(*) real puede tardar.
     # Cacheamos el resultado final así que está bien.
-    total_juegos = Juego.objects.count()
+    total_juegos = Juego.vigentes.count()
+    # La portada es pública: solo se muestran juegos sin contenido adulto
+    aptos = Juego.vigentes.filter(es_adulto=False)
+    total_mostrados = aptos.count()
 
     # Obtener populares reales de la DB local
-    populares_qs = Juego.objects.order_by('-popularidad')[:10]
+    populares_qs = aptos.order_by('-popularidad')[:10]
     
     # Obtener random optimizado
     # Evitamos order_by('?') que es full scan
-    count = total_juegos
+    count = total_mostrados
     random_juegos = []
     if count > 0:
         if count <= 10:
-             random_juegos = list(Juego.objects.all())
+             random_juegos = list(aptos)
         else:
             # Opción eficiente: Obtener un rango de IDs o samplear IDs
             # Traer todos los IDs es ligero (pocos MB para 100k juegos)
-            all_ids = list(Juego.objects.values_list('id', flat=True))
+            all_ids = list(aptos.values_list('id', flat=True))
             if len(all_ids) > 10:
                 random_ids = random.sample(all_ids, 10)
                 random_juegos = list(Juego.objects.filter(id__in=random_ids))
             else:
-                 random_juegos = list(Juego.objects.all())
+                 random_juegos = list(aptos)
 
     def serializar(juego):
         return {
@@ -311,7 +397,7 @@ def calcular_stats_bienvenida():
 
     resultado = {
         "totalJuegos": total_juegos,
-        "totalJuegosMostrados": total_juegos,
+        "totalJuegosMostrados": total_mostrados,
         "totalUsuarios": usuarios,
         "totalBibliotecas": bibliotecas,
         "juegosPopulares": [serializar(j) for j in populares_qs],
@@ -431,7 +517,7 @@ def calcular_recomendaciones_usuario(usuario, limite=10):
     # 3. Buscar juegos (FALLBACK simple: Populares que no tengo)
     # Por ahora seguimos con la estrategia de populares, pero cacheada.
     # TODO: Implementar filtro real por JSON de géneros cuando sea posible optimizarlo.
-    recomendados = Juego.objects.exclude(id__in=mis_ids).order_by('-popularidad')[:limite]
+    recomendados = Juego.vigentes.exclude(id__in=mis_ids).order_by('-popularidad')[:limite]
 
     resultado = [
         {
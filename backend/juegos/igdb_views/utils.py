@@ -1,16 +1,17 @@
 """Funciones auxiliares usadas por los servicios de IGDB."""
 
 import time
+import httpx
 import requests
 from datetime import timedelta
 from django.conf import settings
 from django.core.cache import cache
-from utils.http import safe_post
 from howlongtobeatpy import HowLongToBeat
 from howlongtobeatpy.JSONResultParser import JSONResultParser
+from ..igdb_client import igdb
 from ..models import Juego, DuracionJuego
 
-IGDB_BASE_URL = "https://api.igdb.com/v4"
+IGDB_BASE_URL = settings.IGDB_BASE_URL
 DESCARGANDO_KEY = "igdb_descargando_todo"
 DESCARGANDO_COMPLETADO_KEY = "igdb_descarga_completa"
 HLTB_BASE_URL = "https://howlongtobeat.com"
@@ -23,28 +24,6 @@ HLTB_USER_AGENT = (
     "Chrome/120.0 Safari/537.36"
 )
 
-def obtener_token_igdb():
-    """Recupera y cachea el token de autenticación de IGDB."""
-    if getattr(settings, 'IS_TESTING', False):
-        return "test_token_dummy_12345"
-
-    token = cache.get("igdb_token")
-    if not token:
-        auth = requests.post(
-            "https://id.twitch.tv/oauth2/token",
-            data={
-                "client_id": settings.IGDB_CLIENT_ID,
-                "client_secret": settings.IGDB_CLIENT_SECRET,
-                "grant_type": "client_credentials",
-            },
-        )
-        auth.raise_for_status()
-        data = auth.json()
-        token = data["access_token"]
-        cache.set("igdb_token", token, timeout=data.get("expires_in", 3600))
-    return token
-
-
 def chunked(iterable, size):
     """Divide un iterable en porciones de tamaño ``size``."""
     for i in range(0, len(iterable), size):
@@ -169,22 +148,78 @@ def buscar_hltb(nombre, minimum_similarity=0.4, similarity_case_sensitive=True,
         return None
 
 
+async def _hltb_get_token_async(cliente, force_refresh=False):
+    if not force_refresh:
+        token = await cache.aget(HLTB_TOKEN_CACHE_KEY)
+        if token:
+            return token
+    resp = await cliente.get(
+        f"{HLTB_BASE_URL}/api/search/init",
+        headers=_hltb_headers(),
+        params={"t": int(time.time() * 1000)},
+    )
+    resp.raise_for_status()
+    token = resp.json().get("token")
+    if token:
+        await cache.aset(HLTB_TOKEN_CACHE_KEY, token, timeout=HLTB_TOKEN_TTL)
+    return token
+
+
+async def _hltb_search_api_async(game_name):
+    payload = _hltb_payload(game_name)
+    async with httpx.AsyncClient(timeout=20) as cliente:
+        token = await _hltb_get_token_async(cliente)
+        if not token:
+            return None
+        headers = {**_hltb_headers(), "x-auth-token": token}
+        resp = await cliente.post(f"{HLTB_BASE_URL}/api/search", headers=headers, json=payload)
+        if resp.status_code == 403:
+            token = await _hltb_get_token_async(cliente, force_refresh=True)
+            if not token:
+                return None
+            headers["x-auth-token"] = token
+            resp = await cliente.post(f"{HLTB_BASE_URL}/api/search", headers=headers, json=payload)
+    if resp.status_code != 200:
+        return None
+    return resp.text
+
+
+async def buscar_hltb_async(nombre, minimum_similarity=0.4, similarity_case_sensitive=True,
+                            auto_filter_times=False):
+    """Versión asíncrona de ``buscar_hltb`` para vistas ASGI."""
+    if not nombre:
+        return None
+    try:
+        json_text = await _hltb_search_api_async(nombre)
+        if json_text:
+            parser = JSONResultParser(
+                nombre,
+                HLTB_GAME_URL,
+                minimum_similarity,
+                input_similarity_case_sensitive=similarity_case_sensitive,
+                input_auto_filter_times=auto_filter_times,
+            )
+            parser.parse_json_result(json_text)
+            return parser.results
+    except Exception:
+        pass
+    try:
+        return await HowLongToBeat(minimum_similarity, auto_filter_times).async_search(
+            nombre,
+            similarity_case_sensitive=similarity_case_sensitive,
+        )
+    except Exception:
+        return None
+
+
 def obtener_nombre_juego(juego_id):
     """Obtiene el nombre de un juego a partir de su ID."""
     cache_key = f"nombre_juego_{juego_id}"
     nombre = cache.get(cache_key)
     if nombre:
         return nombre
-    token = obtener_token_igdb()
-    headers = {
-        "Client-ID": settings.IGDB_CLIENT_ID,
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json",
-        "Content-Type": "text/plain",
-    }
     query = f"fields name; where id = {juego_id}; limit 1;"
-    resp = safe_post(f"{IGDB_BASE_URL}/games", headers, query)
-    data = resp.json()
+    data = igdb.consultar("games", query)
     if not data:
         return None
     nombre = data[0].get("name")
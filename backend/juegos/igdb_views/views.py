@@ -8,8 +8,11 @@ from rest_framework.response import Response
 
 from .services import (
     buscar_y_cachear,
+    claves_orden,
     obtener_detalle_juego,
+    obtener_detalles_batch,
     obtener_filtros,
+    LOTE_DETALLES,
     calcular_stats_bienvenida,
     buscar_juego_por_id_igdb,
     buscar_en_biblioteca_igdb,
@@ -17,6 +20,10 @@ from .services import (
     calcular_recomendaciones_usuario,
 )
 from .utils import buscar_hltb
+from ..cache_listados import obtener_pagina
+from ..conteos import contar, contar_catalogo
+from ..paginacion import CursorInvalido, pagina as pagina_por_cursor
+from usuarios.models import filtro_adulto_de
 
 
 @api_view(["GET"])
@@ -40,62 +47,71 @@ def listar_juegos(request):
     plataforma = request.GET.get("plataforma")
     publisher = request.GET.get("publisher")
 
+    # Los anónimos siempre lo tienen activo; sin ``adult`` se usa el del perfil
     filtro_adulto_param = request.GET.get("adult")
-    filtro_adulto = True
     if request.user.is_authenticated and filtro_adulto_param is not None:
         filtro_adulto = filtro_adulto_param in ["1", "true", "True", True]
+    else:
+        filtro_adulto = filtro_adulto_de(request.user)
 
-    # Usar nuevo servicio de búsqueda
-    qs = buscar_y_cachear(
-        q=q,
-        genero=genero,
-        plataforma=plataforma,
-        publisher=publisher,
-        filtro_adulto=filtro_adulto,
-        orden=orden_param,
-        asc=asc,
-        limite=por_pagina,
-        offset=(pagina - 1) * por_pagina
-    )
-
-    from django.core.paginator import Paginator
-    paginator = Paginator(qs, por_pagina)
-    
+    # Con ``cursor`` (vacío para la primera página) se pagina por clave en vez
+    # de por número de página
+    cursor = request.GET.get("cursor")
+    if cursor is not None:
+        # Para el servicio solo cuenta si es la primera página
+        offset = por_pagina if cursor else 0
+        posicion = {"cursor": cursor}
+    else:
+        offset = (pagina - 1) * por_pagina
+        posicion = {"pagina": pagina}
+    filtros = {
+        "q": q, "genero": genero, "plataforma": plataforma, "publisher": publisher,
+        "filtro_adulto": filtro_adulto,
+    }
+
+    def calcular():
+        # Usar nuevo servicio de búsqueda
+        qs = buscar_y_cachear(
+            orden=orden_param,
+            asc=asc,
+            limite=por_pagina,
+            offset=offset,
+            **filtros,
+        )
+
+        # Totales cacheados por filtros y versión del catálogo (ver juegos.conteos)
+        total = contar(qs, **filtros)
+        sin_filtrar, aproximado = contar_catalogo(filtro_adulto)
+        totales = {
+            "total_resultados": total,
+            "total_sin_filtrar": sin_filtrar,
+            "total_sin_filtrar_aproximado": aproximado,
+            "paginas_totales": max(math.ceil(total / por_pagina), 1),
+        }
+
+        if cursor is not None:
+            claves = claves_orden(orden_param, asc, buscando=bool(q.strip()))
+            juegos, siguiente, anterior = pagina_por_cursor(qs, claves, cursor, por_pagina)
+            return juegos, {"siguiente": siguiente, "anterior": anterior, **totales}
+
+        # Si pagina fuera de rango se devuelve la primera
+        pagina_actual = pagina
+        if pagina_actual > totales["paginas_totales"]:
+            pagina_actual = 1
+        inicio = (pagina_actual - 1) * por_pagina
+        juegos = list(qs[inicio:inicio + por_pagina])
+        return juegos, {**totales, "ocultos": 0, "pagina_actual": pagina_actual}
+
+    # Las páginas se sirven desde la caché de listados (ids por página y
+    # juegos con multi-get), invalidada con la versión del catálogo
     try:
-        page_obj = paginator.page(pagina)
-    except Exception:
-        # Si pagina fuera de rango, devolver ultima o vacia? 
-        # Mejor devolver pagina 1 o vacia si es muy alta
-        page_obj = paginator.page(1)
-        pagina = 1
-
-    # Serializar resultados
-    juegos_data = []
-    for j in page_obj:
-        juegos_data.append({
-            "id": j.id,
-            "name": j.name,
-            "cover": {"url": j.cover_url} if j.cover_url else {},
-            "summary": j.summary,
-            "popularidad": j.popularidad,
-            "first_release_date": j.first_release_date.timestamp() if j.first_release_date else None,
-            # Agregamos generos si es necesario para algun filtro en frontend, 
-            # pero frontend suele pedir detalle para eso.
-        })
-
-    return Response(
-        {
-            "juegos": juegos_data,
-            "total_resultados": paginator.count,
-            "total_sin_filtrar": paginator.count, # Ya no es relevante el "sin filtrar" real global
-            "ocultos": 0,
-            "pagina_actual": pagina,
-            "paginas_totales": paginator.num_pages,
-        },
-        status=status.HTTP_200_OK,
-    )
-    
-    
+        juegos, datos = obtener_pagina(
+            {**filtros, "orden": orden_param, "asc": asc, "por_pagina": por_pagina, **posicion},
+            calcular,
+        )
+    except CursorInvalido as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({"juegos": juegos, **datos}, status=status.HTTP_200_OK)
 
 
 @api_view(["GET"])
@@ -115,6 +131,31 @@ def detalle_juego(request, id):
         )
 
 
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def detalle_juegos_batch(request):
+    """Detalle de varios juegos en una sola petición: ``?ids=1,2,3&fields=name,cover``."""
+    try:
+        ids = [int(i) for i in request.GET.get("ids", "").split(",") if i.strip()]
+    except ValueError:
+        return Response({"error": "'ids' debe ser una lista de números separados por comas."}, status=400)
+    if not ids:
+        return Response({"error": "Parámetro 'ids' requerido."}, status=400)
+    if len(ids) > LOTE_DETALLES:
+        return Response({"error": f"Máximo {LOTE_DETALLES} ids por petición."}, status=400)
+
+    fields = [f.strip() for f in request.GET.get("fields", "").split(",") if f.strip()]
+    try:
+        juegos = obtener_detalles_batch(ids, fields or None)
+        return Response({"juegos": juegos}, status=status.HTTP_200_OK)
+    except Exception as e:
+        print("Error en detalle_juegos_batch:", e)
+        return Response(
+            {"error": "Error interno del servidor"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def filtros_juegos(request):
@@ -0,0 +1,69 @@
+"""Versiones asíncronas de las vistas que pasan casi todo el tiempo esperando
+a IGDB o HowLongToBeat.
+
+Servidas por ASGI (``gestor_videojuegos/asgi.py``) permiten tener cientos de
+llamadas salientes en vuelo por proceso en lugar de una por worker. DRF no
+admite vistas ``async``, así que son vistas Django que devuelven
+``JsonResponse`` con el mismo formato que sus equivalentes síncronas. Solo se
+enrutan cuando ``VISTAS_ASYNC`` está activo (ver ``juegos/urls.py``).
+"""
+
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from .services import obtener_detalle_juego_async
+from .utils import buscar_hltb_async
+
+
+@require_GET
+async def detalle_juego(request, id):
+    """Devuelve la información detallada de un juego por su ID."""
+    try:
+        juego = await obtener_detalle_juego_async(id)
+        if not juego:
+            return JsonResponse({"error": "Juego no encontrado"}, status=404)
+        return JsonResponse(juego)
+    except Exception as e:
+        print("Error en detalle_juego:", e)
+        return JsonResponse({"error": "Error interno del servidor"}, status=500)
+
+
+@require_GET
+async def buscar_juego_por_id(request):
+    """Busca un juego en IGDB por su ID y lo devuelve."""
+    game_id = request.GET.get("id")
+    if not game_id or not str(game_id).isdigit():
+        return JsonResponse({"error": "Parámetro 'id' requerido y debe ser numérico."}, status=400)
+
+    try:
+        juego = await obtener_detalle_juego_async(int(game_id))
+        if not juego:
+            return JsonResponse({"error": "No encontrado en IGDB"}, status=404)
+        return JsonResponse(juego)
+    except Exception as e:
+        print("Error buscar_juego_por_id:", e)
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+@require_GET
+async def tiempo_juego(request):
+    """Obtiene la duración estimada de un juego mediante HowLongToBeat."""
+    nombre = request.GET.get("nombre")
+    if not nombre:
+        return JsonResponse({"error": "nombre requerido"}, status=400)
+    try:
+        resultados = await buscar_hltb_async(nombre)
+        if not resultados:
+            return JsonResponse({"found": False})
+        mejor = max(resultados, key=lambda r: r.similarity)
+        return JsonResponse(
+            {
+                "found": True,
+                "main": mejor.main_story,
+                "main_extra": mejor.main_extra,
+                "completionist": mejor.completionist,
+            }
+        )
+    except Exception as e:
+        print("Error tiempo_juego:", e)
+        return JsonResponse({"found": False, "error": "hl2b_unavailable"})
@@ -0,0 +1,207 @@
+"""Escritura masiva de juegos de IGDB en la tabla ``Juego``.
+
+Un lote entero se transforma en memoria y se guarda con un único
+``bulk_create(update_conflicts=True)`` (``INSERT ... ON DUPLICATE KEY UPDATE``
+en MySQL) dentro de una transacción, en lugar de un SELECT más un
+INSERT/UPDATE por juego. Los juegos cuyo hash de contenido coincide con el
+guardado no se escriben. El hash cubre solo los campos que pide toda consulta;
+los opcionales se comparan aparte con lo guardado, para que una escritura
+con ellos y otra sin ellos no se tomen por cambios. Si la sentencia del lote
+falla, se reintenta fila a fila para aislar las filas problemáticas y guardar
+el resto; el resultado indica qué ids fallaron y por qué.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import DatabaseError, connection, transaction
+
+from .clasificaciones import es_adulto, relacionar
+from .idiomas import ids_idiomas
+from .models import Juego
+from .popularidad import plegar_popularidad
+from .version_catalogo import incrementar_version
+
+logger = logging.getLogger(__name__)
+
+# Columnas que se sobrescriben cuando el juego ya existe
+# (``popularidad`` no: la calcula ``juegos.popularidad`` a partir de IGDB)
+CAMPOS_ACTUALIZABLES = [
+    "name", "slug", "summary", "cover_url", "first_release_date",
+    "aggregated_rating", "rating_count", "genres", "platforms",
+    "involved_companies", "themes", "es_adulto", "updated_at", "eliminado",
+]
+# Columnas de control que no forman parte del contenido de IGDB
+_FUERA_DEL_HASH = {"updated_at", "eliminado"}
+# Solo se actualizan si la consulta a IGDB los pidió; si no, se conservan
+CAMPOS_OPCIONALES = {"idiomas": "language_supports"}
+# Columnas que muestran o filtran los listados: solo si cambia alguna se
+# incrementa la versión del catálogo (y se descartan sus cachés)
+CAMPOS_LISTADO = [
+    "name", "summary", "cover_url", "first_release_date", "genres", "platforms",
+    "involved_companies", "themes", "es_adulto", "eliminado",
+]
+
+_metricas = Counter()
+_metricas_lock = threading.Lock()
+
+
+def _fecha(ts):
+    return datetime.fromtimestamp(ts, tz=dt_timezone.utc) if ts else None
+
+
+def transformar(j):
+    """Convierte un juego de IGDB en una instancia (sin guardar) de ``Juego``."""
+    cover = j.get("cover")
+    juego = Juego(
+        id=int(j["id"]),
+        name=j.get("name", "Unknown"),
+        slug=j.get("slug"),
+        summary=j.get("summary"),
+        cover_url=cover.get("url") if isinstance(cover, dict) else None,
+        first_release_date=_fecha(j.get("first_release_date")),
+        aggregated_rating=j.get("total_rating"),
+        rating_count=j.get("total_rating_count", 0),
+        genres=j.get("genres", []),
+        platforms=j.get("platforms", []),
+        involved_companies=j.get("involved_companies", []),
+        themes=j.get("themes", []),
+        es_adulto=es_adulto(j.get("themes"), j.get("age_ratings")),
+    )
+    if "language_supports" in j:
+        juego.idiomas = ids_idiomas(j["language_supports"])
+    return juego
+
+
+def upsert(filas, campos, modelo=Juego, unicos=("id",)):
+    """``INSERT ... ON CONFLICT/DUPLICATE KEY UPDATE`` de ``filas`` en una transacción."""
+    kwargs = {"update_conflicts": True, "update_fields": campos}
+    if connection.features.supports_update_conflicts_with_target:
+        # PostgreSQL/SQLite exigen las columnas del conflicto; MySQL no las admite
+        kwargs["unique_fields"] = list(unicos)
+    with transaction.atomic():
+        modelo.objects.bulk_create(filas, **kwargs)
+
+
+def hash_contenido(juego):
+    """Huella de 64 bits de los campos de contenido de ``juego`` (sin los opcionales)."""
+    valores = [getattr(juego, c) for c in CAMPOS_ACTUALIZABLES if c not in _FUERA_DEL_HASH]
+    canonico = json.dumps(valores, default=str, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.blake2b(canonico.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _registrar(insertados, actualizados, sin_cambios, fallidos):
+    with _metricas_lock:
+        _metricas["insertados"] += insertados
+        _metricas["actualizados"] += actualizados
+        _metricas["sin_cambios"] += sin_cambios
+        _metricas["fallidos"] += fallidos
+
+
+def metricas():
+    """Totales de filas insertadas, actualizadas, sin cambios y fallidas."""
+    with _metricas_lock:
+        return dict(_metricas)
+
+
+def reiniciar_metricas():
+    with _metricas_lock:
+        _metricas.clear()
+
+
+def guardar_juegos(lista_juegos_igdb):
+    """Inserta o actualiza un lote de juegos de IGDB.
+
+    Antes de escribir se comparan en bloque los hashes de contenido con los
+    guardados y solo se escriben los juegos nuevos o cambiados. Devuelve
+    ``{"procesados", "guardados", "insertados", "actualizados",
+    "sin_cambios", "fallidos"}``, con ``fallidos`` como lista de
+    ``{"id", "error"}``.
+    """
+    fallidos = []
+    grupos = {}
+    for j in lista_juegos_igdb:
+        try:
+            juego = transformar(j)
+        except Exception as e:
+            fallidos.append({"id": j.get("id") if isinstance(j, dict) else None, "error": str(e)})
+            continue
+        opcionales = tuple(c for c, origen in CAMPOS_OPCIONALES.items() if origen in j)
+        # Un id repetido en el lote se queda con su última versión
+        grupos.setdefault(opcionales, {})[juego.id] = juego
+
+    ids = [i for filas in grupos.values() for i in filas]
+    existentes = {
+        fila["id"]: fila
+        for fila in Juego.objects.filter(id__in=ids).values(
+            "id", "hash_contenido", *CAMPOS_OPCIONALES, *CAMPOS_LISTADO
+        )
+    }
+    # IGDB vuelve a devolverlos: se reescriben para quitar la lápida
+    lapidas = {i for i, fila in existentes.items() if fila["eliminado"]}
+    insertados = []
+    actualizados = 0
+    sin_cambios = 0
+    todas_escritas = []
+    for opcionales, filas in grupos.items():
+        campos = CAMPOS_ACTUALIZABLES + list(opcionales)
+        cambiadas = []
+        for juego in filas.values():
+            juego.hash_contenido = hash_contenido(juego)
+            guardado = existentes.get(juego.id)
+            if (guardado and guardado["hash_contenido"] == juego.hash_contenido
+                    and juego.id not in lapidas
+                    and all(getattr(juego, c) == guardado[c] for c in opcionales)):
+                sin_cambios += 1
+            else:
+                cambiadas.append(juego)
+        if not cambiadas:
+            continue
+
+        campos.append("hash_contenido")
+        try:
+            upsert(cambiadas, campos)
+            escritas = cambiadas
+        except DatabaseError as e:
+            logger.warning(f"Fallo el upsert de {len(cambiadas)} juegos ({e}); se reintenta fila a fila")
+            escritas = []
+            for fila in cambiadas:
+                try:
+                    upsert([fila], campos)
+                    escritas.append(fila)
+                except DatabaseError as e_fila:
+                    fallidos.append({"id": fila.id, "error": str(e_fila)})
+        todas_escritas.extend(escritas)
+        for juego in escritas:
+            if juego.id in existentes:
+                actualizados += 1
+            else:
+                insertados.append(juego.id)
+
+    # Géneros, plataformas... de lo escrito, en las tablas que usan los filtros
+    relacionar(todas_escritas, nuevos=set(insertados))
+    # Los juegos nuevos reciben la popularidad que ya se hubiera descargado
+    plegar_popularidad(insertados)
+    if any(
+        juego.id not in existentes
+        or any(getattr(juego, c) != existentes[juego.id][c] for c in CAMPOS_LISTADO)
+        for juego in todas_escritas
+    ):
+        incrementar_version()
+
+    _registrar(len(insertados), actualizados, sin_cambios, len(fallidos))
+    for fallo in fallidos:
+        logger.error(f"Error guardando juego {fallo['id']}: {fallo['error']}")
+    return {
+        "procesados": len(lista_juegos_igdb),
+        "guardados": len(insertados) + actualizados,
+        "insertados": len(insertados),
+        "actualizados": actualizados,
+        "sin_cambios": sin_cambios,
+        "fallidos": fallidos,
+    }
@@ -0,0 +1,129 @@
+"""Elección de líder para el trabajador de sincronización del catálogo.
+
+Puede haber varias instancias de ``manage.py sincronizar_catalogo`` (réplicas,
+un despliegue que se solapa con el anterior); solo la que tiene la concesión
+sincroniza. La concesión es una clave de Redis con TTL que el líder renueva
+periódicamente. Si el líder muere sin liberarla, caduca sola y otra instancia
+la toma; como el progreso está en ``EstadoSincronizacion``, el nuevo líder
+reanuda desde el último lote confirmado.
+
+Renovar y liberar comparan el propietario y actúan en un único script Lua,
+así que una instancia que perdió la concesión no puede quitársela al líder
+nuevo. La clave se construye con ``cache.make_key`` para compartir prefijo y
+versión con el resto de la caché. Si la caché no es Redis (desarrollo, tests)
+se usa la API de caché de Django con la misma semántica, sin esa garantía de
+atomicidad.
+"""
+
+import logging
+import os
+import socket
+import threading
+import uuid
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CLAVE_LIDER = "igdb_sync:lider"
+TTL_CONCESION = 60
+
+_RENOVAR_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_LIBERAR_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class _ConcesionRedis:
+    def __init__(self, conexion):
+        self.conexion = conexion
+        self.renovar = conexion.register_script(_RENOVAR_LUA)
+        self.liberar = conexion.register_script(_LIBERAR_LUA)
+
+    def tomar(self, clave, propietario, ttl):
+        return bool(self.conexion.set(cache.make_key(clave), propietario, nx=True, ex=ttl))
+
+    def prorrogar(self, clave, propietario, ttl):
+        return bool(self.renovar(keys=[cache.make_key(clave)], args=[propietario, ttl]))
+
+    def soltar(self, clave, propietario):
+        self.liberar(keys=[cache.make_key(clave)], args=[propietario])
+
+    def titular(self, clave):
+        valor = self.conexion.get(cache.make_key(clave))
+        return valor.decode() if isinstance(valor, bytes) else valor
+
+
+class _ConcesionCache:
+    def tomar(self, clave, propietario, ttl):
+        return cache.add(clave, propietario, ttl)
+
+    def prorrogar(self, clave, propietario, ttl):
+        return cache.get(clave) == propietario and cache.touch(clave, ttl)
+
+    def soltar(self, clave, propietario):
+        if cache.get(clave) == propietario:
+            cache.delete(clave)
+
+    def titular(self, clave):
+        return cache.get(clave)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def backend_concesiones():
+    """Backend compartido de concesiones: Redis con scripts Lua o la caché de Django.
+
+    Ofrece ``tomar``, ``prorrogar``, ``soltar`` y ``titular`` sobre una clave y
+    un propietario; también lo usa ``single_flight`` para sus locks.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                try:
+                    from django_redis import get_redis_connection
+
+                    _backend = _ConcesionRedis(get_redis_connection("default"))
+                except Exception as e:
+                    logger.info("Caché sin Redis (%s); concesiones vía caché de Django.", e)
+                    _backend = _ConcesionCache()
+    return _backend
+
+
+class Concesion:
+    """Concesión exclusiva con caducidad, identificada por proceso."""
+
+    def __init__(self, clave=CLAVE_LIDER, ttl=TTL_CONCESION):
+        self.clave = clave
+        self.ttl = ttl
+        self.propietario = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def _get_backend(self):
+        return backend_concesiones()
+
+    def adquirir(self):
+        """Intenta tomar la concesión; ``True`` si este proceso es el líder."""
+        return self._get_backend().tomar(self.clave, self.propietario, self.ttl)
+
+    def renovar(self):
+        """Prorroga la concesión; ``False`` si ya no pertenece a este proceso."""
+        return self._get_backend().prorrogar(self.clave, self.propietario, self.ttl)
+
+    def liberar(self):
+        """Suelta la concesión si sigue siendo nuestra."""
+        self._get_backend().soltar(self.clave, self.propietario)
+
+    def titular(self):
+        """Propietario actual de la concesión o ``None`` si está libre."""
+        return self._get_backend().titular(self.clave)
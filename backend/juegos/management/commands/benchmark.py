@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from juegos.benchmarks import ESCENARIOS
+
+
+class Command(BaseCommand):
+    help = "Ejecuta un escenario de benchmark del catálogo sin consumir cuota de IGDB."
+
+    def add_arguments(self, parser):
+        parser.add_argument("escenario", choices=sorted(ESCENARIOS))
+        parser.add_argument(
+            "-n", type=int, default=50,
+            help="Tamaño del escenario (concurrencia, filas...).",
+        )
+        parser.add_argument(
+            "--latencia", type=float, default=0.2,
+            help="Latencia simulada de cada llamada a IGDB, en segundos.",
+        )
+
+    def handle(self, *args, **opciones):
+        nombre = opciones["escenario"]
+        self.stdout.write(self.style.NOTICE(f"Benchmark: {nombre}"))
+        resultados = ESCENARIOS[nombre](n=opciones["n"], latencia=opciones["latencia"])
+        for clave, valor in resultados.items():
+            self.stdout.write(f"• {clave}: {valor}")
@@ -0,0 +1,24 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from juegos.snapshot import TAMANO_BLOQUE, exportar
+
+
+class Command(BaseCommand):
+    help = "Exporta la tabla de juegos a una instantánea comprimida (ver juegos/snapshot.py)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("ruta", help="Fichero de salida.")
+        parser.add_argument("--bloque", type=int, default=TAMANO_BLOQUE, help="Juegos por bloque.")
+
+    def handle(self, *args, **opciones):
+        inicio = time.perf_counter()
+        with open(opciones["ruta"], "wb") as fichero:
+            total = exportar(fichero, tamano_bloque=opciones["bloque"])
+        segundos = time.perf_counter() - inicio
+        tamano = os.path.getsize(opciones["ruta"]) / 1024 / 1024
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} juegos exportados a {opciones['ruta']} ({tamano:.1f} MB) en {segundos:.1f}s"
+        ))
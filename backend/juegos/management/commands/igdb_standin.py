@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+
+from juegos.standin.catalogo import Catalogo
+from juegos.standin.servidor import Fixtures, IGDBStandin, UPSTREAM_IGDB, crear_servidor
+
+
+class Command(BaseCommand):
+    help = (
+        "Arranca un servidor local que imita IGDB. Apunta IGDB_BASE_URL a "
+        "http://<host>:<puerto>/v4 y TWITCH_TOKEN_URL a http://<host>:<puerto>/oauth2/token."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--puerto", type=int, default=8765)
+        parser.add_argument(
+            "--juegos", type=int, default=300_000,
+            help="Tamaño del catálogo sintético.",
+        )
+        parser.add_argument("--latencia-ms", type=float, default=0, help="Latencia base por petición.")
+        parser.add_argument("--jitter-ms", type=float, default=0, help="Variación aleatoria de la latencia.")
+        parser.add_argument(
+            "--prob-429", type=float, default=0,
+            help="Probabilidad de responder 429 aunque no se supere el límite.",
+        )
+        parser.add_argument(
+            "--max-rps", type=float, default=None,
+            help="Peticiones por segundo antes de devolver 429 (IGDB usa 4).",
+        )
+        parser.add_argument("--fixtures", help="Fichero JSONL con respuestas grabadas.")
+        parser.add_argument(
+            "--grabar", action="store_true",
+            help="Reenvía a la IGDB real lo que no esté grabado y lo añade a --fixtures.",
+        )
+        parser.add_argument("--upstream", default=UPSTREAM_IGDB)
+
+    def handle(self, *args, **opciones):
+        fixtures = Fixtures(opciones["fixtures"])
+        standin = IGDBStandin(
+            catalogo=Catalogo(opciones["juegos"]),
+            latencia=opciones["latencia_ms"] / 1000,
+            jitter=opciones["jitter_ms"] / 1000,
+            prob_429=opciones["prob_429"],
+            max_rps=opciones["max_rps"],
+            fixtures=fixtures,
+            grabar=opciones["grabar"],
+            upstream=opciones["upstream"],
+        )
+        servidor = crear_servidor(standin, opciones["host"], opciones["puerto"])
+        host, puerto = servidor.server_address[:2]
+        self.stdout.write(self.style.SUCCESS(
+            f"IGDB local en http://{host}:{puerto}/v4 "
+            f"({opciones['juegos']} juegos, {len(fixtures)} respuestas grabadas)"
+        ))
+        try:
+            servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            servidor.server_close()
+            self.stdout.write(
+                f"Peticiones: {standin.peticiones} · rechazadas con 429: {standin.rechazadas}"
+            )
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from juegos.snapshot import SnapshotInvalido, importar
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa una instantánea creada con exportar_catalogo. Inserta o "
+        "actualiza los juegos y adelanta la marca de la sincronización incremental."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("ruta", help="Fichero de la instantánea.")
+        parser.add_argument(
+            "--sin-marca", action="store_true",
+            help="No toca la marca de sincronización (el trabajador revisará todo desde la suya).",
+        )
+
+    def handle(self, *args, **opciones):
+        inicio = time.perf_counter()
+        try:
+            with open(opciones["ruta"], "rb") as fichero:
+                total = importar(fichero, restaurar_marca=not opciones["sin_marca"])
+        except (OSError, SnapshotInvalido) as e:
+            raise CommandError(str(e)) from e
+        segundos = time.perf_counter() - inicio
+        self.stdout.write(self.style.SUCCESS(f"{total} juegos importados en {segundos:.1f}s"))
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from juegos.clasificaciones import LOTE_RECONSTRUCCION, marcar_adultos
+
+
+class Command(BaseCommand):
+    help = (
+        "Calcula es_adulto de los juegos ya guardados a partir de sus temas "
+        "(la clasificación por edades llega con la sincronización)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lote", type=int, default=LOTE_RECONSTRUCCION, help="Juegos por lote."
+        )
+
+    def handle(self, *args, **opciones):
+        inicio = time.perf_counter()
+        marcados = marcar_adultos(tamano_lote=opciones["lote"])
+        segundos = time.perf_counter() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f"{marcados} juegos marcados como contenido adulto en {segundos:.1f}s"
+        ))
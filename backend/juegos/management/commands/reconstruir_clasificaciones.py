@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from juegos.clasificaciones import LOTE_RECONSTRUCCION, reconstruir
+
+
+class Command(BaseCommand):
+    help = (
+        "Rellena géneros, plataformas, temas y compañías normalizados a partir "
+        "de los campos JSON de los juegos ya guardados."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lote", type=int, default=LOTE_RECONSTRUCCION, help="Juegos por lote."
+        )
+
+    def handle(self, *args, **opciones):
+        inicio = time.perf_counter()
+        total = reconstruir(tamano_lote=opciones["lote"])
+        segundos = time.perf_counter() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f"Clasificaciones de {total} juegos reconstruidas en {segundos:.1f}s"
+        ))
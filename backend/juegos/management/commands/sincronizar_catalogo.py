@@ -0,0 +1,37 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from juegos import cache_igdb
+
+
+class Command(BaseCommand):
+    help = (
+        "Trabajador de sincronización del catálogo de IGDB. Se pueden lanzar "
+        "varias instancias: solo sincroniza la que obtiene la concesión y el "
+        "resto espera para tomar el relevo. SIGTERM/SIGINT lo detienen tras el "
+        "lote en curso."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--una-vez", action="store_true",
+            help="Hace una sola pasada (o nada si otra instancia está sincronizando) y termina.",
+        )
+        parser.add_argument(
+            "--completa", action="store_true",
+            help="Solicita un recorrido completo del catálogo antes de empezar.",
+        )
+
+    def handle(self, *args, **opciones):
+        for senal in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(senal, lambda *_: cache_igdb.stop_sync())
+
+        if opciones["completa"]:
+            cache_igdb.solicitar_sincronizacion_completa()
+
+        ha_sincronizado = cache_igdb.ejecutar_trabajador(una_vez=opciones["una_vez"])
+        if not ha_sincronizado:
+            self.stdout.write("Otra instancia tiene la concesión de sincronización.")
+        else:
+            self.stdout.write(self.style.SUCCESS("Trabajador de sincronización detenido."))
@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-18 17:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('juegos', '0010_juego_aggregated_rating_juego_cover_url_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Idioma',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100)),
+                ('native_name', models.CharField(blank=True, max_length=100)),
+                ('locale', models.CharField(blank=True, max_length=20)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='juego',
+            name='idiomas',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
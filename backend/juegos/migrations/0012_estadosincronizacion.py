@@ -0,0 +1,24 @@
+# Generated by Django 5.2 on 2026-10-18 18:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('juegos', '0011_idioma_juego_idiomas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstadoSincronizacion',
+            fields=[
+                ('nombre', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('marca_updated_at', models.BigIntegerField(default=0)),
+                ('ultimo_id', models.BigIntegerField(default=0)),
+                ('completa_solicitada', models.BooleanField(default=False)),
+                ('ultima_completa', models.DateTimeField(blank=True, null=True)),
+                ('actualizado', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 18:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('juegos', '0012_estadosincronizacion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='estadosincronizacion',
+            name='id_hasta',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
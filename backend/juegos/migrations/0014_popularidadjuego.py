@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-18 18:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('juegos', '0013_estadosincronizacion_id_hasta'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PopularidadJuego',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('game_id', models.BigIntegerField()),
+                ('tipo', models.PositiveSmallIntegerField()),
+                ('valor', models.FloatField(default=0.0)),
+                ('calculado', models.BigIntegerField(blank=True, null=True)),
+            ],
+            options={
+                'unique_together': {('game_id', 'tipo')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 18:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('juegos', '0014_popularidadjuego'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='juego',
+            name='hash_contenido',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-18 18:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('juegos', '0015_juego_hash_contenido'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='juego',
+            name='eliminado',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='juego',
+            index=models.Index(fields=['eliminado', 'popularidad'], name='juego_vigente_popularidad'),
+        ),
+        migrations.AddIndex(
+            model_name='juego',
+            index=models.Index(fields=['eliminado', 'first_release_date'], name='juego_vigente_fecha'),
+        ),
+        migrations.AddIndex(
+            model_name='juego',
+            index=models.Index(fields=['eliminado', 'name'], name='juego_vigente_nombre'),
+        ),
+    ]
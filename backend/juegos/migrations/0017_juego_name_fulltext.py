@@ -0,0 +1,28 @@
+from django.db import migrations
+
+# Mismo nombre que ``juegos.busqueda.NOMBRE_INDICE_FULLTEXT``
+NOMBRE_INDICE_FULLTEXT = "juego_name_ft"
+
+
+def crear_indice(apps, schema_editor):
+    # Solo MySQL tiene FULLTEXT; el resto de motores busca con ``icontains``
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute(
+            f"CREATE FULLTEXT INDEX {NOMBRE_INDICE_FULLTEXT} ON juegos_juego (name)"
+        )
+
+
+def borrar_indice(apps, schema_editor):
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute(f"DROP INDEX {NOMBRE_INDICE_FULLTEXT} ON juegos_juego")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('juegos', '0016_juego_eliminado'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, borrar_indice),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 5.2 on 2026-10-18 18:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('juegos', '0017_juego_name_fulltext'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Compania',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(blank=True, max_length=255)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Genero',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(blank=True, max_length=255)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Plataforma',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(blank=True, max_length=255)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Tema',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(blank=True, max_length=255)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='juego',
+            name='generos',
+            field=models.ManyToManyField(blank=True, related_name='juegos', to='juegos.genero'),
+        ),
+        migrations.CreateModel(
+            name='JuegoCompania',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('desarrolladora', models.BooleanField(default=False)),
+                ('distribuidora', models.BooleanField(default=False)),
+                ('compania', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='juegos.compania')),
+                ('juego', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='juegos.juego')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='juego',
+            name='companias',
+            field=models.ManyToManyField(blank=True, related_name='juegos', through='juegos.JuegoCompania', to='juegos.compania'),
+        ),
+        migrations.AddField(
+            model_name='juego',
+            name='plataformas',
+            field=models.ManyToManyField(blank=True, related_name='juegos', to='juegos.plataforma'),
+        ),
+        migrations.AddField(
+            model_name='juego',
+            name='temas',
+            field=models.ManyToManyField(blank=True, related_name='juegos', to='juegos.tema'),
+        ),
+        migrations.AddIndex(
+            model_name='juegocompania',
+            index=models.Index(fields=['compania', 'distribuidora'], name='compania_distribuidora'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='juegocompania',
+            unique_together={('juego', 'compania')},
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-18 18:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('juegos', '0018_clasificaciones'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='juego',
+            name='es_adulto',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='juego',
+            index=models.Index(fields=['eliminado', 'es_adulto', 'popularidad'], name='juego_apto_popularidad'),
+        ),
+        migrations.AddIndex(
+            model_name='juego',
+            index=models.Index(fields=['eliminado', 'es_adulto', 'first_release_date'], name='juego_apto_fecha'),
+        ),
+        migrations.AddIndex(
+            model_name='juego',
+            index=models.Index(fields=['eliminado', 'es_adulto', 'name'], name='juego_apto_nombre'),
+        ),
+    ]
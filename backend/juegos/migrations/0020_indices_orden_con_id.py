@@ -0,0 +1,61 @@
+# Generated by Django 5.2 on 2026-10-18 18:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('juegos', '0019_juego_es_adulto'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='juego',
+            name='juego_vigente_popularidad',
+        ),
+        migrations.RemoveIndex(
+            model_name='juego',
+            name='juego_vigente_fecha',
+        ),
+        migrations.RemoveIndex(
+            model_name='juego',
+            name='juego_vigente_nombre',
+        ),
+        migrations.RemoveIndex(
+            model_name='juego',
+            name='juego_apto_popularidad',
+        ),
+        migrations.RemoveIndex(
+            model_name='juego',
+            name='juego_apto_fecha',
+        ),
+        migrations.RemoveIndex(
+            model_name='juego',
+            name='juego_apto_nombre',
+        ),
+        migrations.AddIndex(
+            model_name='juego',
+            index=models.Index(fields=['eliminado', 'popularidad', 'id'], name='juego_vigente_popularidad'),
+        ),
+        migrations.AddIndex(
+            model_name='juego',
+            index=models.Index(fields=['eliminado', 'first_release_date', 'id'], name='juego_vigente_fecha'),
+        ),
+        migrations.AddIndex(
+            model_name='juego',
+            index=models.Index(fields=['eliminado', 'name', 'id'], name='juego_vigente_nombre'),
+        ),
+        migrations.AddIndex(
+            model_name='juego',
+            index=models.Index(fields=['eliminado', 'es_adulto', 'popularidad', 'id'], name='juego_apto_popularidad'),
+        ),
+        migrations.AddIndex(
+            model_name='juego',
+            index=models.Index(fields=['eliminado', 'es_adulto', 'first_release_date', 'id'], name='juego_apto_fecha'),
+        ),
+        migrations.AddIndex(
+            model_name='juego',
+            index=models.Index(fields=['eliminado', 'es_adulto', 'name', 'id'], name='juego_apto_nombre'),
+        ),
+    ]
@@ -11,6 +11,13 @@ def default_duration():
     return timedelta()
 
 
+class JuegosVigentesManager(models.Manager):
+    """Excluye los juegos que IGDB ya no devuelve (borrados o fusionados)."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(eliminado=False)
+
+
 class Juego(models.Model):
     """Representa un juego identificado por su ID de IGDB, con caché local de datos."""
     id = models.BigIntegerField(primary_key=True)
@@ -28,13 +35,157 @@ class Juego(models.Model):
     platforms = models.JSONField(default=list, blank=True)
     involved_companies = models.JSONField(default=list, blank=True)
     themes = models.JSONField(default=list, blank=True)
+    # Ids de ``Idioma`` soportados (language_supports.language en IGDB)
+    idiomas = models.JSONField(default=list, blank=True)
+    # Las mismas clasificaciones que los JSON de arriba, normalizadas para
+    # poder filtrar con índices. Las rellena la ingesta (``juegos.clasificaciones``)
+    generos = models.ManyToManyField("Genero", related_name="juegos", blank=True)
+    plataformas = models.ManyToManyField("Plataforma", related_name="juegos", blank=True)
+    temas = models.ManyToManyField("Tema", related_name="juegos", blank=True)
+    companias = models.ManyToManyField(
+        "Compania", through="JuegoCompania", related_name="juegos", blank=True
+    )
+    # Huella de los datos de IGDB guardados; la ingesta no reescribe la fila si no cambia
+    hash_contenido = models.BigIntegerField(null=True, blank=True)
+    # Lápida: IGDB ya no lo devuelve. Se conserva para bibliotecas y reseñas
+    # pero no aparece en listados (ver ``juegos.reconciliacion``)
+    eliminado = models.BooleanField(default=False)
+    # Tema erótico o clasificación AO; lo calcula la ingesta para que el filtro
+    # de contenido adulto no tenga que mirar dentro de ``themes``
+    es_adulto = models.BooleanField(default=False)
     
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = models.Manager()
+    vigentes = JuegosVigentesManager()
+
+    class Meta:
+        # Los listados filtran por ``eliminado`` y ordenan por una de estas
+        # columnas con ``id`` como desempate, que es también la clave de los
+        # cursores de ``juegos.paginacion``
+        indexes = [
+            models.Index(
+                fields=["eliminado", "popularidad", "id"], name="juego_vigente_popularidad"
+            ),
+            models.Index(
+                fields=["eliminado", "first_release_date", "id"], name="juego_vigente_fecha"
+            ),
+            models.Index(fields=["eliminado", "name", "id"], name="juego_vigente_nombre"),
+            # Los mismos con el filtro de contenido adulto (el caso por defecto)
+            models.Index(
+                fields=["eliminado", "es_adulto", "popularidad", "id"],
+                name="juego_apto_popularidad",
+            ),
+            models.Index(
+                fields=["eliminado", "es_adulto", "first_release_date", "id"],
+                name="juego_apto_fecha",
+            ),
+            models.Index(
+                fields=["eliminado", "es_adulto", "name", "id"], name="juego_apto_nombre"
+            ),
+        ]
+
     def __str__(self):
         return self.name or f"Juego IGDB {self.id}"
 
 
+class Idioma(models.Model):
+    """Idioma de IGDB, sincronizado junto con el catálogo."""
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=100)
+    native_name = models.CharField(max_length=100, blank=True)
+    locale = models.CharField(max_length=20, blank=True)
+
+    def __str__(self):
+        return self.name
+
+
+class Clasificacion(models.Model):
+    """Entrada de una tabla de IGDB (género, plataforma...) con su id original."""
+    id = models.BigIntegerField(primary_key=True)
+    # Vacío si solo se ha visto el id, sin expandir
+    name = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return self.name or f"{self._meta.verbose_name} {self.id}"
+
+
+class Genero(Clasificacion):
+    pass
+
+
+class Plataforma(Clasificacion):
+    pass
+
+
+class Tema(Clasificacion):
+    pass
+
+
+class Compania(Clasificacion):
+    pass
+
+
+class JuegoCompania(models.Model):
+    """Participación de una compañía en un juego (``involved_companies`` de IGDB)."""
+    juego = models.ForeignKey(Juego, on_delete=models.CASCADE)
+    compania = models.ForeignKey(Compania, on_delete=models.CASCADE)
+    desarrolladora = models.BooleanField(default=False)
+    distribuidora = models.BooleanField(default=False)
+
+    class Meta:
+        unique_together = ("juego", "compania")
+        # Filtro ``publisher`` del listado
+        indexes = [
+            models.Index(fields=["compania", "distribuidora"], name="compania_distribuidora"),
+        ]
+
+
+class EstadoSincronizacion(models.Model):
+    """Punto de control persistente de la sincronización con IGDB.
+
+    ``(marca_updated_at, ultimo_id)`` indica que todos los juegos con
+    ``updated_at`` anterior a la marca, o igual y con id hasta ``ultimo_id``,
+    ya están en la DB local.
+
+    Durante un recorrido completo hay además una fila por tramo de ids
+    (``catalogo:tramo:N``) con los ids ``(ultimo_id, id_hasta)`` pendientes y
+    en ``marca_updated_at`` la marca que quedará al terminar el recorrido.
+    """
+    nombre = models.CharField(max_length=50, primary_key=True)
+    marca_updated_at = models.BigIntegerField(default=0)
+    ultimo_id = models.BigIntegerField(default=0)
+    id_hasta = models.BigIntegerField(null=True, blank=True)
+    completa_solicitada = models.BooleanField(default=False)
+    ultima_completa = models.DateTimeField(null=True, blank=True)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.nombre}: updated_at>{self.marca_updated_at} id>{self.ultimo_id}"
+
+
+class PopularidadJuego(models.Model):
+    """Valor de una ``popularity_primitive`` de IGDB para un juego.
+
+    ``Juego.popularidad`` es la combinación de estos valores (ver
+    ``juegos.popularidad``).
+    """
+    game_id = models.BigIntegerField()
+    tipo = models.PositiveSmallIntegerField()
+    valor = models.FloatField(default=0.0)
+    # ``calculated_at`` de IGDB (epoch)
+    calculado = models.BigIntegerField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ("game_id", "tipo")
+
+    def __str__(self):
+        return f"{self.game_id} ({self.tipo}): {self.valor}"
+
+
 class Biblioteca(models.Model):
     """Relación entre un usuario y los juegos que posee."""
     ESTADOS = [
@@ -0,0 +1,154 @@
+"""Paginación por cursor (keyset) de los listados del catálogo.
+
+Una página se pide por su posición respecto a la última fila vista, no por
+desplazamiento: ``WHERE (popularidad, id) < (v, i) ORDER BY popularidad DESC,
+id DESC LIMIT n``. La consulta recorre el índice desde el cursor, así que la
+página 5000 cuesta lo mismo que la primera, y no hace falta ``COUNT(*)``.
+
+El orden se describe con una lista de claves ``(campo, descendente)`` que
+siempre termina en ``id`` para que sea total. Los ``NULL`` (juegos sin fecha)
+se consideran menores que cualquier valor, que es como los ordenan MySQL y
+SQLite sin reescribir el ``ORDER BY``: van al principio en orden ascendente y
+al final en descendente.
+
+Los cursores son opacos para el cliente: base64 de un JSON con la dirección,
+la firma del orden y los valores de las claves de la fila frontera.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import DateTimeField, F, Q
+
+SIGUIENTE = "s"
+ANTERIOR = "a"
+
+
+class CursorInvalido(ValueError):
+    """El cursor está corrupto o pertenece a otro orden."""
+
+
+def _firma(claves):
+    return ",".join(f"-{campo}" if desc else campo for campo, desc in claves)
+
+
+def _admite_nulos(qs, campo):
+    try:
+        return qs.model._meta.get_field(campo).null
+    except FieldDoesNotExist:  # anotaciones como ``relevancia``
+        return False
+
+
+def _es_fecha(qs, campo):
+    try:
+        return isinstance(qs.model._meta.get_field(campo), DateTimeField)
+    except FieldDoesNotExist:
+        return False
+
+
+def ordenar(qs, claves):
+    """Aplica a ``qs`` el orden de ``claves`` (los ``NULL`` cuentan como mínimos)."""
+    orden = []
+    for campo, desc in claves:
+        if not _admite_nulos(qs, campo):
+            # Sin NULL posibles no se fuerza su posición: así el ORDER BY
+            # queda tal cual y puede resolverse con el índice
+            orden.append(f"-{campo}" if desc else campo)
+        elif desc:
+            orden.append(F(campo).desc(nulls_last=True))
+        else:
+            orden.append(F(campo).asc(nulls_first=True))
+    return qs.order_by(*orden)
+
+
+def codificar(claves, fila, direccion):
+    valores = []
+    for campo, _ in claves:
+        valor = getattr(fila, campo)
+        if isinstance(valor, datetime):
+            valor = valor.timestamp()
+        valores.append(valor)
+    datos = json.dumps([direccion, _firma(claves), valores], separators=(",", ":"))
+    return base64.urlsafe_b64encode(datos.encode()).decode().rstrip("=")
+
+
+def decodificar(qs, claves, cursor):
+    """Devuelve ``(direccion, valores)`` de un cursor generado con las mismas ``claves``."""
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        direccion, firma, valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise CursorInvalido("Cursor corrupto") from e
+    if direccion not in (SIGUIENTE, ANTERIOR) or firma != _firma(claves):
+        raise CursorInvalido("El cursor corresponde a otro orden")
+    if not isinstance(valores, list) or len(valores) != len(claves):
+        raise CursorInvalido("Cursor corrupto")
+    for i, (campo, _) in enumerate(claves):
+        if valores[i] is not None and _es_fecha(qs, campo):
+            try:
+                valores[i] = datetime.fromtimestamp(valores[i], tz=dt_timezone.utc)
+            except (TypeError, ValueError, OverflowError) as e:
+                raise CursorInvalido("Cursor corrupto") from e
+    return direccion, valores
+
+
+def _despues(campo, desc, valor, nulos):
+    """Filas estrictamente posteriores a ``valor`` en una clave; ``None`` si no hay."""
+    if valor is None:
+        return None if desc else Q(**{f"{campo}__isnull": False})
+    if desc:
+        condicion = Q(**{f"{campo}__lt": valor})
+        # Los NULL van detrás de cualquier valor en orden descendente
+        return condicion | Q(**{f"{campo}__isnull": True}) if nulos else condicion
+    return Q(**{f"{campo}__gt": valor})
+
+
+def _igual(campo, valor):
+    if valor is None:
+        return Q(**{f"{campo}__isnull": True})
+    return Q(**{campo: valor})
+
+
+def _posteriores(qs, claves, valores):
+    """Condición lexicográfica ``(claves) > (valores)`` en el orden de ``claves``."""
+    condicion = None
+    prefijo = Q()
+    for (campo, desc), valor in zip(claves, valores):
+        despues = _despues(campo, desc, valor, _admite_nulos(qs, campo))
+        if despues is not None:
+            termino = prefijo & despues
+            condicion = termino if condicion is None else condicion | termino
+        prefijo &= _igual(campo, valor)
+    return condicion
+
+
+def pagina(qs, claves, cursor, limite):
+    """Página de ``limite`` filas de ``qs`` a partir de ``cursor`` (``None``: la primera).
+
+    Devuelve ``(filas, siguiente, anterior)``, con ``None`` como cursor si no
+    hay más páginas en esa dirección. Lanza ``CursorInvalido``.
+    """
+    direccion, valores = SIGUIENTE, None
+    if cursor:
+        direccion, valores = decodificar(qs, claves, cursor)
+
+    recorrido = claves if direccion == SIGUIENTE else [(c, not d) for c, d in claves]
+    qs = ordenar(qs, recorrido)
+    if valores is not None:
+        condicion = _posteriores(qs, recorrido, valores)
+        qs = qs.filter(condicion) if condicion is not None else qs.none()
+    filas = list(qs[:limite + 1])
+    hay_mas = len(filas) > limite
+    filas = filas[:limite]
+
+    if direccion == ANTERIOR:
+        filas.reverse()
+        hay_siguiente, hay_anterior = True, hay_mas
+    else:
+        hay_siguiente, hay_anterior = hay_mas, valores is not None
+    siguiente = codificar(claves, filas[-1], SIGUIENTE) if filas and hay_siguiente else None
+    anterior = codificar(claves, filas[0], ANTERIOR) if filas and hay_anterior else None
+    return filas, siguiente, anterior
@@ -0,0 +1,109 @@
+"""Popularidad de los juegos a partir de ``popularity_primitives`` de IGDB.
+
+Las primitivas se descargan en streaming, por lotes ordenados por id, y cada
+lote se guarda en bloque en ``PopularidadJuego`` (una fila por juego y tipo).
+Acto seguido se recalcula ``Juego.popularidad`` solo para los juegos del
+lote, así que la memoria usada no depende del tamaño del catálogo. El avance
+se guarda en ``EstadoSincronizacion`` tras cada lote y una pasada
+interrumpida se reanuda donde quedó.
+"""
+
+import logging
+import threading
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .control_sync import esperar_si_pausada
+from .igdb_client import igdb
+from .igdb_rate_limit import FONDO
+from .models import EstadoSincronizacion, Juego, PopularidadJuego
+from .version_catalogo import incrementar_version, version_aplazada
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+ESTADO_POPULARIDAD = "popularidad"
+# IGDB recalcula las primitivas a diario
+INTERVALO_POPULARIDAD = timedelta(hours=24)
+# Peso de cada ``popularity_type`` en ``Juego.popularidad``: visitas, quieren
+# jugarlo, jugando y jugado (el resto de tipos no se descarga)
+PESOS_POPULARIDAD = {1: 1.0, 2: 1.0, 3: 1.0, 4: 1.0}
+
+
+def plegar_popularidad(game_ids):
+    """Recalcula ``Juego.popularidad`` de ``game_ids`` desde ``PopularidadJuego``."""
+    if not game_ids:
+        return 0
+    totales = {}
+    primitivas = PopularidadJuego.objects.filter(
+        game_id__in=game_ids, tipo__in=PESOS_POPULARIDAD
+    ).values_list("game_id", "tipo", "valor")
+    for game_id, tipo, valor in primitivas:
+        totales[game_id] = totales.get(game_id, 0.0) + PESOS_POPULARIDAD[tipo] * valor
+    if not totales:
+        return 0
+    juegos = Juego.objects.filter(id__in=totales).only("id")
+    for juego in juegos:
+        juego.popularidad = totales[juego.id]
+    Juego.objects.bulk_update(juegos, ["popularidad"], batch_size=BATCH_SIZE)
+    if juegos:
+        incrementar_version()
+    return len(juegos)
+
+
+def popularidad_pendiente():
+    """Indica si toca (o hay a medias) una pasada de popularidad."""
+    estado = EstadoSincronizacion.objects.filter(nombre=ESTADO_POPULARIDAD).first()
+    if estado is None or estado.ultimo_id or estado.ultima_completa is None:
+        return True
+    return timezone.now() - estado.ultima_completa >= INTERVALO_POPULARIDAD
+
+
+@version_aplazada()
+def sincronizar_popularidad(detener=None):
+    """Descarga todas las primitivas de popularidad y actualiza los juegos.
+
+    ``detener`` es un ``threading.Event`` opcional que interrumpe la pasada
+    tras el lote en curso; mientras la sincronización esté en pausa se
+    espera. Devuelve el número de primitivas procesadas.
+    """
+    # Import diferido: ``ingesta`` importa este módulo
+    from .ingesta import upsert
+
+    estado, _ = EstadoSincronizacion.objects.get_or_create(nombre=ESTADO_POPULARIDAD)
+    tipos = ",".join(str(t) for t in PESOS_POPULARIDAD)
+    total = 0
+    detener = detener or threading.Event()
+    while esperar_si_pausada(detener):
+        bloque = igdb.consultar(
+            "popularity_primitives",
+            f"fields game_id,popularity_type,value,calculated_at; "
+            f"where id > {estado.ultimo_id} & popularity_type = ({tipos}); "
+            f"sort id asc; limit {BATCH_SIZE};",
+            prioridad=FONDO,
+        )
+        if not bloque:
+            estado.ultimo_id = 0
+            estado.ultima_completa = timezone.now()
+            estado.save(update_fields=["ultimo_id", "ultima_completa", "actualizado"])
+            logger.info(f"Popularidad de IGDB actualizada: {total} primitivas.")
+            break
+
+        filas = {
+            (p["game_id"], p["popularity_type"]): PopularidadJuego(
+                game_id=p["game_id"],
+                tipo=p["popularity_type"],
+                valor=p.get("value") or 0.0,
+                calculado=p.get("calculated_at"),
+            )
+            for p in bloque
+        }
+        upsert(list(filas.values()), ["valor", "calculado"], modelo=PopularidadJuego,
+               unicos=("game_id", "tipo"))
+        plegar_popularidad({game_id for game_id, _ in filas})
+
+        estado.ultimo_id = max(p["id"] for p in bloque)
+        estado.save(update_fields=["ultimo_id", "actualizado"])
+        total += len(bloque)
+    return total
@@ -0,0 +1,143 @@
+"""Detección de juegos borrados o fusionados en IGDB.
+
+La sincronización solo inserta y actualiza, así que un juego que IGDB retira
+se quedaría para siempre en ``Juego``. Esta etapa recorre el catálogo por
+tramos de ids: descarga solo los ids que IGDB sigue devolviendo y los compara
+con los locales. Ambas listas son ``array('q')`` ordenados (8 bytes por id,
+frente a los ~70 de un ``int`` dentro de un ``set``) y se cruzan en una sola
+pasada como en un merge.
+
+Los juegos que faltan no se borran: se marcan con ``eliminado`` para que los
+listados los excluyan y las bibliotecas y reseñas que los referencian sigan
+funcionando. Si IGDB vuelve a devolver un juego marcado, se le quita la marca.
+"""
+
+import logging
+import threading
+from array import array
+from datetime import timedelta
+
+from django.db.models import Max
+from django.utils import timezone
+
+from .control_sync import esperar_si_pausada
+from .igdb_client import igdb
+from .igdb_rate_limit import FONDO
+from .models import EstadoSincronizacion, Juego
+from .version_catalogo import incrementar_version, version_aplazada
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+TAMANO_TRAMO = 50_000
+LOTE_ESCRITURA = 1000
+ESTADO_RECONCILIACION = "reconciliacion"
+INTERVALO_RECONCILIACION = timedelta(days=7)
+# Si en un tramo desaparecen más juegos de los esperables se sospecha de una
+# respuesta incompleta de IGDB y no se marca nada
+MAX_FRACCION_ELIMINADA = 0.5
+MIN_SOSPECHOSOS = 50
+
+
+def cruzar(a, b):
+    """Devuelve ``(solo_en_a, en_ambos)`` para dos secuencias ordenadas sin repetidos."""
+    solo_a = array("q")
+    comunes = array("q")
+    i = j = 0
+    while i < len(a) and j < len(b):
+        if a[i] < b[j]:
+            solo_a.append(a[i])
+            i += 1
+        elif a[i] > b[j]:
+            j += 1
+        else:
+            comunes.append(a[i])
+            i += 1
+            j += 1
+    solo_a.extend(a[i:])
+    return solo_a, comunes
+
+
+def _ids_igdb(desde, hasta, detener):
+    """Ids vigentes en IGDB en ``[desde, hasta)``; ``None`` si se interrumpe."""
+    ids = array("q")
+    siguiente = desde
+    while not detener.is_set():
+        bloque = igdb.consultar(
+            "games",
+            f"fields id; where id >= {siguiente} & id < {hasta}; sort id asc; limit {BATCH_SIZE};",
+            prioridad=FONDO,
+        )
+        ids.extend(j["id"] for j in bloque)
+        if len(bloque) < BATCH_SIZE:
+            return ids
+        siguiente = bloque[-1]["id"] + 1
+    return None
+
+
+def _ids_locales(desde, hasta, eliminado):
+    qs = Juego.objects.filter(id__gte=desde, id__lt=hasta, eliminado=eliminado).order_by("id")
+    return array("q", qs.values_list("id", flat=True).iterator(chunk_size=5000))
+
+
+def _marcar(ids, eliminado):
+    for i in range(0, len(ids), LOTE_ESCRITURA):
+        Juego.objects.filter(id__in=ids[i:i + LOTE_ESCRITURA].tolist()).update(eliminado=eliminado)
+    if ids:
+        incrementar_version()
+
+
+def reconciliacion_pendiente():
+    """Indica si toca (o hay a medias) una reconciliación."""
+    estado = EstadoSincronizacion.objects.filter(nombre=ESTADO_RECONCILIACION).first()
+    if estado is None or estado.ultimo_id or estado.ultima_completa is None:
+        return True
+    return timezone.now() - estado.ultima_completa >= INTERVALO_RECONCILIACION
+
+
+@version_aplazada()
+def reconciliar(detener=None):
+    """Marca los juegos que IGDB ya no devuelve y recupera los que vuelven.
+
+    Guarda el avance tras cada tramo, así que una pasada interrumpida se
+    reanuda en el siguiente. Devuelve ``{"eliminados", "recuperados"}``.
+    """
+    detener = detener or threading.Event()
+    estado, _ = EstadoSincronizacion.objects.get_or_create(nombre=ESTADO_RECONCILIACION)
+    limite = (Juego.objects.aggregate(Max("id"))["id__max"] or 0) + 1
+    desde = estado.ultimo_id + 1
+    resultado = {"eliminados": 0, "recuperados": 0}
+
+    while desde < limite and esperar_si_pausada(detener):
+        hasta = min(desde + TAMANO_TRAMO, limite)
+        remotos = _ids_igdb(desde, hasta, detener)
+        if remotos is None:
+            return resultado
+
+        vivos = _ids_locales(desde, hasta, False)
+        faltan, _ = cruzar(vivos, remotos)
+        if len(faltan) > MIN_SOSPECHOSOS and len(faltan) > MAX_FRACCION_ELIMINADA * len(vivos):
+            logger.warning(
+                f"Reconciliación: {len(faltan)} de {len(vivos)} juegos ausentes en ids "
+                f"[{desde}, {hasta}); parece una respuesta incompleta de IGDB, no se marcan"
+            )
+            faltan = array("q")
+        _, vuelven = cruzar(_ids_locales(desde, hasta, True), remotos)
+        _marcar(faltan, True)
+        _marcar(vuelven, False)
+        resultado["eliminados"] += len(faltan)
+        resultado["recuperados"] += len(vuelven)
+
+        estado.ultimo_id = hasta - 1
+        estado.save(update_fields=["ultimo_id", "actualizado"])
+        desde = hasta
+
+    if desde >= limite:
+        estado.ultimo_id = 0
+        estado.ultima_completa = timezone.now()
+        estado.save(update_fields=["ultimo_id", "ultima_completa", "actualizado"])
+        logger.info(
+            f"Reconciliación con IGDB terminada: {resultado['eliminados']} juegos retirados, "
+            f"{resultado['recuperados']} recuperados"
+        )
+    return resultado
@@ -0,0 +1,95 @@
+"""Coalescencia de peticiones ("single-flight") sobre la caché compartida.
+
+Cuando una clave popular caduca, todas las peticiones concurrentes fallan a la
+vez y cada una repetiría la misma consulta a IGDB. Con ``single_flight`` solo
+una de ellas, en cualquier worker, ejecuta el cálculo: toma un lock en Redis
+con ``SET NX`` y el resto espera brevemente a que el resultado aparezca en la
+clave.
+
+El lock guarda un token propio de cada llamada y se suelta comparando el
+token (el mismo borrado condicional que la concesión de ``lider_sync``): si
+caduca mientras se calcula y otro lo toma, no se le quita.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+
+from .lider_sync import backend_concesiones
+
+logger = logging.getLogger(__name__)
+
+ESPERA_MAXIMA = 5.0
+INTERVALO_SONDEO = 0.05
+TTL_LOCK = 15
+
+
+def single_flight(clave, calcular, espera_maxima=ESPERA_MAXIMA,
+                  intervalo=INTERVALO_SONDEO, ttl_lock=TTL_LOCK):
+    """Devuelve ``cache[clave]`` o ``calcular()`` ejecutado una sola vez.
+
+    ``calcular`` es responsable de guardar el resultado en ``clave``. Si el
+    líder termina sin guardar nada (error, juego inexistente) el siguiente en
+    esperar toma el lock y lo intenta él, de forma serializada. Agotada la
+    espera se calcula sin coordinación para no bloquear al usuario.
+    """
+    lock_key = f"{clave}:lock"
+    token = uuid.uuid4().hex
+    locks = backend_concesiones()
+    limite = time.monotonic() + espera_maxima
+    while True:
+        if locks.tomar(lock_key, token, ttl_lock):
+            try:
+                # El líder anterior pudo guardar el resultado justo antes de soltarlo
+                valor = cache.get(clave)
+                if valor is not None:
+                    return valor
+                return calcular()
+            finally:
+                locks.soltar(lock_key, token)
+
+        if time.monotonic() >= limite:
+            logger.warning(f"single_flight: espera agotada para {clave}")
+            return calcular()
+
+        time.sleep(intervalo)
+        valor = cache.get(clave)
+        if valor is not None:
+            return valor
+
+
+async def single_flight_async(clave, calcular, espera_maxima=ESPERA_MAXIMA,
+                              intervalo=INTERVALO_SONDEO, ttl_lock=TTL_LOCK):
+    """Versión asíncrona de ``single_flight``; ``calcular`` es una corrutina.
+
+    Comparte el lock con la versión síncrona, así que vistas WSGI y ASGI se
+    coordinan entre sí sobre la misma clave.
+    """
+    lock_key = f"{clave}:lock"
+    token = uuid.uuid4().hex
+    locks = backend_concesiones()
+    tomar = sync_to_async(locks.tomar, thread_sensitive=False)
+    soltar = sync_to_async(locks.soltar, thread_sensitive=False)
+    limite = time.monotonic() + espera_maxima
+    while True:
+        if await tomar(lock_key, token, ttl_lock):
+            try:
+                valor = await cache.aget(clave)
+                if valor is not None:
+                    return valor
+                return await calcular()
+            finally:
+                await soltar(lock_key, token)
+
+        if time.monotonic() >= limite:
+            logger.warning(f"single_flight: espera agotada para {clave}")
+            return await calcular()
+
+        await asyncio.sleep(intervalo)
+        valor = await cache.aget(clave)
+        if valor is not None:
+            return valor
@@ -0,0 +1,147 @@
+"""Instantáneas del catálogo local para arrancar un entorno sin recorrer IGDB.
+
+Formato del fichero: la firma ``FIRMA`` seguida de marcos ``longitud (4
+bytes, big endian) + datos comprimidos con zlib``. El primer marco es una
+cabecera JSON (versión, columnas y marca de sincronización); cada marco
+siguiente es un bloque de hasta ``TAMANO_BLOQUE`` juegos en formato columnar
+(``{"columna": [valores...]}``), que comprime mucho mejor que fila a fila. Un
+marco de longitud 0 cierra el fichero.
+
+Exportar e importar trabajan bloque a bloque, así que la memoria usada no
+depende del tamaño del catálogo.
+"""
+
+import json
+import logging
+import struct
+import zlib
+from datetime import datetime, timezone as dt_timezone
+
+from django.db.models import DateTimeField
+
+from .cache_igdb import ESTADO_CATALOGO
+from .clasificaciones import relacionar
+from .ingesta import upsert
+from .models import EstadoSincronizacion, Juego
+from .version_catalogo import incrementar_version
+
+logger = logging.getLogger(__name__)
+
+FIRMA = b"GAMESNAP"
+VERSION = 1
+TAMANO_BLOQUE = 5000
+# ``updated_at`` es la hora de escritura local, no un dato de IGDB
+COLUMNAS = [
+    f.attname for f in Juego._meta.concrete_fields if f.attname != "updated_at"
+]
+_FECHAS = {
+    f.attname for f in Juego._meta.concrete_fields if isinstance(f, DateTimeField)
+}
+_LONGITUD = struct.Struct(">I")
+
+
+class SnapshotInvalido(Exception):
+    """El fichero no es una instantánea del catálogo o está truncado."""
+
+
+def _escribir_marco(fichero, datos):
+    comprimido = zlib.compress(json.dumps(datos, separators=(",", ":")).encode(), 6)
+    fichero.write(_LONGITUD.pack(len(comprimido)))
+    fichero.write(comprimido)
+
+
+def _leer_marco(fichero):
+    cabecera = fichero.read(_LONGITUD.size)
+    if len(cabecera) < _LONGITUD.size:
+        raise SnapshotInvalido("Fichero truncado: falta el marco final")
+    (longitud,) = _LONGITUD.unpack(cabecera)
+    if not longitud:
+        return None
+    datos = fichero.read(longitud)
+    if len(datos) < longitud:
+        raise SnapshotInvalido("Fichero truncado a mitad de un bloque")
+    try:
+        return json.loads(zlib.decompress(datos))
+    except (zlib.error, ValueError) as e:
+        raise SnapshotInvalido(f"Bloque corrupto: {e}") from e
+
+
+def _a_epoch(valor):
+    return valor.timestamp() if valor else None
+
+
+def _de_epoch(valor):
+    return datetime.fromtimestamp(valor, tz=dt_timezone.utc) if valor is not None else None
+
+
+def exportar(fichero, tamano_bloque=TAMANO_BLOQUE):
+    """Escribe todo ``Juego`` en ``fichero`` (binario) y devuelve cuántos juegos."""
+    estado = EstadoSincronizacion.objects.filter(nombre=ESTADO_CATALOGO).first()
+    fichero.write(FIRMA)
+    _escribir_marco(fichero, {
+        "version": VERSION,
+        "columnas": COLUMNAS,
+        "marca": {"updated_at": estado.marca_updated_at, "ultimo_id": estado.ultimo_id}
+        if estado else None,
+    })
+
+    total = 0
+    ultimo_id = None
+    while True:
+        # Paginación por clave: cada bloque es una consulta acotada por índice
+        qs = Juego.objects.order_by("id")
+        if ultimo_id is not None:
+            qs = qs.filter(id__gt=ultimo_id)
+        filas = list(qs.values_list(*COLUMNAS)[:tamano_bloque])
+        if not filas:
+            break
+        bloque = {}
+        for columna, valores in zip(COLUMNAS, zip(*filas)):
+            bloque[columna] = [_a_epoch(v) for v in valores] if columna in _FECHAS else list(valores)
+        _escribir_marco(fichero, bloque)
+        total += len(filas)
+        ultimo_id = filas[-1][0]
+    fichero.write(_LONGITUD.pack(0))
+    return total
+
+
+def importar(fichero, restaurar_marca=True):
+    """Carga una instantánea sobre ``Juego`` (inserta o actualiza) y devuelve cuántos juegos.
+
+    Con ``restaurar_marca`` la marca de la sincronización incremental pasa a
+    la de la instantánea si es posterior a la local, de modo que el
+    trabajador solo pide a IGDB lo cambiado desde que se exportó.
+    """
+    if fichero.read(len(FIRMA)) != FIRMA:
+        raise SnapshotInvalido("No es una instantánea del catálogo")
+    cabecera = _leer_marco(fichero)
+    if cabecera is None or cabecera.get("version") != VERSION:
+        version = cabecera and cabecera.get("version")
+        raise SnapshotInvalido(f"Versión de instantánea no soportada: {version}")
+    columnas = [c for c in cabecera["columnas"] if c in COLUMNAS]
+    if "id" not in columnas:
+        raise SnapshotInvalido("La instantánea no incluye la columna id")
+    actualizables = [c for c in columnas if c != "id"]
+
+    total = 0
+    while (bloque := _leer_marco(fichero)) is not None:
+        valores = [
+            [_de_epoch(v) for v in bloque[c]] if c in _FECHAS else bloque[c]
+            for c in columnas
+        ]
+        juegos = [Juego(**dict(zip(columnas, fila))) for fila in zip(*valores)]
+        upsert(juegos, actualizables)
+        relacionar(juegos)
+        total += len(juegos)
+        logger.info(f"Instantánea: {total} juegos importados")
+    if total:
+        incrementar_version()
+
+    marca = cabecera.get("marca")
+    if restaurar_marca and marca:
+        estado, _ = EstadoSincronizacion.objects.get_or_create(nombre=ESTADO_CATALOGO)
+        if (marca["updated_at"], marca["ultimo_id"]) > (estado.marca_updated_at, estado.ultimo_id):
+            estado.marca_updated_at = marca["updated_at"]
+            estado.ultimo_id = marca["ultimo_id"]
+            estado.save(update_fields=["marca_updated_at", "ultimo_id", "actualizado"])
+    return total
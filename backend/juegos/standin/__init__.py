@@ -0,0 +1 @@
+"""Servidor local que imita la API de IGDB para pruebas de carga."""
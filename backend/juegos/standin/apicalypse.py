@@ -0,0 +1,380 @@
+"""Intérprete del subconjunto de Apicalypse que envía la aplicación.
+
+Soporta ``fields``, ``exclude``, ``where``, ``search``, ``sort``, ``limit`` y
+``offset``, además del formato de ``/multiquery``. En ``where`` se admiten
+``& | ( )``, los operadores ``= != > >= < <= ~``, tuplas ``(1,2,3)`` y los
+literales ``null``, ``true`` y ``false``.
+"""
+
+import math
+import re
+from dataclasses import dataclass, field
+
+LIMITE_POR_DEFECTO = 10
+LIMITE_MAXIMO = 500
+
+_TOKEN_RE = re.compile(
+    r'\s*(?:(?P<cadena>"(?:[^"\\]|\\.)*")'
+    r"|(?P<numero>-?\d+(?:\.\d+)?)"
+    r"|(?P<op>>=|<=|!=|=|>|<|~)"
+    r"|(?P<punt>[()&|,!\[\]{}*])"
+    r"|(?P<ident>[A-Za-z_][\w.]*(?:\.\*)?))"
+)
+
+
+class ErrorConsulta(ValueError):
+    """La consulta no pertenece al subconjunto soportado."""
+
+
+@dataclass
+class Consulta:
+    campos: list = field(default_factory=lambda: ["id"])
+    excluidos: list = field(default_factory=list)
+    where: tuple = None
+    search: str = None
+    sort: tuple = None
+    limit: int = LIMITE_POR_DEFECTO
+    offset: int = 0
+
+
+def _tokens(texto):
+    pos, tokens = 0, []
+    texto = texto.strip()
+    while pos < len(texto):
+        m = _TOKEN_RE.match(texto, pos)
+        if not m or m.end() == pos:
+            raise ErrorConsulta(f"Token inesperado en: {texto[pos:pos + 20]!r}")
+        pos = m.end()
+        tipo = m.lastgroup
+        valor = m.group(tipo)
+        if tipo == "cadena":
+            valor = valor[1:-1].replace('\\"', '"')
+        elif tipo == "numero":
+            valor = float(valor) if "." in valor else int(valor)
+        tokens.append((tipo, valor))
+    return tokens
+
+
+def _sentencias(texto):
+    """Divide por ``;`` respetando cadenas y llaves."""
+    partes, actual, en_cadena, llaves = [], [], False, 0
+    for i, c in enumerate(texto):
+        if c == '"' and (i == 0 or texto[i - 1] != "\\"):
+            en_cadena = not en_cadena
+        elif not en_cadena and c == "{":
+            llaves += 1
+        elif not en_cadena and c == "}":
+            llaves -= 1
+        if c == ";" and not en_cadena and llaves == 0:
+            partes.append("".join(actual).strip())
+            actual = []
+        else:
+            actual.append(c)
+    resto = "".join(actual).strip()
+    if resto:
+        partes.append(resto)
+    return [p for p in partes if p]
+
+
+class _ParserWhere:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def _ver(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def _tomar(self, valor=None):
+        token = self._ver()
+        if token[0] is None or (valor is not None and token[1] != valor):
+            raise ErrorConsulta(f"Se esperaba {valor!r} y llegó {token[1]!r}")
+        self.pos += 1
+        return token
+
+    def parsear(self):
+        nodo = self._o()
+        if self.pos != len(self.tokens):
+            raise ErrorConsulta(f"Sobra texto en where: {self._ver()[1]!r}")
+        return nodo
+
+    def _o(self):
+        hijos = [self._y()]
+        while self._ver()[1] == "|":
+            self._tomar("|")
+            hijos.append(self._y())
+        return hijos[0] if len(hijos) == 1 else ("or", hijos)
+
+    def _y(self):
+        hijos = [self._factor()]
+        while self._ver()[1] == "&":
+            self._tomar("&")
+            hijos.append(self._factor())
+        return hijos[0] if len(hijos) == 1 else ("and", hijos)
+
+    def _factor(self):
+        if self._ver()[1] == "(":
+            self._tomar("(")
+            nodo = self._o()
+            self._tomar(")")
+            return nodo
+        if self._ver()[1] == "!":
+            self._tomar("!")
+            return ("not", self._factor())
+        tipo, campo = self._tomar()
+        if tipo != "ident":
+            raise ErrorConsulta(f"Se esperaba un campo y llegó {campo!r}")
+        tipo, op = self._tomar()
+        if tipo != "op":
+            raise ErrorConsulta(f"Operador no soportado: {op!r}")
+        return ("cmp", campo, op, self._valor())
+
+    def _valor(self):
+        tipo, valor = self._tomar()
+        if valor == "(" or valor == "[":
+            cierre = ")" if valor == "(" else "]"
+            valores = [self._valor()]
+            while self._ver()[1] == ",":
+                self._tomar(",")
+                valores.append(self._valor())
+            self._tomar(cierre)
+            return tuple(valores)
+        if tipo == "ident":
+            literales = {"null": None, "true": True, "false": False}
+            if valor not in literales:
+                raise ErrorConsulta(f"Literal desconocido: {valor!r}")
+            return literales[valor]
+        if tipo in ("cadena", "numero"):
+            # Comodín de prefijo/sufijo para ``~``: "texto"*
+            if tipo == "cadena" and self._ver()[1] == "*":
+                self._tomar("*")
+                return ("prefijo", valor)
+            return valor
+        if valor == "*" and self._ver()[0] == "cadena":
+            _, texto = self._tomar()
+            return ("sufijo", texto)
+        raise ErrorConsulta(f"Valor inesperado: {valor!r}")
+
+
+def _lista_campos(texto):
+    return [c.strip() for c in texto.split(",") if c.strip()]
+
+
+def parsear(texto):
+    """Convierte el cuerpo de una petición en una ``Consulta``."""
+    consulta = Consulta()
+    for sentencia in _sentencias(texto):
+        palabra, _, resto = sentencia.partition(" ")
+        palabra = palabra.lower()
+        resto = resto.strip()
+        if palabra in ("fields", "f"):
+            consulta.campos = _lista_campos(resto)
+        elif palabra in ("exclude", "x"):
+            consulta.excluidos = _lista_campos(resto)
+        elif palabra in ("where", "w"):
+            consulta.where = _ParserWhere(_tokens(resto)).parsear()
+        elif palabra == "search":
+            tokens = _tokens(resto)
+            if len(tokens) != 1 or tokens[0][0] != "cadena":
+                raise ErrorConsulta("search requiere una cadena")
+            consulta.search = tokens[0][1]
+        elif palabra in ("sort", "s"):
+            partes = resto.split()
+            direccion = partes[1].lower() if len(partes) > 1 else "asc"
+            consulta.sort = (partes[0], direccion != "desc")
+        elif palabra in ("limit", "l"):
+            consulta.limit = min(int(resto), LIMITE_MAXIMO)
+        elif palabra in ("offset", "o"):
+            consulta.offset = int(resto)
+        else:
+            raise ErrorConsulta(f"Sentencia no soportada: {palabra!r}")
+    return consulta
+
+
+_MULTIQUERY_RE = re.compile(
+    r'query\s+(?P<endpoint>[\w/]+)\s+"(?P<nombre>[^"]+)"\s*\{(?P<cuerpo>.*?)\}\s*;',
+    re.S,
+)
+
+
+def parsear_multiquery(texto):
+    """Devuelve ``[(nombre, endpoint, cuerpo)]`` de un cuerpo ``/multiquery``."""
+    bloques = [
+        (m.group("nombre"), m.group("endpoint"), m.group("cuerpo"))
+        for m in _MULTIQUERY_RE.finditer(texto)
+    ]
+    if not bloques:
+        raise ErrorConsulta("multiquery sin subconsultas")
+    return bloques
+
+
+# ---------------------------------------------------------------------------
+# Evaluación
+# ---------------------------------------------------------------------------
+
+def valores_campo(doc, ruta):
+    """Valores hoja de ``ruta`` (``a.b.c``) recorriendo listas anidadas."""
+    actuales = [doc]
+    for parte in ruta.split("."):
+        siguientes = []
+        for actual in actuales:
+            if isinstance(actual, dict):
+                valor = actual.get(parte)
+            elif isinstance(actual, (int, str)) and parte == "id":
+                valor = actual
+            else:
+                valor = None
+            if isinstance(valor, list):
+                siguientes.extend(valor)
+            elif valor is not None:
+                siguientes.append(valor)
+        actuales = siguientes
+    # Una referencia sin expandir se compara por su id
+    return [v["id"] if isinstance(v, dict) and "id" in v else v for v in actuales]
+
+
+def _coincide_texto(valor, patron):
+    if not isinstance(valor, str):
+        return False
+    valor = valor.lower()
+    if isinstance(patron, tuple):
+        modo, texto = patron
+        texto = texto.lower()
+        return valor.startswith(texto) if modo == "prefijo" else valor.endswith(texto)
+    return valor == str(patron).lower()
+
+
+def _comparar(valor, op, esperado):
+    if op == "~":
+        return _coincide_texto(valor, esperado)
+    try:
+        if op == ">":
+            return valor > esperado
+        if op == ">=":
+            return valor >= esperado
+        if op == "<":
+            return valor < esperado
+        if op == "<=":
+            return valor <= esperado
+    except TypeError:
+        return False
+    raise ErrorConsulta(f"Operador no soportado: {op}")
+
+
+def evaluar(nodo, doc):
+    """Indica si ``doc`` cumple el árbol ``where``."""
+    if nodo is None:
+        return True
+    tipo = nodo[0]
+    if tipo == "and":
+        return all(evaluar(h, doc) for h in nodo[1])
+    if tipo == "or":
+        return any(evaluar(h, doc) for h in nodo[1])
+    if tipo == "not":
+        return not evaluar(nodo[1], doc)
+
+    _, campo, op, esperado = nodo
+    valores = valores_campo(doc, campo)
+    if esperado is None:
+        if op == "=":
+            return not valores
+        if op == "!=":
+            return bool(valores)
+    if isinstance(esperado, tuple) and op in ("=", "!="):
+        # Tuplas: "alguno de" con = y "ninguno de" con !=
+        dentro = any(v in esperado for v in valores)
+        return dentro if op == "=" else not dentro
+    if op == "=":
+        return esperado in valores
+    if op == "!=":
+        return esperado not in valores
+    return any(_comparar(v, op, esperado) for v in valores)
+
+
+def _mayor(a, b):
+    return b if a is None else max(a, b)
+
+
+def _menor(a, b):
+    return b if a is None else min(a, b)
+
+
+def restricciones(nodo, campo):
+    """Extrae de un ``where`` conjuntivo el rango/conjunto de ``campo``.
+
+    Devuelve ``(valores, minimo, maximo)`` con ``valores`` un conjunto o
+    ``None`` y los límites inclusivos. Sirve para no recorrer el catálogo
+    entero cuando la consulta filtra por id.
+    """
+    valores, minimo, maximo = None, None, None
+    if nodo is None:
+        return valores, minimo, maximo
+    conjuncion = nodo[1] if nodo[0] == "and" else [nodo]
+    for hijo in conjuncion:
+        if hijo[0] != "cmp" or hijo[1] != campo:
+            continue
+        _, _, op, v = hijo
+        if op == "=" and isinstance(v, tuple):
+            nuevos = {x for x in v if isinstance(x, int)}
+            valores = nuevos if valores is None else valores & nuevos
+        elif op == "=" and isinstance(v, int):
+            valores = {v} if valores is None else valores & {v}
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            if op == ">":
+                minimo = _mayor(minimo, int(v) + 1)
+            elif op == ">=":
+                minimo = _mayor(minimo, math.ceil(v))
+            elif op == "<":
+                maximo = _menor(maximo, math.ceil(v) - 1)
+            elif op == "<=":
+                maximo = _menor(maximo, int(v))
+    return valores, minimo, maximo
+
+
+def proyectar(doc, campos, excluidos=()):
+    """Reduce ``doc`` a ``campos`` con la semántica de expansión de IGDB.
+
+    ``genres`` devuelve ids; ``genres.name`` devuelve objetos ``{id, name}``.
+    """
+    resultado = {"id": doc["id"]}
+    for campo in campos or ["id"]:
+        _copiar(doc, resultado, campo.split("."))
+    for campo in excluidos:
+        resultado.pop(campo, None)
+    return resultado
+
+
+def _referencia(valor):
+    if isinstance(valor, list):
+        return [v["id"] if isinstance(v, dict) else v for v in valor]
+    if isinstance(valor, dict):
+        return valor.get("id")
+    return valor
+
+
+def _copiar(origen, destino, partes):
+    clave = partes[0]
+    if clave == "*":
+        for k, v in origen.items():
+            if v is not None and k not in destino:
+                destino[k] = _referencia(v)
+        return
+    valor = origen.get(clave)
+    if valor is None:
+        return
+    if len(partes) == 1:
+        if clave not in destino:
+            destino[clave] = _referencia(valor)
+        return
+    if isinstance(valor, list):
+        existente = destino.get(clave)
+        if not (isinstance(existente, list) and existente and isinstance(existente[0], dict)):
+            existente = [{"id": v["id"]} for v in valor if isinstance(v, dict)]
+            destino[clave] = existente
+        for src, dst in zip((v for v in valor if isinstance(v, dict)), existente):
+            _copiar(src, dst, partes[1:])
+    elif isinstance(valor, dict):
+        existente = destino.get(clave)
+        if not isinstance(existente, dict):
+            existente = {"id": valor["id"]}
+            destino[clave] = existente
+        _copiar(valor, existente, partes[1:])
@@ -0,0 +1,341 @@
+"""Catálogo sintético y determinista para el servidor IGDB local.
+
+Los documentos se generan bajo demanda a partir del id, así que un catálogo
+de cientos de miles de juegos ocupa poca memoria: solo se precalculan los
+nombres para poder resolver ``search``. ``updated_at`` crece con el id y un
+``revision`` global permite simular cambios para la sincronización
+incremental.
+"""
+
+import random
+
+from .apicalypse import evaluar, proyectar, restricciones, valores_campo
+
+INICIO_FECHAS = 631152000  # 1990-01-01
+INICIO_ACTUALIZACIONES = 1700000000
+
+GENEROS = {
+    2: "Point-and-click", 4: "Fighting", 5: "Shooter", 7: "Music", 8: "Platform",
+    9: "Puzzle", 10: "Racing", 11: "Real Time Strategy (RTS)", 12: "Role-playing (RPG)",
+    13: "Simulator", 14: "Sport", 15: "Strategy", 16: "Turn-based strategy (TBS)",
+    24: "Tactical", 25: "Hack and slash/Beat 'em up", 26: "Quiz/Trivia", 30: "Pinball",
+    31: "Adventure", 32: "Indie", 33: "Arcade", 34: "Visual Novel",
+    35: "Card & Board Game", 36: "MOBA",
+}
+PLATAFORMAS = {
+    3: "Linux", 6: "PC (Microsoft Windows)", 14: "Mac", 34: "Android", 39: "iOS",
+    48: "PlayStation 4", 49: "Xbox One", 130: "Nintendo Switch", 167: "PlayStation 5",
+    169: "Xbox Series X|S", 8: "PlayStation 2", 9: "PlayStation 3", 12: "Xbox 360",
+    21: "Nintendo GameCube", 5: "Wii", 41: "Wii U", 37: "Nintendo 3DS", 20: "Nintendo DS",
+}
+TEMAS = {
+    1: "Action", 17: "Fantasy", 18: "Science fiction", 19: "Horror", 20: "Thriller",
+    21: "Survival", 22: "Historical", 23: "Stealth", 27: "Comedy", 28: "Business",
+    31: "Drama", 32: "Non-fiction", 33: "Sandbox", 34: "Educational", 35: "Kids",
+    38: "Open world", 39: "Warfare", 40: "Party", 41: "4X (explore, expand, exploit, and exterminate)",
+    42: "Erotic", 43: "Mystery", 44: "Romance",
+}
+IDIOMAS = {
+    1: ("Arabic", "العربية", "ar"), 2: ("Chinese (Simplified)", "简体中文", "zh-CN"),
+    3: ("Chinese (Traditional)", "繁體中文", "zh-TW"), 5: ("Dutch", "Nederlands", "nl-NL"),
+    7: ("English", "English (US)", "en-US"), 8: ("English (UK)", "English (UK)", "en-GB"),
+    9: ("French", "Français", "fr-FR"), 12: ("German", "Deutsch", "de-DE"),
+    16: ("Italian", "Italiano", "it-IT"), 17: ("Japanese", "日本語", "ja-JP"),
+    18: ("Korean", "한국어", "ko-KR"), 20: ("Polish", "Polski", "pl-PL"),
+    21: ("Portuguese (Brazil)", "Português (Brasil)", "pt-BR"),
+    23: ("Russian", "Русский", "ru-RU"), 25: ("Spanish (Mexico)", "Español (México)", "es-MX"),
+    26: ("Spanish (Spain)", "Español (España)", "es-ES"), 28: ("Turkish", "Türkçe", "tr-TR"),
+}
+NUM_COMPANIAS = 500
+SOPORTES_POR_JUEGO = 4
+TIPOS_POPULARIDAD = (1, 2, 3, 4)
+
+_ADJETIVOS = (
+    "Dark", "Eternal", "Lost", "Crimson", "Silent", "Iron", "Shadow", "Golden",
+    "Forgotten", "Infinite", "Broken", "Hidden", "Frozen", "Savage", "Ancient",
+    "Neon", "Wild", "Cursed", "Final", "Hollow", "Rising", "Burning", "Mystic",
+)
+_NOMBRES = (
+    "Legends", "Kingdom", "Quest", "Frontier", "Odyssey", "Chronicles", "Tactics",
+    "Souls", "Horizon", "Empire", "Dungeon", "Galaxy", "Racer", "Warriors",
+    "Knight", "Saga", "Protocol", "Escape", "Island", "Fortress", "Drift", "Arena",
+    "Colony", "Station", "Rebellion", "Hunter", "Realm", "Tales", "Descent",
+)
+_SUFIJOS = ("", "", "", " II", " III", " IV", ": Remastered", " Deluxe", " Online", " Zero")
+
+
+def _nombre_juego(juego_id):
+    a = _ADJETIVOS[(juego_id * 7) % len(_ADJETIVOS)]
+    n = _NOMBRES[(juego_id * 13 + juego_id // len(_ADJETIVOS)) % len(_NOMBRES)]
+    s = _SUFIJOS[(juego_id * 31) % len(_SUFIJOS)]
+    return f"{a} {n}{s} {juego_id}"
+
+
+def _clave_orden(doc, campo):
+    valores = valores_campo(doc, campo)
+    # Los documentos sin valor van al final en orden ascendente
+    return (0, valores[0]) if valores else (1, 0)
+
+
+def _slug(texto):
+    return "".join(c if c.isalnum() else "-" for c in texto.lower()).strip("-")
+
+
+class Tabla:
+    """Endpoint de IGDB respaldado por un generador de documentos."""
+
+    # Campos que ``candidatos_por`` sabe resolver sin recorrer la tabla
+    indices = ()
+
+    def __init__(self, catalogo, total):
+        self.catalogo = catalogo
+        self.total = total
+
+    def documento(self, doc_id):
+        raise NotImplementedError
+
+    def candidatos_por(self, campo, valores):
+        """Ids cuyo ``campo`` está en ``valores`` (solo campos indexados)."""
+        raise NotImplementedError
+
+    def ids_en_orden(self, consulta):
+        """Ids a recorrer, ya en el orden pedido cuando es posible.
+
+        Devuelve ``(iterable, ordenado)``; si ``ordenado`` es falso hay que
+        ordenar los resultados completos antes de paginar.
+        """
+        valores, minimo, maximo = restricciones(consulta.where, "id")
+        desde = max(1, minimo or 1)
+        hasta = min(self.total, maximo if maximo is not None else self.total)
+        for campo in self.indices:
+            otros, _, _ = restricciones(consulta.where, campo)
+            if otros is not None:
+                nuevos = set(self.candidatos_por(campo, otros))
+                valores = nuevos if valores is None else valores & nuevos
+        if valores is not None:
+            ids = sorted(v for v in valores if desde <= v <= hasta)
+        else:
+            ids = range(desde, hasta + 1)
+
+        campo, asc = consulta.sort or ("id", True)
+        # ``updated_at`` es monótono con el id salvo en juegos modificados
+        if campo == "id" or (campo == "updated_at" and not self.catalogo.modificados):
+            return (ids if asc else reversed(ids)), True
+        return ids, False
+
+    def consultar(self, consulta):
+        ids, ordenado = self.ids_en_orden(consulta)
+        busqueda = (consulta.search or "").lower().split()
+        necesarios = consulta.offset + consulta.limit
+        encontrados = []
+        for doc_id in ids:
+            if busqueda and not self._coincide_busqueda(doc_id, busqueda):
+                continue
+            doc = self.documento(doc_id)
+            if doc is None or not evaluar(consulta.where, doc):
+                continue
+            encontrados.append(doc)
+            if ordenado and len(encontrados) >= necesarios:
+                break
+        if not ordenado:
+            campo, asc = consulta.sort
+            encontrados.sort(key=lambda d: _clave_orden(d, campo), reverse=not asc)
+        pagina = encontrados[consulta.offset:necesarios]
+        return [proyectar(d, consulta.campos, consulta.excluidos) for d in pagina]
+
+    def contar(self, consulta):
+        ids, _ = self.ids_en_orden(consulta)
+        busqueda = (consulta.search or "").lower().split()
+        total = 0
+        for doc_id in ids:
+            if busqueda and not self._coincide_busqueda(doc_id, busqueda):
+                continue
+            doc = self.documento(doc_id)
+            if doc is not None and evaluar(consulta.where, doc):
+                total += 1
+        return total
+
+    def texto_busqueda(self, doc_id):
+        return (self.documento(doc_id) or {}).get("name") or ""
+
+    def _coincide_busqueda(self, doc_id, palabras):
+        texto = self.texto_busqueda(doc_id).lower()
+        return all(p in texto for p in palabras)
+
+
+class TablaDiccionario(Tabla):
+    """Tablas pequeñas y fijas: géneros, plataformas, temas..."""
+
+    def __init__(self, catalogo, datos):
+        super().__init__(catalogo, max(datos) if datos else 0)
+        self.datos = datos
+
+    def documento(self, doc_id):
+        return self.datos.get(doc_id)
+
+
+class TablaJuegos(Tabla):
+    def texto_busqueda(self, juego_id):
+        # Evita generar el documento completo de cada candidato
+        return self.catalogo.nombre(juego_id)
+
+    def documento(self, juego_id):
+        if not 1 <= juego_id <= self.total or juego_id in self.catalogo.eliminados:
+            return None
+        rnd = random.Random(juego_id)
+        nombre = self.catalogo.nombre(juego_id)
+        generos = rnd.sample(sorted(GENEROS), rnd.randint(1, 3))
+        plataformas = rnd.sample(sorted(PLATAFORMAS), rnd.randint(1, 4))
+        temas = rnd.sample([t for t in TEMAS if t != 42], rnd.randint(0, 3))
+        if juego_id % 97 == 0:
+            temas.append(42)
+        companias = rnd.sample(range(1, NUM_COMPANIAS + 1), 2)
+        rating = round(rnd.uniform(30, 98), 2) if juego_id % 5 else None
+        idiomas = rnd.sample(sorted(IDIOMAS), SOPORTES_POR_JUEGO)
+        similares = [((juego_id + k * 7919) % self.total) + 1 for k in (1, 2, 3)]
+        return {
+            "id": juego_id,
+            "name": nombre,
+            "slug": _slug(nombre),
+            "summary": f"{nombre} es un juego generado por el servidor IGDB local.",
+            "storyline": None,
+            "first_release_date": INICIO_FECHAS + (juego_id * 7919 % (35 * 365)) * 86400,
+            "created_at": INICIO_ACTUALIZACIONES + juego_id * 60,
+            "updated_at": self.catalogo.modificados.get(
+                juego_id, INICIO_ACTUALIZACIONES + juego_id * 60 + self.catalogo.revision
+            ),
+            "cover": {
+                "id": juego_id,
+                "url": f"//images.igdb.com/igdb/image/upload/t_thumb/standin{juego_id}.jpg",
+            },
+            "screenshots": [
+                {"id": juego_id * 10 + k,
+                 "url": f"//images.igdb.com/igdb/image/upload/t_thumb/standin{juego_id}_{k}.jpg"}
+                for k in (1, 2)
+            ],
+            "genres": [{"id": g, "name": GENEROS[g]} for g in generos],
+            "platforms": [{"id": p, "name": PLATAFORMAS[p]} for p in plataformas],
+            "themes": [{"id": t, "name": TEMAS[t]} for t in temas],
+            "involved_companies": [
+                {
+                    "id": juego_id * 10 + k,
+                    "company": {"id": c, "name": f"Studio {c}"},
+                    "developer": k == 0,
+                    "publisher": k == 1,
+                }
+                for k, c in enumerate(companias)
+            ],
+            "total_rating": rating,
+            "total_rating_count": rnd.randint(0, 2000) if rating else 0,
+            "aggregated_rating": rating,
+            "rating_count": rnd.randint(0, 500),
+            "age_ratings": [{"id": juego_id, "rating": 12 if 42 in temas else rnd.randint(1, 11)}],
+            "game_modes": [{"id": 1, "name": "Single player"}],
+            "player_perspectives": [{"id": 2, "name": "Third person"}],
+            "websites": [{"id": juego_id, "category": 1, "url": f"https://example.com/{juego_id}"}],
+            "videos": [],
+            "similar_games": [
+                {"id": s, "name": self.catalogo.nombre(s),
+                 "cover": {"id": s,
+                           "url": f"//images.igdb.com/igdb/image/upload/t_thumb/standin{s}.jpg"}}
+                for s in similares
+            ],
+            "language_supports": [
+                {
+                    "id": (juego_id - 1) * SOPORTES_POR_JUEGO + k + 1,
+                    "language": self.catalogo.idioma(idioma),
+                }
+                for k, idioma in enumerate(idiomas)
+            ],
+        }
+
+
+class TablaSoportesIdioma(Tabla):
+    indices = ("game",)
+
+    def documento(self, soporte_id):
+        juego_id = (soporte_id - 1) // SOPORTES_POR_JUEGO + 1
+        juego = self.catalogo.juegos.documento(juego_id)
+        if juego is None:
+            return None
+        for soporte in juego["language_supports"]:
+            if soporte["id"] == soporte_id:
+                return {**soporte, "game": juego_id}
+        return None
+
+    def candidatos_por(self, campo, valores):
+        for juego_id in valores:
+            inicio = (juego_id - 1) * SOPORTES_POR_JUEGO + 1
+            yield from range(inicio, inicio + SOPORTES_POR_JUEGO)
+
+
+class TablaPopularidad(Tabla):
+    indices = ("game_id",)
+
+    def documento(self, primitiva_id):
+        juego_id = (primitiva_id - 1) // len(TIPOS_POPULARIDAD) + 1
+        if self.catalogo.juegos.documento(juego_id) is None:
+            return None
+        tipo = TIPOS_POPULARIDAD[(primitiva_id - 1) % len(TIPOS_POPULARIDAD)]
+        rnd = random.Random(primitiva_id)
+        return {
+            "id": primitiva_id,
+            "game_id": juego_id,
+            "popularity_type": tipo,
+            "value": round(rnd.random() / (1 + juego_id / 1000), 8),
+            "calculated_at": INICIO_ACTUALIZACIONES,
+        }
+
+    def candidatos_por(self, campo, valores):
+        n = len(TIPOS_POPULARIDAD)
+        for juego_id in valores:
+            yield from range((juego_id - 1) * n + 1, juego_id * n + 1)
+
+
+class Catalogo:
+    """Conjunto de endpoints simulados."""
+
+    def __init__(self, total_juegos=300_000):
+        self.total_juegos = total_juegos
+        self.revision = 0
+        self.eliminados = set()
+        # id -> updated_at de juegos "editados" tras generar el catálogo
+        self.modificados = {}
+        self._nombres = None
+        self.juegos = TablaJuegos(self, total_juegos)
+        self.tablas = {
+            "games": self.juegos,
+            "genres": TablaDiccionario(self, {i: {"id": i, "name": n} for i, n in GENEROS.items()}),
+            "platforms": TablaDiccionario(
+                self, {i: {"id": i, "name": n} for i, n in PLATAFORMAS.items()}
+            ),
+            "themes": TablaDiccionario(self, {i: {"id": i, "name": n} for i, n in TEMAS.items()}),
+            "companies": TablaDiccionario(self, {
+                i: {"id": i, "name": f"Studio {i}", "published": i % 3 != 0}
+                for i in range(1, NUM_COMPANIAS + 1)
+            }),
+            "languages": TablaDiccionario(self, {i: self.idioma(i) for i in IDIOMAS}),
+            "language_supports": TablaSoportesIdioma(self, total_juegos * SOPORTES_POR_JUEGO),
+            "popularity_primitives": TablaPopularidad(
+                self, total_juegos * len(TIPOS_POPULARIDAD)
+            ),
+        }
+        # Alias en singular que también acepta IGDB
+        self.tablas["language_support"] = self.tablas["language_supports"]
+
+    def modificar(self, ids, updated_at):
+        """Simula ediciones en IGDB fijando ``updated_at`` de ``ids``."""
+        for juego_id in ids:
+            self.modificados[juego_id] = updated_at
+
+    def nombre(self, juego_id):
+        if self._nombres is None:
+            self._nombres = [""] + [_nombre_juego(i) for i in range(1, self.total_juegos + 1)]
+        return self._nombres[juego_id]
+
+    def idioma(self, idioma_id):
+        nombre, nativo, locale = IDIOMAS[idioma_id]
+        return {"id": idioma_id, "name": nombre, "native_name": nativo, "locale": locale}
+
+    def tabla(self, endpoint):
+        return self.tablas.get(endpoint.strip("/"))
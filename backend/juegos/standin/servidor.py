@@ -0,0 +1,230 @@
+"""Servidor HTTP que imita IGDB (y el endpoint de token de Twitch).
+
+Responde a ``POST /v4/<endpoint>``, ``/v4/<endpoint>/count``,
+``/v4/multiquery`` y ``POST /oauth2/token``. Permite inyectar latencia,
+respuestas 429 aleatorias y un límite de peticiones por segundo igual al de
+IGDB para medir la aplicación sin gastar cuota real.
+
+Con ``fixtures`` las respuestas grabadas tienen prioridad sobre el catálogo
+sintético; en modo grabación cada petición se reenvía a la IGDB real y la
+respuesta se añade al fichero para reproducirla después.
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl
+
+import requests
+
+from .apicalypse import ErrorConsulta, parsear, parsear_multiquery
+from .catalogo import Catalogo
+
+logger = logging.getLogger(__name__)
+
+TOKEN_STANDIN = "standin"
+VIDA_TOKEN = 60 * 24 * 3600
+UPSTREAM_IGDB = "https://api.igdb.com/v4"
+UPSTREAM_TOKEN = "https://id.twitch.tv/oauth2/token"
+
+
+def normalizar_cuerpo(cuerpo):
+    """Clave estable de una consulta: espacios colapsados."""
+    return " ".join(cuerpo.split())
+
+
+class Fixtures:
+    """Respuestas grabadas en JSONL: ``{"endpoint", "cuerpo", "status", "datos"}``."""
+
+    def __init__(self, ruta=None):
+        self.ruta = ruta
+        self._respuestas = {}
+        self._lock = threading.Lock()
+        if ruta:
+            try:
+                with open(ruta, encoding="utf-8") as f:
+                    for linea in f:
+                        if linea.strip():
+                            item = json.loads(linea)
+                            clave = (item["endpoint"], normalizar_cuerpo(item["cuerpo"]))
+                            self._respuestas[clave] = (item["status"], item["datos"])
+            except FileNotFoundError:
+                pass
+
+    def __len__(self):
+        return len(self._respuestas)
+
+    def buscar(self, endpoint, cuerpo):
+        return self._respuestas.get((endpoint, normalizar_cuerpo(cuerpo)))
+
+    def grabar(self, endpoint, cuerpo, status, datos):
+        clave = (endpoint, normalizar_cuerpo(cuerpo))
+        with self._lock:
+            self._respuestas[clave] = (status, datos)
+            if self.ruta:
+                with open(self.ruta, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({
+                        "endpoint": endpoint, "cuerpo": clave[1], "status": status, "datos": datos,
+                    }, ensure_ascii=False) + "\n")
+
+
+class _Cubo:
+    """Token bucket local para devolver 429 como hace IGDB."""
+
+    def __init__(self, tasa):
+        self.tasa = tasa
+        self.tokens = tasa
+        self.ts = time.monotonic()
+        self._lock = threading.Lock()
+
+    def tomar(self):
+        with self._lock:
+            ahora = time.monotonic()
+            self.tokens = min(self.tasa, self.tokens + (ahora - self.ts) * self.tasa)
+            self.ts = ahora
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class IGDBStandin:
+    """Lógica del servidor, separada del transporte HTTP para poder probarla."""
+
+    def __init__(self, catalogo=None, latencia=0.0, jitter=0.0, prob_429=0.0,
+                 max_rps=None, fixtures=None, grabar=False, upstream=UPSTREAM_IGDB,
+                 upstream_token=UPSTREAM_TOKEN):
+        self.catalogo = catalogo or Catalogo()
+        self.latencia = latencia
+        self.jitter = jitter
+        self.prob_429 = prob_429
+        self.cubo = _Cubo(max_rps) if max_rps else None
+        self.fixtures = fixtures or Fixtures()
+        self.grabar = grabar
+        self.upstream = upstream.rstrip("/")
+        self.upstream_token = upstream_token
+        self._session = requests.Session()
+        self._lock = threading.Lock()
+        self.peticiones = 0
+        self.rechazadas = 0
+
+    def token(self, formulario):
+        if self.grabar:
+            resp = self._session.post(self.upstream_token, data=formulario, timeout=(5, 15))
+            return resp.status_code, resp.json()
+        return 200, {"access_token": TOKEN_STANDIN, "expires_in": VIDA_TOKEN,
+                     "token_type": "bearer"}
+
+    def atender(self, ruta, cuerpo, cabeceras=None):
+        """Devuelve ``(status, datos)`` para ``POST ruta`` con ``cuerpo``."""
+        with self._lock:
+            self.peticiones += 1
+        if (self.cubo and not self.cubo.tomar()) or random.random() < self.prob_429:
+            with self._lock:
+                self.rechazadas += 1
+            return 429, {"message": "Too Many Requests"}
+
+        if self.latencia or self.jitter:
+            time.sleep(max(0.0, self.latencia + random.uniform(-self.jitter, self.jitter)))
+
+        endpoint = ruta.split("/v4/", 1)[-1].strip("/")
+        grabada = self.fixtures.buscar(endpoint, cuerpo)
+        if grabada is not None:
+            return grabada
+        if self.grabar:
+            return self._reenviar(endpoint, cuerpo, cabeceras or {})
+        try:
+            return 200, self.resolver(endpoint, cuerpo)
+        except ErrorConsulta as e:
+            return 400, [{"title": "Syntax Error", "status": 400, "cause": str(e)}]
+
+    def resolver(self, endpoint, cuerpo):
+        if endpoint == "multiquery":
+            resultados = []
+            for nombre, sub_endpoint, sub_cuerpo in parsear_multiquery(cuerpo):
+                datos = self.resolver(sub_endpoint, sub_cuerpo)
+                if isinstance(datos, dict):
+                    resultados.append({"name": nombre, "count": datos["count"]})
+                else:
+                    resultados.append({"name": nombre, "result": datos})
+            return resultados
+
+        contar = endpoint.endswith("/count")
+        if contar:
+            endpoint = endpoint[: -len("/count")]
+        tabla = self.catalogo.tabla(endpoint)
+        if tabla is None:
+            raise ErrorConsulta(f"Endpoint desconocido: {endpoint}")
+        consulta = parsear(cuerpo)
+        if contar:
+            return {"count": tabla.contar(consulta)}
+        return tabla.consultar(consulta)
+
+    def _reenviar(self, endpoint, cuerpo, cabeceras):
+        reenviadas = {k: v for k, v in cabeceras.items() if k.lower() in ("client-id", "authorization")}
+        resp = self._session.post(
+            f"{self.upstream}/{endpoint}", headers=reenviadas, data=cuerpo, timeout=(5, 30)
+        )
+        try:
+            datos = resp.json()
+        except ValueError:
+            datos = resp.text
+        if resp.status_code == 200:
+            self.fixtures.grabar(endpoint, cuerpo, resp.status_code, datos)
+        return resp.status_code, datos
+
+
+def _handler(standin):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            longitud = int(self.headers.get("Content-Length") or 0)
+            cuerpo = self.rfile.read(longitud).decode("utf-8") if longitud else ""
+            ruta = self.path.split("?", 1)[0]
+            if ruta.rstrip("/").endswith("/oauth2/token"):
+                formulario = dict(parse_qsl(self.path.partition("?")[2] + "&" + cuerpo))
+                status, datos = standin.token(formulario)
+            else:
+                status, datos = standin.atender(ruta, cuerpo, dict(self.headers))
+            self._responder(status, datos)
+
+        def _responder(self, status, datos):
+            contenido = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(contenido)))
+            if status == 429:
+                self.send_header("Retry-After", "1")
+            self.end_headers()
+            self.wfile.write(contenido)
+
+        def log_message(self, formato, *args):
+            logger.debug(formato % args)
+
+    return Handler
+
+
+class _Servidor(ThreadingHTTPServer):
+    daemon_threads = True
+    # Cola de ``listen`` amplia para las pruebas de concurrencia
+    request_queue_size = 512
+
+
+def crear_servidor(standin, host="127.0.0.1", puerto=8765):
+    """Crea (sin arrancar) el ``ThreadingHTTPServer`` del stand-in."""
+    return _Servidor((host, puerto), _handler(standin))
+
+
+def arrancar_en_hilo(standin, host="127.0.0.1", puerto=0):
+    """Arranca el servidor en un hilo de fondo; útil en benchmarks y tests.
+
+    Devuelve ``(servidor, url_base)``; hay que llamar a ``servidor.shutdown()``.
+    """
+    servidor = crear_servidor(standin, host, puerto)
+    threading.Thread(target=servidor.serve_forever, daemon=True, name="igdb-standin").start()
+    host, puerto = servidor.server_address[:2]
+    return servidor, f"http://{host}:{puerto}"
@@ -0,0 +1,70 @@
+from unittest import skipIf, skipUnless
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from juegos.busqueda import _expresion_booleana
+from juegos.igdb_views.services import buscar_y_cachear
+from juegos.models import Juego
+
+ES_MYSQL = connection.vendor == "mysql"
+
+
+class ExpresionBooleanaTest(SimpleTestCase):
+    def test_expresion_exige_cada_palabra_como_prefijo(self):
+        self.assertEqual(_expresion_booleana("The Witch: wild-hu"), "+witch* +wild*")
+        self.assertEqual(_expresion_booleana("ff"), "")
+
+
+class _CatalogoDeBusqueda:
+    def setUp(self):
+        nombres = [
+            "The Witcher 3: Wild Hunt", "The Witcher", "Witcher Adventure Game",
+            "Wild Arms", "Hunt: Showdown",
+        ]
+        Juego.objects.bulk_create(
+            Juego(id=i, name=nombre, popularidad=i) for i, nombre in enumerate(nombres, 1)
+        )
+        Juego.objects.bulk_create(Juego(id=100 + i, name=f"Relleno {i}") for i in range(20))
+
+    @patch("juegos.igdb_views.services._buscar_en_igdb_y_guardar")
+    def test_no_cuenta_para_decidir_si_preguntar_a_igdb(self, fallback):
+        with CaptureQueriesContext(connection) as consultas:
+            qs = buscar_y_cachear(q="relleno")
+        fallback.assert_not_called()
+        self.assertEqual(len(consultas), 1)
+        self.assertNotIn("COUNT", consultas[0]["sql"].upper())
+        self.assertEqual(qs.count(), 20)
+
+        buscar_y_cachear(q="wild")
+        fallback.assert_called_once_with("wild")
+
+
+@skipIf(ES_MYSQL, "MySQL usa el índice FULLTEXT: ver BusquedaFullTextTest")
+class BusquedaPorNombreTest(_CatalogoDeBusqueda, TestCase):
+    @patch("juegos.igdb_views.services._buscar_en_igdb_y_guardar")
+    def test_palabras_en_cualquier_orden_y_mejor_coincidencia_primero(self, fallback):
+        ids = list(buscar_y_cachear(q="witcher").values_list("id", flat=True))
+        # Primero la coincidencia por prefijo, después el resto por popularidad
+        self.assertEqual(ids, [3, 2, 1])
+        self.assertEqual(buscar_y_cachear(q="the witcher")[0].id, 2)
+        self.assertEqual(list(buscar_y_cachear(q="hunt wild").values_list("id", flat=True)), [1])
+
+
+@skipUnless(ES_MYSQL, "El índice FULLTEXT solo existe en MySQL")
+class BusquedaFullTextTest(_CatalogoDeBusqueda, TransactionTestCase):
+    """InnoDB solo indexa en FULLTEXT las filas confirmadas: sin TestCase."""
+
+    @patch("juegos.igdb_views.services._buscar_en_igdb_y_guardar")
+    def test_palabras_en_cualquier_orden_ordenadas_por_relevancia(self, fallback):
+        resultados = list(buscar_y_cachear(q="witcher").values_list("id", "relevancia"))
+        self.assertCountEqual([i for i, _ in resultados], [1, 2, 3])
+        relevancias = [r for _, r in resultados]
+        self.assertEqual(relevancias, sorted(relevancias, reverse=True))
+        # "the" es palabra vacía: no se exige ni cambia el resultado
+        self.assertCountEqual(
+            buscar_y_cachear(q="the witcher").values_list("id", flat=True), [1, 2, 3]
+        )
+        self.assertEqual(list(buscar_y_cachear(q="hunt wild").values_list("id", flat=True)), [1])
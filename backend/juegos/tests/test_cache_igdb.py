@@ -0,0 +1,160 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from juegos import cache_igdb
+from juegos.lider_sync import CLAVE_LIDER, Concesion
+from juegos.models import EstadoSincronizacion, Juego
+from juegos.standin.catalogo import INICIO_ACTUALIZACIONES, Catalogo
+from juegos.standin.servidor import IGDBStandin
+from juegos.version_catalogo import version_catalogo
+
+
+@patch("juegos.cache_igdb.DELAY_BETWEEN_BATCHES", 0)
+class SincronizacionIncrementalTest(TestCase):
+    def setUp(self):
+        cache_igdb._STOP_SYNC.clear()
+        self.catalogo = Catalogo(1200)
+        standin = IGDBStandin(catalogo=self.catalogo)
+        patcher = patch("juegos.cache_igdb.igdb")
+        self.igdb = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.igdb.consultar.side_effect = lambda endpoint, cuerpo, **_: standin.resolver(endpoint, cuerpo)
+
+    def test_primera_pasada_y_luego_solo_cambios(self):
+        cache_igdb.sincronizar_incremental()
+        self.assertEqual(Juego.objects.count(), 1200)
+        estado = EstadoSincronizacion.objects.get(nombre=cache_igdb.ESTADO_CATALOGO)
+        self.assertEqual(estado.marca_updated_at, INICIO_ACTUALIZACIONES + 1200 * 60)
+
+        # Sin cambios no se escribe nada
+        self.assertEqual(cache_igdb.sincronizar_incremental(), 0)
+
+        # Tres juegos editados en IGDB, dos de ellos con la misma marca
+        self.catalogo.modificar([5, 700], INICIO_ACTUALIZACIONES + 10**6)
+        self.catalogo.modificar([42], INICIO_ACTUALIZACIONES + 10**6 + 1)
+        self.assertEqual(cache_igdb.sincronizar_incremental(), 3)
+        estado.refresh_from_db()
+        self.assertEqual(
+            (estado.marca_updated_at, estado.ultimo_id), (INICIO_ACTUALIZACIONES + 10**6 + 1, 42)
+        )
+
+    @patch("juegos.cache_igdb.BATCH_SIZE", 500)
+    def test_una_pasada_incrementa_la_version_una_vez(self):
+        version = version_catalogo()
+        cache_igdb.sincronizar_incremental()  # tres lotes
+        self.assertEqual(version_catalogo(), version + 1)
+        cache_igdb.sincronizar_incremental()  # sin cambios
+        self.assertEqual(version_catalogo(), version + 1)
+
+    @patch("juegos.cache_igdb.BATCH_SIZE", 2)
+    def test_empates_de_marca_mayores_que_un_lote(self):
+        self.catalogo = Catalogo(5)
+        standin = IGDBStandin(catalogo=self.catalogo)
+        self.igdb.consultar.side_effect = lambda endpoint, cuerpo, **_: standin.resolver(endpoint, cuerpo)
+        self.catalogo.modificar([1, 2, 3, 4, 5], INICIO_ACTUALIZACIONES)
+
+        cache_igdb.sincronizar_incremental()
+
+        self.assertEqual(Juego.objects.count(), 5)
+
+@patch("juegos.cache_igdb.DELAY_BETWEEN_BATCHES", 0)
+@patch("juegos.cache_igdb.BATCH_SIZE", 100)
+@override_settings(IGDB_SYNC_HILOS=1)
+class RecorridoCompletoPorTramosTest(TransactionTestCase):
+    """Los tramos se procesan en hilos con su propia conexión: sin TestCase.
+
+    Un solo hilo porque SQLite en memoria no admite escrituras concurrentes.
+    """
+
+    def setUp(self):
+        cache_igdb._STOP_SYNC.clear()
+        self.catalogo = Catalogo(1000)
+        standin = IGDBStandin(catalogo=self.catalogo)
+        self.consultas = []
+
+        def consultar(endpoint, cuerpo, **_):
+            self.consultas.append(cuerpo)
+            return standin.resolver(endpoint, cuerpo)
+
+        patcher = patch("juegos.cache_igdb.igdb")
+        self.igdb = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.igdb.consultar.side_effect = consultar
+
+    def test_recorre_por_rangos_de_id_sin_offset(self):
+        cache_igdb.solicitar_sincronizacion_completa()
+        self.assertEqual(cache_igdb.sincronizar_completo(), 1000)
+        self.assertEqual(Juego.objects.count(), 1000)
+        self.assertFalse(any("offset" in c for c in self.consultas))
+        # Los puntos de control de los tramos desaparecen al terminar
+        self.assertEqual(list(EstadoSincronizacion.objects.values_list("nombre", flat=True)),
+                         [cache_igdb.ESTADO_CATALOGO])
+        estado = EstadoSincronizacion.objects.get(nombre=cache_igdb.ESTADO_CATALOGO)
+        self.assertFalse(estado.completa_solicitada)
+        self.assertIsNotNone(estado.ultima_completa)
+
+    def test_reanuda_cada_tramo_donde_lo_dejo(self):
+        original = self.igdb.consultar.side_effect
+
+        def falla_en_un_tramo(endpoint, cuerpo, **kwargs):
+            if "id >= 351 " in cuerpo:
+                raise RuntimeError("caída")
+            return original(endpoint, cuerpo, **kwargs)
+
+        self.igdb.consultar.side_effect = falla_en_un_tramo
+        cache_igdb.sincronizar_completo()
+        # El tramo 251-500 guardó su primer lote; el resto de tramos terminó
+        self.assertEqual(Juego.objects.count(), 1000 - 150)
+        tramos = EstadoSincronizacion.objects.filter(nombre__startswith=cache_igdb.PREFIJO_TRAMO)
+        self.assertEqual(tramos.count(), 4)
+
+        # La siguiente pasada solo pide lo que faltaba
+        self.igdb.consultar.side_effect = original
+        self.consultas.clear()
+        self.assertEqual(cache_igdb.sincronizar_completo(), 150)
+        self.assertEqual(Juego.objects.count(), 1000)
+        self.assertFalse(tramos.exists())
+
+
+class ConcesionTest(TestCase):
+    def setUp(self):
+        cache.delete(CLAVE_LIDER)
+        self.addCleanup(cache.delete, CLAVE_LIDER)
+
+    def test_un_solo_lider_y_relevo_tras_caida(self):
+        a, b = Concesion(), Concesion()
+        self.assertTrue(a.adquirir())
+        self.assertFalse(b.adquirir())
+        self.assertFalse(b.renovar())
+        b.liberar()  # no puede soltar una concesión ajena
+        self.assertEqual(b.titular(), a.propietario)
+
+        # El líder muere sin liberar: la clave caduca y otro toma el relevo
+        cache.delete(CLAVE_LIDER)
+        self.assertTrue(b.adquirir())
+        self.assertFalse(a.renovar())
+
+    @patch("juegos.cache_igdb.sincronizar_idiomas")
+    @patch("juegos.cache_igdb.reconciliar", return_value={"eliminados": 0, "recuperados": 0})
+    @patch("juegos.cache_igdb.reconciliacion_pendiente", return_value=True)
+    @patch("juegos.cache_igdb.sincronizar_popularidad", return_value=0)
+    @patch("juegos.cache_igdb.popularidad_pendiente", return_value=True)
+    @patch("juegos.cache_igdb.sincronizar_incremental", return_value=0)
+    def test_trabajador_solo_sincroniza_con_la_concesion(
+        self, incremental, _pendiente, popularidad, _reconciliacion_pendiente, reconciliar, _idiomas
+    ):
+        otro = Concesion()
+        otro.adquirir()
+        self.assertFalse(cache_igdb.ejecutar_trabajador(una_vez=True))
+        incremental.assert_not_called()
+
+        otro.liberar()
+        self.assertTrue(cache_igdb.ejecutar_trabajador(una_vez=True))
+        for fase in (incremental, popularidad, reconciliar):
+            fase.assert_called_once()
+        self.assertEqual(list(cache_igdb._errores), [])
+        # Al terminar suelta la concesión y retira el latido
+        self.assertIsNone(otro.titular())
+        self.assertIsNone(cache.get(cache_igdb.CLAVE_LATIDO))
@@ -0,0 +1,57 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from juegos.cache_listados import _clave_fila
+from juegos.ingesta import guardar_juegos
+from juegos.models import Juego
+from juegos.version_catalogo import version_catalogo
+
+URL = "/api/juegos/populares/"
+
+
+class CacheListadosTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        Juego.objects.bulk_create(
+            Juego(id=i, name=f"Juego {i}", popularidad=float(i)) for i in range(1, 21)
+        )
+        self.cliente = APIClient()
+
+    def _ids(self, **parametros):
+        return [j["id"] for j in self.cliente.get(URL, {"por_pagina": 5, **parametros}).json()["juegos"]]
+
+    def test_pagina_repetida_sin_consultas(self):
+        self.assertEqual(self._ids(pagina=2), [15, 14, 13, 12, 11])
+        with self.assertNumQueries(0):
+            respuesta = self.cliente.get(URL, {"por_pagina": 5, "pagina": 2}).json()
+        self.assertEqual([j["id"] for j in respuesta["juegos"]], [15, 14, 13, 12, 11])
+        self.assertEqual(respuesta["total_resultados"], 20)
+
+        # Misma búsqueda escrita de otra forma: misma entrada
+        self._ids(q="Juego  1")
+        with self.assertNumQueries(0):
+            self._ids(q=" juego 1")
+
+    def test_hidrata_con_multi_get_y_lee_solo_lo_que_falta(self):
+        esperado = self._ids(pagina=1)
+        cache.delete_many([_clave_fila(version_catalogo(), i) for i in esperado[1:3]])
+        with self.assertNumQueries(1):
+            self.assertEqual(self._ids(pagina=1), esperado)
+
+    def test_la_sincronizacion_invalida_con_la_version(self):
+        self.assertEqual(self._ids()[0], 20)
+        guardar_juegos([{"id": 21, "name": "Nuevo"}])
+        Juego.objects.filter(id=21).update(popularidad=100.0)
+        self.assertEqual(self._ids()[0], 21)
+
+    def test_solo_invalida_si_cambia_lo_que_muestra_el_listado(self):
+        guardar_juegos([{"id": 21, "name": "Nuevo", "total_rating": 80}])
+        version = version_catalogo()
+        # La valoración no aparece en el listado: se guarda sin invalidar
+        resultado = guardar_juegos([{"id": 21, "name": "Nuevo", "total_rating": 85}])
+        self.assertEqual(resultado["actualizados"], 1)
+        self.assertEqual(version_catalogo(), version)
+
+        guardar_juegos([{"id": 21, "name": "Renombrado", "total_rating": 85}])
+        self.assertGreater(version_catalogo(), version)
@@ -0,0 +1,61 @@
+from django.test import TestCase
+
+from juegos.cache_igdb import CAMPOS_SYNC
+from juegos.clasificaciones import reconstruir
+from juegos.igdb_views.services import buscar_y_cachear
+from juegos.ingesta import guardar_juegos
+from juegos.models import Genero, Juego, JuegoCompania
+from juegos.standin.apicalypse import proyectar
+from juegos.standin.catalogo import Catalogo
+
+
+class ClasificacionesTest(TestCase):
+    def setUp(self):
+        catalogo = Catalogo(200)
+        self.documentos = [catalogo.juegos.documento(i) for i in range(1, 201)]
+        guardar_juegos([proyectar(d, CAMPOS_SYNC.split(",")) for d in self.documentos])
+
+    def _esperados(self, condicion):
+        return sorted(d["id"] for d in self.documentos if condicion(d))
+
+    def _filtrados(self, **filtros):
+        return sorted(buscar_y_cachear(filtro_adulto=False, **filtros).values_list("id", flat=True))
+
+    def test_filtros_del_listado_con_tablas_normalizadas(self):
+        genero = self.documentos[0]["genres"][0]["id"]
+        plataforma = self.documentos[0]["platforms"][0]["id"]
+        self.assertEqual(Genero.objects.get(id=genero).name, self.documentos[0]["genres"][0]["name"])
+        self.assertEqual(
+            self._filtrados(genero=str(genero), plataforma=str(plataforma)),
+            self._esperados(lambda d: genero in [g["id"] for g in d["genres"]]
+                            and plataforma in [p["id"] for p in d["platforms"]]),
+        )
+
+        # ``publisher`` solo cuenta a la distribuidora, no a la desarrolladora
+        distribuidora = self.documentos[0]["involved_companies"][1]["company"]["id"]
+        self.assertEqual(
+            self._filtrados(publisher=distribuidora),
+            self._esperados(lambda d: any(
+                c["publisher"] and c["company"]["id"] == distribuidora
+                for c in d["involved_companies"]
+            )),
+        )
+        # Un valor no numérico se ignora
+        self.assertEqual(len(self._filtrados(genero="rpg")), 200)
+
+    def test_la_ingesta_reescribe_las_relaciones_del_juego(self):
+        juego = proyectar(self.documentos[0], CAMPOS_SYNC.split(","))
+        juego["genres"] = [{"id": 999, "name": "Nuevo"}]
+        guardar_juegos([juego])
+        self.assertEqual(list(Juego.objects.get(id=1).generos.values_list("id", flat=True)), [999])
+
+    def test_reconstruye_desde_los_json_guardados(self):
+        total = JuegoCompania.objects.count()
+        Juego.generos.through.objects.all().delete()
+        JuegoCompania.objects.all().delete()
+        self.assertEqual(reconstruir(tamano_lote=64), 200)
+        self.assertEqual(JuegoCompania.objects.count(), total)
+        self.assertEqual(
+            Juego.generos.through.objects.count(),
+            sum(len(d["genres"]) for d in self.documentos),
+        )
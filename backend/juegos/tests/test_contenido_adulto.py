@@ -0,0 +1,51 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from juegos.clasificaciones import marcar_adultos
+from juegos.igdb_views.services import buscar_y_cachear, calcular_stats_bienvenida
+from juegos.ingesta import guardar_juegos
+from juegos.models import Juego
+from usuarios.models import Perfil
+
+
+class ContenidoAdultoTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        guardar_juegos([
+            {"id": 1, "name": "Apto", "themes": [{"id": 1, "name": "Action"}]},
+            {"id": 2, "name": "Erótico", "themes": [{"id": 42, "name": "Erotic"}]},
+            {"id": 3, "name": "Solo adultos", "age_ratings": [{"id": 9, "rating": 12}]},
+        ])
+
+    def _ids(self, respuesta):
+        return sorted(j["id"] for j in respuesta.json()["juegos"])
+
+    def test_la_ingesta_precalcula_el_filtro(self):
+        adultos = Juego.objects.filter(es_adulto=True).order_by("id")
+        self.assertEqual(list(adultos.values_list("id", flat=True)), [2, 3])
+        self.assertEqual(list(buscar_y_cachear().values_list("id", flat=True)), [1])
+        self.assertEqual(len(buscar_y_cachear(filtro_adulto=False)), 3)
+        stats = calcular_stats_bienvenida()
+        self.assertEqual((stats["totalJuegos"], stats["totalJuegosMostrados"]), (3, 1))
+
+    def test_marca_juegos_guardados_antes_del_campo(self):
+        Juego.objects.update(es_adulto=False)
+        self.assertEqual(marcar_adultos(tamano_lote=2), 1)
+        self.assertTrue(Juego.objects.get(id=2).es_adulto)
+
+    def test_listado_respeta_la_preferencia_del_perfil(self):
+        cliente = APIClient()
+        self.assertEqual(self._ids(cliente.get("/api/juegos/populares/", {"adult": "0"})), [1])
+
+        usuario = User.objects.create_user("adulto", password="x")
+        perfil = Perfil.objects.create(user=usuario, filtro_adulto=False)
+        cliente.force_authenticate(usuario)
+        self.assertEqual(self._ids(cliente.get("/api/juegos/populares/")), [1, 2, 3])
+
+        # Cambiar la preferencia actualiza la caché que lee el listado
+        perfil.filtro_adulto = True
+        perfil.save()
+        self.assertEqual(self._ids(cliente.get("/api/juegos/populares/")), [1])
+        self.assertEqual(self._ids(cliente.get("/api/juegos/populares/", {"adult": "0"})), [1, 2, 3])
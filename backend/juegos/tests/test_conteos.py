@@ -0,0 +1,71 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from juegos.conteos import contar, contar_catalogo, firma_filtros
+from juegos.igdb_views.services import buscar_y_cachear
+from juegos.ingesta import guardar_juegos
+from juegos.models import Juego
+from juegos.version_catalogo import CLAVE_VERSION, incrementar_version, version_catalogo
+
+
+class ConteosTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        guardar_juegos([
+            {"id": i, "name": f"Juego {i}", "genres": [{"id": 5 if i % 2 else 8, "name": "G"}]}
+            for i in range(1, 11)
+        ])
+
+    def test_cachea_por_filtros_hasta_que_cambia_el_catalogo(self):
+        qs = buscar_y_cachear(genero="5")
+        self.assertEqual(contar(qs, genero="5"), 5)
+        with self.assertNumQueries(0):
+            # " 5" y 5 son el mismo filtro
+            self.assertEqual(contar(qs, genero=" 5"), 5)
+
+        guardar_juegos([{"id": 11, "name": "Nuevo", "genres": [5]}])
+        self.assertEqual(contar(buscar_y_cachear(genero="5"), genero="5"), 6)
+
+    def test_firma_normaliza_la_busqueda(self):
+        self.assertEqual(firma_filtros(q=" The  Witcher"), firma_filtros(q="the witcher"))
+        # La búsqueda por prefijo distingue los signos: la firma también
+        self.assertNotEqual(firma_filtros(q="f.f"), firma_filtros(q="f f"))
+        self.assertNotEqual(firma_filtros(filtro_adulto=True), firma_filtros(filtro_adulto=False))
+
+    @patch("juegos.conteos._filas_estimadas", return_value=1234)
+    def test_total_sin_filtrar_parte_de_las_estadisticas_del_motor(self, estimadas):
+        Juego.objects.filter(id=1).update(eliminado=True)
+        Juego.objects.filter(id__in=[2, 3]).update(es_adulto=True)
+        incrementar_version()
+        # A la estimación se le restan los retirados y, con el filtro, los adultos
+        self.assertEqual(contar_catalogo(filtro_adulto=False), (1233, True))
+        self.assertEqual(contar_catalogo(), (1231, True))
+
+        respuesta = APIClient().get("/api/juegos/populares/", {"por_pagina": 4}).json()
+        # Los resultados del listado se cuentan con exactitud
+        self.assertEqual((respuesta["total_resultados"], respuesta["paginas_totales"]), (7, 2))
+        self.assertEqual(respuesta["total_sin_filtrar"], 1231)
+        self.assertTrue(respuesta["total_sin_filtrar_aproximado"])
+
+    @patch("juegos.conteos._filas_estimadas", return_value=None)
+    def test_sin_estimacion_cuenta(self, estimadas):
+        Juego.objects.filter(id=1).update(eliminado=True)
+        incrementar_version()
+        self.assertEqual(contar_catalogo(), (9, False))
+
+    def test_la_version_no_retrocede_si_se_pierde_el_contador(self):
+        version = incrementar_version()
+        cache.delete(CLAVE_VERSION)
+        self.assertGreater(version_catalogo(), version)
+
+    def test_listado_por_paginas_sin_count_en_caliente(self):
+        cliente = APIClient()
+        primera = cliente.get("/api/juegos/populares/", {"por_pagina": 4}).json()
+        self.assertEqual((primera["total_resultados"], primera["paginas_totales"]), (10, 3))
+        with self.assertNumQueries(1):
+            tercera = cliente.get("/api/juegos/populares/", {"por_pagina": 4, "pagina": 3}).json()
+        self.assertEqual(len(tercera["juegos"]), 2)
+        self.assertEqual(Juego.objects.count(), 10)
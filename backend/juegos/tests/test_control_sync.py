@@ -0,0 +1,72 @@
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from juegos import cache_igdb, control_sync
+from juegos.models import EstadoSincronizacion
+
+
+class SincronizacionAdminTest(TestCase):
+    url = "/api/admin/sincronizacion/"
+
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        self.client = APIClient()
+        self.admin = User.objects.create_user(username="admin", password="x", is_staff=True)
+        self.usuario = User.objects.create_user(username="normal", password="x")
+
+    def test_solo_administradores(self):
+        self.client.force_authenticate(self.usuario)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_estado_desde_latido_y_tramos(self):
+        EstadoSincronizacion.objects.create(nombre=f"{cache_igdb.PREFIJO_TRAMO}0", ultimo_id=99, id_hasta=201)
+        ahora = time.time()
+        cache.set(cache_igdb.CLAVE_LATIDO, {
+            "propietario": "worker-1", "fase": "completa", "desde": ahora - 10, "latido": ahora,
+            "filas": {"insertados": 400, "actualizados": 50, "sin_cambios": 50},
+            "igdb": {"llamadas": 12, "errores": 1, "limitadas": 1}, "errores": [],
+        })
+        self.client.force_authenticate(self.admin)
+
+        datos = self.client.get(self.url).json()
+
+        self.assertEqual(datos["trabajador"]["fase"], "completa")
+        self.assertEqual(datos["tramos"], [{"tramo": 0, "ultimo_id": 99, "id_hasta": 201}])
+        self.assertEqual(datos["filas_por_segundo"], 50.0)
+        self.assertEqual(datos["eta_segundos"], 2)  # 101 ids pendientes a 50/s
+        self.assertEqual(datos["igdb"]["limitadas"], 1)
+        self.assertTrue(datos["descargando"])
+        self.assertFalse(datos["completado"])
+
+    def test_descargando_en_cada_fase_del_trabajador(self):
+        self.client.force_authenticate(self.admin)
+        for fase in ("completa", "incremental", "popularidad", "reconciliacion", "esperando"):
+            with self.subTest(fase=fase):
+                ahora = time.time()
+                cache.set(cache_igdb.CLAVE_LATIDO, {
+                    "propietario": "worker-1", "fase": fase, "desde": ahora, "latido": ahora,
+                    "filas": {}, "igdb": {}, "errores": [],
+                })
+                datos = self.client.get(self.url).json()
+                self.assertEqual(datos["descargando"], fase != "esperando")
+
+    def test_pausar_reanudar_e_iniciar(self):
+        self.client.force_authenticate(self.admin)
+        self.assertTrue(self.client.post(self.url, {"accion": "pausar"}).json()["pausada"])
+        self.assertTrue(control_sync.pausada())
+        self.assertFalse(self.client.post(self.url, {"accion": "reanudar"}).json()["pausada"])
+
+        datos = self.client.post(self.url, {"accion": "iniciar", "modo": "completa"}).json()
+        self.assertTrue(datos["marca"]["completa_solicitada"])
+        # El trabajador deja de esperar su intervalo en cuanto ve la petición
+        inicio = time.monotonic()
+        control_sync.esperar(threading.Event(), 600)
+        self.assertLess(time.monotonic() - inicio, 1)
+
+        self.assertEqual(self.client.post(self.url, {"accion": "borrar"}).status_code, 400)
@@ -0,0 +1,58 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from juegos.igdb_client import IGDBError, igdb
+from juegos.igdb_views.services import (
+    _detalle_cache_key,
+    _detalle_stale_key,
+    obtener_detalles_batch,
+)
+from juegos.models import Juego
+
+
+class DetallesBatchTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        cache.set(_detalle_cache_key(1), {"id": 1, "name": "En Redis", "screenshots": []})
+        Juego.objects.create(id=2, name="En DB")
+
+    @patch.object(igdb, "consultar")
+    def test_redis_y_luego_igdb_en_una_llamada(self, mock_consultar):
+        mock_consultar.return_value = [
+            {"id": 2, "name": "De IGDB", "screenshots": [{"id": 9, "url": "u"}]},
+            {"id": 3, "name": "Nuevo"},
+        ]
+
+        juegos = obtener_detalles_batch([3, 1, 2, 1], ["name", "screenshots"])
+
+        self.assertEqual([j["id"] for j in juegos], [3, 1, 2])
+        self.assertEqual(juegos[1]["name"], "En Redis")
+        self.assertNotIn("idiomas", juegos[0])
+        mock_consultar.assert_called_once()
+        self.assertIn("where id = (3,2)", mock_consultar.call_args.args[1])
+        # Lo descargado queda en Redis para el siguiente detalle
+        self.assertEqual(cache.get(_detalle_cache_key(3))["name"], "Nuevo")
+        self.assertTrue(Juego.objects.filter(id=3).exists())
+
+    @patch.object(igdb, "consultar")
+    def test_campos_de_db_no_van_a_igdb(self, mock_consultar):
+        juegos = obtener_detalles_batch([1, 2], ["name"])
+        self.assertEqual([j["name"] for j in juegos], ["En Redis", "En DB"])
+        mock_consultar.assert_not_called()
+
+    @patch.object(igdb, "consultar", side_effect=IGDBError("caído"))
+    def test_igdb_caido_sirve_copias_obsoletas(self, _consultar):
+        cache.set(_detalle_stale_key(4), {"id": 4, "name": "Viejo"})
+        juegos = obtener_detalles_batch([2, 4, 5])
+        self.assertEqual([j["id"] for j in juegos], [2, 4])
+        self.assertTrue(all(j["is_stale"] for j in juegos))
+
+    def test_endpoint_valida_ids(self):
+        cliente = APIClient()
+        self.assertEqual(cliente.get("/api/juegos/detalle/batch/?ids=1,x").status_code, 400)
+        resp = cliente.get("/api/juegos/detalle/batch/?ids=1&fields=name")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["juegos"], [{"id": 1, "name": "En Redis"}])
@@ -0,0 +1,23 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from juegos.idiomas import ids_idiomas, nombres_idiomas, sincronizar_idiomas
+from juegos.models import Idioma
+
+
+class IdiomasTest(TestCase):
+    @patch("juegos.idiomas.igdb")
+    def test_sincroniza_y_resuelve_sin_red(self, mock_igdb):
+        mock_igdb.consultar.return_value = [
+            {"id": 7, "name": "English", "native_name": "English", "locale": "en-US"},
+            {"id": 26, "name": "Spanish (Spain)", "native_name": "Español", "locale": "es-ES"},
+        ]
+        self.assertEqual(sincronizar_idiomas(), 2)
+        self.assertEqual(Idioma.objects.get(id=26).locale, "es-ES")
+
+        mock_igdb.reset_mock()
+        soportes = [{"id": 1, "language": 26}, {"id": 2, "language": {"id": 7}}, {"id": 3, "language": 26}]
+        self.assertEqual(ids_idiomas(soportes), [26, 7])
+        self.assertEqual(nombres_idiomas([26, 7, 999]), ["Spanish (Spain)", "English"])
+        mock_igdb.consultar.assert_not_called()
@@ -0,0 +1,76 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from juegos.igdb_circuit import ABIERTO, CERRADO, SEMIABIERTO, CircuitBreaker
+from juegos.igdb_client import IGDBNoDisponible
+from juegos.idiomas import recargar_idiomas
+from juegos.igdb_views.services import _detalle_stale_key, obtener_detalle_juego
+from juegos.models import Idioma, Juego
+
+
+class CircuitBreakerTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_se_abre_al_superar_el_umbral(self):
+        circuito = CircuitBreaker(umbral_fallos=3)
+        for _ in range(2):
+            circuito.registrar(0.1, error=True)
+        self.assertEqual(circuito.estado(), CERRADO)
+        circuito.registrar(0.1, error=True)
+        self.assertEqual(circuito.estado(), ABIERTO)
+        self.assertFalse(circuito.permitir())
+
+    def test_latencia_excesiva_cuenta_como_fallo(self):
+        circuito = CircuitBreaker(umbral_fallos=1, latencia_maxima=1.0)
+        circuito.registrar(2.0)
+        self.assertEqual(circuito.estado(), ABIERTO)
+
+    @patch("juegos.igdb_circuit.time.time")
+    def test_semiabierto_permite_una_sola_sonda(self, mock_time):
+        mock_time.return_value = 1000.0
+        circuito = CircuitBreaker(umbral_fallos=1, enfriamiento=30)
+        circuito.registrar(0.1, error=True)
+        mock_time.return_value = 1031.0
+        self.assertEqual(circuito.estado(), SEMIABIERTO)
+        self.assertTrue(circuito.permitir())
+        self.assertFalse(circuito.permitir())
+        circuito.registrar(0.1)
+        self.assertEqual(circuito.estado(), CERRADO)
+
+    @patch("juegos.igdb_circuit.time.time")
+    def test_sonda_fallida_reabre(self, mock_time):
+        mock_time.return_value = 1000.0
+        circuito = CircuitBreaker(umbral_fallos=1, enfriamiento=30)
+        circuito.registrar(0.1, error=True)
+        mock_time.return_value = 1031.0
+        self.assertTrue(circuito.permitir())
+        circuito.registrar(0.1, error=True)
+        self.assertEqual(circuito.estado(), ABIERTO)
+
+
+@override_settings(IS_TESTING=False)
+class DetalleObsoletoTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    @patch("juegos.igdb_views.services.igdb")
+    def test_sirve_copia_obsoleta_de_redis(self, mock_igdb):
+        mock_igdb.consultar.side_effect = IGDBNoDisponible("abierto")
+        cache.set(_detalle_stale_key(5), {"id": 5, "name": "Viejo", "idiomas": ["English"]})
+        detalle = obtener_detalle_juego(5)
+        self.assertEqual(detalle["name"], "Viejo")
+        self.assertTrue(detalle["is_stale"])
+
+    @patch("juegos.igdb_views.services.igdb")
+    def test_sin_copia_en_redis_usa_la_db(self, mock_igdb):
+        mock_igdb.consultar.side_effect = IGDBNoDisponible("abierto")
+        Idioma.objects.create(id=7, name="English")
+        recargar_idiomas()
+        Juego.objects.create(id=6, name="Local", idiomas=[7])
+        detalle = obtener_detalle_juego(6)
+        self.assertTrue(detalle["is_cached_fallback"])
+        self.assertEqual(detalle["idiomas"], ["English"])
+        self.assertTrue(detalle["is_stale"])
@@ -0,0 +1,131 @@
+from unittest.mock import AsyncMock, patch, Mock
+
+import httpx
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from juegos.igdb_client import AsyncIGDBClient, IGDBClient, IGDBError, MultiQuery
+
+
+def _respuesta(status, datos=None, headers=None):
+    resp = Mock()
+    resp.status_code = status
+    resp.headers = headers or {}
+    resp.json.return_value = datos if datos is not None else []
+    resp.text = ""
+    return resp
+
+
+@override_settings(IS_TESTING=False, IGDB_BASE_URL="http://igdb.local/v4")
+@patch("juegos.igdb_client.limitador", Mock())
+@patch("juegos.igdb_client.obtener_token_igdb", return_value="token")
+@patch("juegos.igdb_client.time.sleep")
+class IGDBClientTest(SimpleTestCase):
+    def test_reutiliza_la_misma_sesion(self, _sleep, _token):
+        cliente = IGDBClient()
+        self.assertIs(cliente._get_session(), cliente._get_session())
+
+    def test_reintenta_429_y_registra_metricas(self, mock_sleep, _token):
+        cliente = IGDBClient()
+        session = Mock()
+        session.post.side_effect = [
+            _respuesta(429, headers={"Retry-After": "1"}),
+            _respuesta(200, [{"id": 1}]),
+        ]
+        cliente._session = session
+
+        datos = cliente.consultar("games", "fields id;")
+
+        self.assertEqual(datos, [{"id": 1}])
+        self.assertEqual(session.post.call_count, 2)
+        mock_sleep.assert_called_once_with(1)
+        url = session.post.call_args.args[0]
+        self.assertEqual(url, "http://igdb.local/v4/games")
+        metricas = cliente.metricas()["games"]
+        self.assertEqual(metricas["llamadas"], 2)
+        self.assertEqual(metricas["errores"], 1)
+        self.assertEqual(metricas["limitadas"], 1)
+
+    def test_error_de_red_lanza_igdberror(self, _sleep, _token):
+        cliente = IGDBClient()
+        session = Mock()
+        session.post.side_effect = requests.ConnectionError("caído")
+        cliente._session = session
+
+        with self.assertRaises(IGDBError):
+            cliente.consultar("games", "fields id;")
+        self.assertEqual(cliente.metricas()["games"]["errores"], 1)
+
+
+class MultiQueryTest(SimpleTestCase):
+    def test_construye_cuerpo_y_reparte_resultados(self):
+        mq = (
+            MultiQuery()
+            .add("generos", "genres", "fields id,name;\n limit 500;")
+            .add("plataformas", "/platforms", "fields id;")
+        )
+        self.assertEqual(
+            mq.cuerpo(),
+            'query genres "generos" { fields id,name; limit 500; };\n'
+            'query platforms "plataformas" { fields id; };',
+        )
+        resultados = mq.repartir([{"name": "generos", "result": [{"id": 1}]}])
+        self.assertEqual(resultados, {"generos": [{"id": 1}], "plataformas": []})
+
+    def test_rechaza_nombres_repetidos(self):
+        mq = MultiQuery().add("a", "games", "fields id;")
+        with self.assertRaises(ValueError):
+            mq.add("a", "games", "fields id;")
+
+
+@override_settings(IS_TESTING=False, IGDB_BASE_URL="http://igdb.local/v4")
+@patch("juegos.igdb_client.limitador", Mock())
+@patch("juegos.igdb_client.time.sleep")
+class IGDBClient401Test(SimpleTestCase):
+    @patch("juegos.igdb_client.gestor_token")
+    @patch("juegos.igdb_client.obtener_token_igdb", return_value="viejo")
+    def test_401_renueva_el_token_y_reintenta_una_vez(self, _token, mock_gestor, _sleep):
+        mock_gestor.invalidar.return_value = "nuevo"
+        cliente = IGDBClient()
+        session = Mock()
+        session.post.side_effect = [_respuesta(401), _respuesta(200, [{"id": 1}])]
+        cliente._session = session
+
+        self.assertEqual(cliente.consultar("games", "fields id;"), [{"id": 1}])
+        mock_gestor.invalidar.assert_called_once_with("viejo")
+        cabeceras = session.post.call_args.kwargs["headers"]
+        self.assertEqual(cabeceras["Authorization"], "Bearer nuevo")
+
+
+@override_settings(IS_TESTING=False, IGDB_BASE_URL="http://igdb.local/v4")
+@patch("juegos.igdb_client.limitador", AsyncMock())
+@patch("juegos.igdb_client.obtener_token_igdb", return_value="token")
+@patch("juegos.igdb_client.asyncio.sleep", new_callable=AsyncMock)
+class AsyncIGDBClientTest(SimpleTestCase):
+    async def test_reintenta_429_sin_bloquear(self, mock_sleep, _token):
+        respuestas = iter([
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(200, json=[{"id": 1}]),
+        ])
+        peticiones = []
+
+        def responder(peticion):
+            peticiones.append(peticion)
+            return next(respuestas)
+
+        cliente = AsyncIGDBClient(transport=httpx.MockTransport(responder))
+        datos = await cliente.consultar("games", "fields id;")
+
+        self.assertEqual(datos, [{"id": 1}])
+        mock_sleep.assert_awaited_once_with(2)
+        self.assertEqual(str(peticiones[-1].url), "http://igdb.local/v4/games")
+        self.assertEqual(peticiones[-1].headers["Authorization"], "Bearer token")
+        self.assertEqual(cliente.metricas()["games"]["llamadas"], 2)
+
+    async def test_error_de_red_lanza_igdberror(self, _sleep, _token):
+        def responder(peticion):
+            raise httpx.ConnectError("caído")
+
+        cliente = AsyncIGDBClient(transport=httpx.MockTransport(responder))
+        with self.assertRaises(IGDBError):
+            await cliente.consultar("games", "fields id;")
@@ -0,0 +1,65 @@
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from juegos.igdb_rate_limit import (
+    FONDO,
+    INTERACTIVA,
+    BUCKET_KEY,
+    ESPERANDO_KEY,
+    EsperaAgotada,
+    LimitadorIGDB,
+    _BucketLocal,
+    _BucketRedis,
+)
+
+
+class LimitadorIGDBTest(SimpleTestCase):
+    def _limitador(self, **kwargs):
+        limitador = LimitadorIGDB(tasa=4, **kwargs)
+        limitador._bucket = _BucketLocal()
+        return limitador
+
+    def test_fondo_respeta_la_reserva_interactiva(self):
+        bucket = _BucketLocal()
+        concedidos = [bucket.intentar(True, 4, 4, 1) == 0 for _ in range(4)]
+        # Tres tokens para fondo; el cuarto queda reservado.
+        self.assertEqual(concedidos, [True, True, True, False])
+        self.assertEqual(bucket.intentar(False, 4, 4, 1), 0)
+
+    def test_fondo_cede_mientras_hay_interactivas_esperando(self):
+        bucket = _BucketLocal()
+        bucket.marcar_esperando(1)
+        self.assertGreater(bucket.intentar(True, 4, 4, 1), 0)
+        self.assertEqual(bucket.intentar(False, 4, 4, 1), 0)
+        bucket.marcar_esperando(-1)
+        self.assertEqual(bucket.intentar(True, 4, 4, 1), 0)
+
+    @override_settings(CACHES={"default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache", "KEY_PREFIX": "games",
+    }})
+    def test_claves_de_redis_con_el_prefijo_de_la_cache(self):
+        conexion = Mock()
+        conexion.register_script.return_value.return_value = 0
+        bucket = _BucketRedis(conexion)
+        bucket.intentar(False, 4, 4, 1)
+        bucket.marcar_esperando(1)
+        claves = [cache.make_key(BUCKET_KEY), cache.make_key(ESPERANDO_KEY)]
+        self.assertTrue(claves[0].startswith("games:"))
+        conexion.register_script.return_value.assert_called_once_with(
+            keys=claves, args=[4, 4, 0, 1]
+        )
+        conexion.pipeline.return_value.incrby.assert_called_once_with(claves[1], 1)
+
+    @patch("juegos.igdb_rate_limit.time.sleep")
+    def test_espera_agotada_y_metricas(self, _sleep):
+        limitador = self._limitador(espera_maxima=0)
+        for _ in range(4):
+            limitador.adquirir(INTERACTIVA)
+        with self.assertRaises(EsperaAgotada):
+            limitador.adquirir(INTERACTIVA)
+        metricas = limitador.metricas()[INTERACTIVA]
+        self.assertEqual(metricas["adquisiciones"], 4)
+        self.assertEqual(metricas["agotadas"], 1)
+        self.assertNotIn(FONDO, limitador.metricas())
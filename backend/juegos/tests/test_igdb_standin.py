@@ -0,0 +1,73 @@
+import requests
+from django.test import SimpleTestCase
+
+from juegos.standin.apicalypse import ErrorConsulta, evaluar, parsear, proyectar
+from juegos.standin.catalogo import Catalogo
+from juegos.standin.servidor import IGDBStandin, arrancar_en_hilo
+
+
+class ApicalypseTest(SimpleTestCase):
+    def test_parsea_consulta_completa(self):
+        consulta = parsear(
+            'fields id,name,cover.url; where id > 10 & (genres = (5,12) | themes = 42);'
+            ' sort updated_at desc; limit 50; offset 5;'
+        )
+        self.assertEqual(consulta.campos, ["id", "name", "cover.url"])
+        self.assertEqual(consulta.sort, ("updated_at", False))
+        self.assertEqual((consulta.limit, consulta.offset), (50, 5))
+        doc = {"id": 11, "genres": [{"id": 12}], "themes": []}
+        self.assertTrue(evaluar(consulta.where, doc))
+        self.assertFalse(evaluar(consulta.where, {**doc, "id": 3}))
+
+    def test_sintaxis_desconocida(self):
+        with self.assertRaises(ErrorConsulta):
+            parsear("fields id; where id >> 3;")
+
+    def test_proyeccion_expande_solo_rutas_con_punto(self):
+        doc = {"id": 1, "genres": [{"id": 5, "name": "Shooter"}], "cover": {"id": 9, "url": "u"}}
+        self.assertEqual(
+            proyectar(doc, ["genres", "cover.url"]),
+            {"id": 1, "genres": [5], "cover": {"id": 9, "url": "u"}},
+        )
+
+
+class CatalogoTest(SimpleTestCase):
+    def setUp(self):
+        self.standin = IGDBStandin(catalogo=Catalogo(1000))
+
+    def test_keyset_por_id(self):
+        status, datos = self.standin.atender(
+            "/v4/games", "fields id,name; where id > 995; sort id asc; limit 10;"
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual([j["id"] for j in datos], [996, 997, 998, 999, 1000])
+
+    def test_multiquery_y_count(self):
+        cuerpo = (
+            'query games "juego" { fields name,language_supports.language.name; where id = 7; };\n'
+            'query language_supports/count "idiomas" { where game = 7; };'
+        )
+        status, datos = self.standin.atender("/v4/multiquery", cuerpo)
+        self.assertEqual(status, 200)
+        self.assertEqual(datos[0]["result"][0]["id"], 7)
+        self.assertEqual(len(datos[0]["result"][0]["language_supports"]), 4)
+        self.assertEqual(datos[1], {"name": "idiomas", "count": 4})
+
+    def test_max_rps_devuelve_429(self):
+        standin = IGDBStandin(catalogo=Catalogo(10), max_rps=2)
+        estados = [standin.atender("/v4/games", "fields id;")[0] for _ in range(5)]
+        self.assertIn(429, estados)
+
+
+class ServidorTest(SimpleTestCase):
+    def test_sirve_token_y_consultas_por_http(self):
+        servidor, url = arrancar_en_hilo(IGDBStandin(catalogo=Catalogo(100)))
+        try:
+            token = requests.post(f"{url}/oauth2/token", data={"grant_type": "client_credentials"})
+            self.assertEqual(token.json()["access_token"], "standin")
+            resp = requests.post(f"{url}/v4/games", data="fields name; where id = 3;")
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.json()[0]["id"], 3)
+        finally:
+            servidor.shutdown()
+            servidor.server_close()
@@ -0,0 +1,45 @@
+import time
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from juegos.igdb_token import LOCK_KEY, TOKEN_CACHE_KEY, GestorTokenIGDB
+
+
+@override_settings(IS_TESTING=False)
+class GestorTokenIGDBTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _guardar(self, token, restante, vida=1000):
+        info = {"token": token, "expira": time.time() + restante, "vida": vida}
+        cache.set(TOKEN_CACHE_KEY, info)
+
+    def test_sin_token_lo_pide_de_forma_sincrona(self):
+        gestor = GestorTokenIGDB()
+        with patch.object(gestor, "_renovar", return_value={"token": "nuevo"}) as renovar:
+            self.assertEqual(gestor.obtener(), "nuevo")
+        renovar.assert_called_once()
+
+    def test_cerca_de_caducar_sirve_el_actual_y_renueva_en_fondo(self):
+        gestor = GestorTokenIGDB(margen=100)
+        self._guardar("actual", restante=50)
+        with patch.object(gestor, "_renovar_en_segundo_plano") as en_fondo, \
+                patch.object(gestor, "_renovar") as renovar:
+            self.assertEqual(gestor.obtener(), "actual")
+        en_fondo.assert_called_once()
+        renovar.assert_not_called()
+
+    def test_renovacion_en_fondo_respeta_el_lock(self):
+        gestor = GestorTokenIGDB()
+        cache.add(LOCK_KEY, 1)
+        with patch("juegos.igdb_token.threading.Thread") as hilo:
+            gestor._renovar_en_segundo_plano()
+        hilo.assert_not_called()
+
+    def test_invalidar_no_descarta_un_token_ya_sustituido(self):
+        gestor = GestorTokenIGDB()
+        self._guardar("nuevo", restante=900)
+        self.assertEqual(gestor.invalidar("viejo"), "nuevo")
+        self.assertIsNotNone(cache.get(TOKEN_CACHE_KEY))
@@ -0,0 +1,87 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from juegos.cache_igdb import CAMPOS_SYNC
+from juegos.igdb_views.services import CAMPOS_DETALLE
+from juegos.ingesta import guardar_juegos
+from juegos.models import Juego
+
+
+class IngestaTest(TestCase):
+    def test_inserta_y_actualiza_en_bloque(self):
+        Juego.objects.create(id=1, name="Viejo", idiomas=[7])
+        # hashes + upsert (3) + clasificaciones (savepoint, 4 borrados del
+        # juego que ya existía, release) + popularidad de los nuevos
+        with self.assertNumQueries(11):
+            resultado = guardar_juegos([
+                {"id": 1, "name": "Nuevo", "first_release_date": 1600000000},
+                {"id": 2, "name": "Otro", "cover": {"id": 3, "url": "//img"}},
+            ])
+        self.assertEqual((resultado["insertados"], resultado["actualizados"]), (1, 1))
+        juego = Juego.objects.get(id=1)
+        self.assertEqual(juego.name, "Nuevo")
+        # Sin language_supports en la consulta no se pisan los idiomas
+        self.assertEqual(juego.idiomas, [7])
+        self.assertEqual(Juego.objects.get(id=2).cover_url, "//img")
+
+    def test_no_reescribe_juegos_sin_cambios(self):
+        lote = [{"id": 1, "name": "Uno", "genres": [5]}, {"id": 2, "name": "Dos"}]
+        guardar_juegos(lote)
+        with self.assertNumQueries(1):  # solo la lectura de hashes
+            resultado = guardar_juegos(lote)
+        self.assertEqual(resultado["sin_cambios"], 2)
+
+        lote[0]["genres"] = [5, 8]
+        resultado = guardar_juegos(lote)
+        self.assertEqual((resultado["actualizados"], resultado["sin_cambios"]), (1, 1))
+        self.assertEqual(Juego.objects.get(id=1).genres, [5, 8])
+
+    def test_campos_opcionales_no_alternan_el_hash(self):
+        detalle = {"id": 1, "name": "Uno", "language_supports": []}
+        guardar_juegos([detalle])
+        # Una escritura sin idiomas (sincronización) no cambia nada
+        self.assertEqual(guardar_juegos([{"id": 1, "name": "Uno"}])["sin_cambios"], 1)
+        self.assertEqual(guardar_juegos([detalle])["sin_cambios"], 1)
+
+        # Pero unos idiomas distintos sí se escriben
+        with patch("juegos.ingesta.ids_idiomas", return_value=[7]):
+            resultado = guardar_juegos([dict(detalle, language_supports=[{"language": 7}])])
+        self.assertEqual(resultado["actualizados"], 1)
+        self.assertEqual(Juego.objects.get(id=1).idiomas, [7])
+
+    def test_sincronizacion_y_detalle_guardan_la_misma_fila(self):
+        # Respuestas de IGDB con la forma de CAMPOS_SYNC y de CAMPOS_DETALLE
+        comun = {
+            "id": 1, "name": "Uno", "slug": "uno", "summary": "Resumen",
+            "first_release_date": 1600000000, "cover": {"id": 9, "url": "//img"},
+            "total_rating": 81.5, "total_rating_count": 40,
+            "genres": [{"id": 5, "name": "RPG"}], "platforms": [{"id": 6, "name": "PC"}],
+            "themes": [{"id": 1, "name": "Action"}], "age_ratings": [{"id": 3, "rating": 11}],
+            "involved_companies": [{"id": 2, "company": {"id": 4, "name": "Estudio"},
+                                    "developer": True, "publisher": False}],
+            "language_supports": [],
+        }
+        for campos in (CAMPOS_SYNC, CAMPOS_DETALLE):
+            pedidos = {c.strip().split(".")[0] for c in campos.split(",")}
+            self.assertLessEqual(set(comun), pedidos)
+        sincronizacion = {**comun, "updated_at": 1700000000}
+        detalle = {
+            **comun, "storyline": "Historia", "aggregated_rating": 90.0, "rating_count": 7,
+            "screenshots": [{"id": 8, "url": "//shot"}], "videos": [{"id": 1, "video_id": "x"}],
+        }
+        guardar_juegos([sincronizacion])
+        self.assertEqual(guardar_juegos([detalle])["sin_cambios"], 1)
+        self.assertEqual(guardar_juegos([sincronizacion])["sin_cambios"], 1)
+        juego = Juego.objects.get(id=1)
+        self.assertEqual((juego.aggregated_rating, juego.rating_count), (81.5, 40))
+
+    def test_aisla_las_filas_que_fallan(self):
+        resultado = guardar_juegos([
+            {"id": 1, "name": "Bien"},
+            {"id": 2, "name": None},  # viola NOT NULL
+            {"name": "Sin id"},
+        ])
+        self.assertEqual(resultado["guardados"], 1)
+        self.assertEqual(sorted(str(f["id"]) for f in resultado["fallidos"]), ["2", "None"])
+        self.assertTrue(Juego.objects.filter(id=1).exists())
@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+from rest_framework.test import APIClient
+
+from juegos.igdb_views.services import buscar_y_cachear
+from juegos.models import Juego
+
+URL = "/api/juegos/populares/"
+
+
+class _CatalogoPaginado:
+    def setUp(self):
+        cache.clear()
+        # Popularidades y nombres repetidos y fechas nulas para probar desempates
+        Juego.objects.bulk_create(
+            Juego(
+                id=i,
+                name=f"Juego {i % 7}",
+                popularidad=float(i % 5),
+                first_release_date=None if i % 4 == 0
+                else datetime(2000 + i % 6, 1, 1, tzinfo=timezone.utc),
+            )
+            for i in range(1, 24)
+        )
+        self.cliente = APIClient()
+
+    def _recorrer(self, orden, cursor="", campo="siguiente", q=""):
+        ids, paginas = [], 0
+        while cursor is not None:
+            respuesta = self.cliente.get(
+                URL, {"orden": orden, "por_pagina": 5, "cursor": cursor, "q": q}
+            )
+            self.assertEqual(respuesta.status_code, 200)
+            datos = respuesta.json()
+            pagina = [j["id"] for j in datos["juegos"]]
+            ids = ids + pagina if campo == "siguiente" else pagina + ids
+            cursor = datos[campo]
+            paginas += 1
+        return ids, paginas, datos
+
+
+class PaginacionPorCursorTest(_CatalogoPaginado, TestCase):
+    def test_recorre_cada_orden_en_ambos_sentidos(self):
+        for orden in ("popular", "popular_asc", "nombre", "nombre_asc", "fecha", "fecha_asc"):
+            with self.subTest(orden=orden):
+                asc = orden.endswith("_asc")
+                esperado = list(buscar_y_cachear(
+                    orden=orden.removesuffix("_asc"), asc=asc
+                ).values_list("id", flat=True))
+                ids, paginas, ultima = self._recorrer(orden)
+                self.assertEqual(ids, esperado)
+                self.assertEqual(paginas, 5)
+
+                # Desde la última página hacia atrás se vuelve al principio
+                atras, _, primera = self._recorrer(orden, ultima["anterior"], "anterior")
+                self.assertEqual(atras + ids[-3:], esperado)
+                self.assertIsNone(primera["anterior"])
+
+    def test_cursor_invalido_o_de_otro_orden(self):
+        siguiente = self.cliente.get(URL, {"cursor": "", "por_pagina": 5}).json()["siguiente"]
+        self.assertEqual(self.cliente.get(URL, {"cursor": "basura"}).status_code, 400)
+        respuesta = self.cliente.get(URL, {"cursor": siguiente, "orden": "fecha"})
+        self.assertEqual(respuesta.status_code, 400)
+
+    def test_no_cuenta_filas(self):
+        siguiente = self.cliente.get(URL, {"cursor": "", "por_pagina": 5}).json()["siguiente"]
+        with self.assertNumQueries(1):
+            self.cliente.get(URL, {"cursor": siguiente, "por_pagina": 5})
+
+
+class BusquedaPaginadaTest(_CatalogoPaginado, TransactionTestCase):
+    """Filas confirmadas para que las vea el índice FULLTEXT de MySQL."""
+
+    def test_busqueda_ordenada_por_relevancia(self):
+        esperado = list(buscar_y_cachear(q="juego").values_list("id", flat=True))
+        ids, _, _ = self._recorrer("popular", q="juego")
+        self.assertEqual(len(esperado), 23)
+        self.assertEqual(ids, esperado)
@@ -2,7 +2,9 @@ from django.test import TestCase
 from unittest.mock import patch
 from django.utils import timezone
 from datetime import timedelta
-from juegos.models import Juego
+from juegos.models import Idioma, Juego
+from juegos.igdb_client import igdb
+from juegos.idiomas import recargar_idiomas
 from juegos.igdb_views.services import obtener_detalle_juego, obtener_filtros
 
 from django.core.cache import cache
@@ -27,7 +29,7 @@ class PerformanceTest(TestCase):
         # Forzamos que updated_at sea viejo (django auto_now lo pone a now al guardar)
         Juego.objects.filter(id=67890).update(updated_at=timezone.now() - timedelta(days=10))
 
-    @patch('juegos.igdb_views.services.requests.post')
+    @patch.object(igdb, 'post')
     def test_obtener_detalle_usa_cache_local(self, mock_post):
         """Prueba que si el juego es reciente, NO se llama a la API de IGDB."""
         
@@ -38,10 +40,10 @@ class PerformanceTest(TestCase):
         self.assertIsNotNone(resultado)
         self.assertEqual(resultado['name'], "Juego Test Reciente")
         
-        # Verificar que NO se llamó a requests.post
+        # Verificar que NO se llamó a IGDB
         mock_post.assert_not_called()
 
-    @patch('juegos.igdb_views.services.requests.post')
+    @patch.object(igdb, 'post')
     def test_obtener_detalle_actualiza_si_es_antiguo(self, mock_post):
         """Prueba que si el juego es antiguo, SI se llama a la API de IGDB."""
         
@@ -52,21 +54,28 @@ class PerformanceTest(TestCase):
             "id": 67890,
             "name": "Juego Test Actualizado",
             "slug": "juego-test-actualizado",
-            "first_release_date": 1600000000
+            "first_release_date": 1600000000,
+            "language_supports": [{"id": 1, "language": 26}, {"id": 2, "language": 26}],
         }]
+        Idioma.objects.create(id=26, name="Spanish", native_name="Español")
+        recargar_idiomas()
         
         # Ejecutar servicio para juego antiguo
         resultado = obtener_detalle_juego(67890)
         
-        # Verificar que SI se llamó a requests.post
+        # Verificar que SI se llamó a IGDB
         self.assertTrue(mock_post.called)
         
         # Verificar que se actualizó el nombre (simulado por el mock)
         # Nota: obtener_detalle_juego devuelve el dict, no el objeto DB
         self.assertEqual(resultado['name'], "Juego Test Actualizado")
+        self.assertEqual(resultado['idiomas'], ["Spanish"])
+        # Los idiomas salen de la tabla local: un único viaje a IGDB
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(Juego.objects.get(id=67890).idiomas, [26])
 
     @patch('juegos.igdb_views.services.cache')
-    @patch('juegos.igdb_views.services.requests.post')
+    @patch.object(igdb, 'post')
     def test_obtener_filtros_usa_redis(self, mock_post, mock_cache):
         """Prueba que obtener_filtros usa caché de Redis."""
         
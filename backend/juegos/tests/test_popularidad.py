@@ -0,0 +1,48 @@
+import threading
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from juegos.ingesta import guardar_juegos
+from juegos.models import EstadoSincronizacion, Juego, PopularidadJuego
+from juegos.popularidad import ESTADO_POPULARIDAD, popularidad_pendiente, sincronizar_popularidad
+from juegos.standin.catalogo import Catalogo
+from juegos.standin.servidor import IGDBStandin
+
+
+@patch("juegos.popularidad.BATCH_SIZE", 40)
+class PopularidadTest(TestCase):
+    def setUp(self):
+        standin = IGDBStandin(catalogo=Catalogo(100))
+        patcher = patch("juegos.popularidad.igdb")
+        self.igdb = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.igdb.consultar.side_effect = lambda endpoint, cuerpo, **_: standin.resolver(endpoint, cuerpo)
+        Juego.objects.bulk_create(Juego(id=i, name=f"Juego {i}") for i in range(1, 51))
+
+    def test_guarda_primitivas_y_pliega_en_juego(self):
+        self.assertEqual(sincronizar_popularidad(), 400)
+        self.assertEqual(PopularidadJuego.objects.count(), 400)
+        esperado = sum(PopularidadJuego.objects.filter(game_id=7).values_list("valor", flat=True))
+        self.assertAlmostEqual(Juego.objects.get(id=7).popularidad, esperado)
+        self.assertFalse(popularidad_pendiente())
+
+        # Un juego que llega después recibe la popularidad ya descargada
+        guardar_juegos([{"id": 80, "name": "Tardío"}])
+        self.assertGreater(Juego.objects.get(id=80).popularidad, 0)
+
+    def test_reanuda_tras_interrupcion(self):
+        detener = threading.Event()
+        consultar = self.igdb.consultar.side_effect
+
+        def parar_tras_un_lote(*args, **kwargs):
+            detener.set()
+            return consultar(*args, **kwargs)
+
+        self.igdb.consultar.side_effect = parar_tras_un_lote
+        self.assertEqual(sincronizar_popularidad(detener), 40)
+        self.assertEqual(EstadoSincronizacion.objects.get(nombre=ESTADO_POPULARIDAD).ultimo_id, 40)
+        self.assertTrue(popularidad_pendiente())
+
+        self.igdb.consultar.side_effect = consultar
+        self.assertEqual(sincronizar_popularidad(), 360)
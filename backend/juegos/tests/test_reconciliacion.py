@@ -0,0 +1,50 @@
+from array import array
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from juegos.igdb_views.services import buscar_y_cachear
+from juegos.ingesta import guardar_juegos
+from juegos.models import Juego
+from juegos.reconciliacion import cruzar, reconciliacion_pendiente, reconciliar
+from juegos.standin.catalogo import Catalogo
+from juegos.standin.servidor import IGDBStandin
+
+
+@patch("juegos.reconciliacion.TAMANO_TRAMO", 100)
+class ReconciliacionTest(TestCase):
+    def setUp(self):
+        self.catalogo = Catalogo(300)
+        standin = IGDBStandin(catalogo=self.catalogo)
+        patcher = patch("juegos.reconciliacion.igdb")
+        self.igdb = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.igdb.consultar.side_effect = lambda endpoint, cuerpo, **_: standin.resolver(endpoint, cuerpo)
+        Juego.objects.bulk_create(Juego(id=i, name=f"Juego {i}") for i in range(1, 301))
+
+    def test_cruce_de_arrays_ordenados(self):
+        solo, comunes = cruzar(array("q", [1, 3, 5, 7, 9]), array("q", [2, 3, 4, 9, 10]))
+        self.assertEqual((list(solo), list(comunes)), ([1, 5, 7], [3, 9]))
+
+    def test_marca_retirados_y_recupera_los_que_vuelven(self):
+        self.catalogo.eliminados.update({5, 150, 299})
+        self.assertEqual(reconciliar(), {"eliminados": 3, "recuperados": 0})
+        self.assertEqual(
+            list(Juego.objects.filter(eliminado=True).values_list("id", flat=True)), [5, 150, 299]
+        )
+        self.assertNotIn(5, buscar_y_cachear().values_list("id", flat=True))
+        self.assertFalse(reconciliacion_pendiente())
+
+        self.catalogo.eliminados.discard(150)
+        self.assertEqual(reconciliar(), {"eliminados": 0, "recuperados": 1})
+        self.assertFalse(Juego.objects.get(id=150).eliminado)
+
+    def test_una_escritura_de_igdb_quita_la_lapida(self):
+        Juego.objects.filter(id=7).update(eliminado=True)
+        guardar_juegos([{"id": 7, "name": "Juego 7"}])
+        self.assertFalse(Juego.objects.get(id=7).eliminado)
+
+    @patch("juegos.reconciliacion.MIN_SOSPECHOSOS", 10)
+    def test_no_marca_nada_ante_una_respuesta_sospechosa(self):
+        self.catalogo.eliminados.update(range(101, 201))
+        self.assertEqual(reconciliar()["eliminados"], 0)
@@ -0,0 +1,45 @@
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from juegos.lider_sync import backend_concesiones
+from juegos.single_flight import single_flight
+
+
+class SingleFlightTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_lider_calcula_y_libera_el_lock(self):
+        calcular = Mock(return_value={"id": 1})
+        self.assertEqual(single_flight("clave", calcular), {"id": 1})
+        calcular.assert_called_once()
+        self.assertIsNone(cache.get("clave:lock"))
+
+    @patch("juegos.single_flight.time.sleep")
+    def test_seguidor_reutiliza_el_resultado_del_lider(self, mock_sleep):
+        cache.add("clave:lock", 1)
+        mock_sleep.side_effect = lambda _: cache.set("clave", {"id": 2})
+        calcular = Mock()
+        self.assertEqual(single_flight("clave", calcular), {"id": 2})
+        calcular.assert_not_called()
+
+    def test_lider_reutiliza_lo_guardado_por_el_anterior(self):
+        cache.set("clave", {"id": 3})
+        calcular = Mock()
+        self.assertEqual(single_flight("clave", calcular), {"id": 3})
+        calcular.assert_not_called()
+
+    def test_no_suelta_un_lock_que_ya_es_de_otro(self):
+        locks = backend_concesiones()
+
+        def calcular():
+            # El lock caduca durante el cálculo y otra llamada lo toma
+            cache.delete("clave:lock")
+            locks.tomar("clave:lock", "otro", 15)
+            return {"id": 4}
+
+        self.assertEqual(single_flight("clave", calcular), {"id": 4})
+        self.assertEqual(locks.titular("clave:lock"), "otro")
+        locks.soltar("clave:lock", "otro")
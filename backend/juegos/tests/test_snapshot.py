@@ -0,0 +1,44 @@
+import io
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from juegos import ingesta
+from juegos.models import EstadoSincronizacion, Juego
+from juegos.snapshot import SnapshotInvalido, exportar, importar
+
+
+class SnapshotTest(TestCase):
+    def test_ida_y_vuelta_por_bloques(self):
+        fecha = datetime(2020, 5, 1, tzinfo=timezone.utc)
+        Juego.objects.bulk_create(
+            Juego(id=i, name=f"Juego {i}", first_release_date=fecha, genres=[i % 3], hash_contenido=i)
+            for i in range(1, 26)
+        )
+        EstadoSincronizacion.objects.create(nombre="catalogo", marca_updated_at=1700000000, ultimo_id=7)
+        fichero = io.BytesIO()
+        self.assertEqual(exportar(fichero, tamano_bloque=10), 25)
+
+        Juego.objects.all().delete()
+        EstadoSincronizacion.objects.all().delete()
+        Juego.objects.create(id=3, name="Local")
+        fichero.seek(0)
+        with patch("juegos.snapshot.upsert", wraps=ingesta.upsert) as upsert:
+            self.assertEqual(importar(fichero), 25)
+        self.assertEqual(upsert.call_count, 3)
+
+        juego = Juego.objects.get(id=3)
+        self.assertEqual((juego.name, juego.first_release_date, juego.genres), ("Juego 3", fecha, [0]))
+        self.assertEqual(Juego.objects.count(), 25)
+        estado = EstadoSincronizacion.objects.get(nombre="catalogo")
+        self.assertEqual((estado.marca_updated_at, estado.ultimo_id), (1700000000, 7))
+
+    def test_rechaza_ficheros_truncados(self):
+        Juego.objects.create(id=1, name="Uno")
+        fichero = io.BytesIO()
+        exportar(fichero)
+        with self.assertRaises(SnapshotInvalido):
+            importar(io.BytesIO(fichero.getvalue()[:-10]))
+        with self.assertRaises(SnapshotInvalido):
+            importar(io.BytesIO(b"otra cosa"))
@@ -0,0 +1,28 @@
+from unittest.mock import AsyncMock, patch
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+from juegos.igdb_views import vistas_async
+from juegos.igdb_views.services import _detalle_cache_key
+
+
+class VistasAsyncTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    async def test_detalle_desde_cache_sin_llamar_a_igdb(self):
+        await cache.aset(_detalle_cache_key(5), {"id": 5, "name": "En caché"})
+        with patch("juegos.igdb_views.services.igdb_async") as mock_igdb:
+            resp = await vistas_async.detalle_juego(self.factory.get("/"), id=5)
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn(b"En cach", resp.content)
+        mock_igdb.consultar.assert_not_called()
+
+    @patch("juegos.igdb_views.vistas_async.buscar_hltb_async", new_callable=AsyncMock)
+    async def test_tiempo_sin_resultados(self, mock_hltb):
+        mock_hltb.return_value = []
+        resp = await vistas_async.tiempo_juego(self.factory.get("/", {"nombre": "Nada"}))
+        self.assertEqual(resp.status_code, 200)
+        self.assertJSONEqual(resp.content, {"found": False})
@@ -1,8 +1,13 @@
 """Definición de rutas para la API de juegos."""
 
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
+from .igdb_views import vistas_async
+
+# Con ASGI las vistas que solo esperan a IGDB/HLTB se sirven en versión async
+vistas_io = vistas_async if settings.VISTAS_ASYNC else views
 
 router = DefaultRouter()
 router.register(r"biblioteca", views.BibliotecaViewSet, basename="biblioteca")
@@ -19,14 +24,16 @@ urlpatterns = [
     path("filtros/", views.filtros_juegos, name="filtros_juegos"),
     # Listado de juegos (alias populares/)
     path("populares/", views.listar_juegos, name="listar_juegos"),
+    # Detalle de varios juegos: ?ids=1,2,3
+    path("detalle/batch/", views.detalle_juegos_batch, name="detalle_juegos_batch"),
     # Detalle de un juego por ID
-    path("detalle/<int:id>/", views.detalle_juego, name="detalle_juego"),
+    path("detalle/<int:id>/", vistas_io.detalle_juego, name="detalle_juego"),
     # Rutas de BibliotecaViewSet: list, create, retrieve, update, destroy...
     path("", include(router.urls)),
     # Juegos por ID
-    path("buscar_id/", views.buscar_juego_por_id, name="buscar_juego_por_id"),
+    path("buscar_id/", vistas_io.buscar_juego_por_id, name="buscar_juego_por_id"),
     path("valoracion/<int:juego_id>/", views.valorar_juego, name="valorar_juego"),
     path("buscar_en_biblioteca/", views.buscar_en_biblioteca),
-    path("tiempo/", views.tiempo_juego, name="tiempo_juego"),
+    path("tiempo/", vistas_io.tiempo_juego, name="tiempo_juego"),
     path("recomendados/", views.recomendaciones_usuario, name="recomendados"),
 ]
@@ -0,0 +1,72 @@
+"""Versión del catálogo local, compartida por las cachés derivadas de ``Juego``.
+
+Es un contador en la caché compartida que se incrementa cada vez que la
+sincronización escribe en el catálogo. Las cachés de conteos y de resultados
+de listados incluyen la versión en sus claves, así que invalidarlas todas es
+un ``INCR``: las entradas antiguas dejan de leerse y caducan solas, sin
+recorrer claves.
+
+Una pasada de sincronización escribe cientos de lotes; si cada uno
+incrementara la versión las cachés no acertarían nunca mientras dura. Con
+``version_aplazada`` los incrementos del hilo se acumulan y se aplican con uno
+solo al salir (al final de la pasada o del tramo).
+
+Si el contador desaparece (Redis reiniciado o desalojo) se vuelve a crear con
+la hora actual en microsegundos, mayor que cualquier versión anterior (no
+hay un incremento por microsegundo), para no reutilizar claves de un
+catálogo distinto.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+
+CLAVE_VERSION = "catalogo:version"
+
+_aplazada = threading.local()
+
+
+def _inicial():
+    return time.time_ns() // 1000
+
+
+def version_catalogo():
+    """Versión actual del catálogo."""
+    version = cache.get(CLAVE_VERSION)
+    if version is None:
+        cache.add(CLAVE_VERSION, _inicial(), None)
+        version = cache.get(CLAVE_VERSION) or _inicial()
+    return version
+
+
+def incrementar_version():
+    """Marca que el catálogo ha cambiado y devuelve la nueva versión.
+
+    Dentro de ``version_aplazada`` solo anota el cambio y devuelve ``None``.
+    """
+    if getattr(_aplazada, "nivel", 0):
+        _aplazada.pendiente = True
+        return None
+    try:
+        return cache.incr(CLAVE_VERSION)
+    except ValueError:  # la clave no existe
+        cache.add(CLAVE_VERSION, _inicial(), None)
+        return version_catalogo()
+
+
+@contextmanager
+def version_aplazada():
+    """Agrupa los incrementos del hilo en uno solo al salir del bloque más externo."""
+    nivel = getattr(_aplazada, "nivel", 0)
+    if not nivel:
+        _aplazada.pendiente = False
+    _aplazada.nivel = nivel + 1
+    try:
+        yield
+    finally:
+        _aplazada.nivel = nivel
+        if not nivel and _aplazada.pendiente:
+            _aplazada.pendiente = False
+            incrementar_version()
@@ -3,6 +3,7 @@
 from .igdb_views.views import (
     listar_juegos,
     detalle_juego,
+    detalle_juegos_batch,
     filtros_juegos,
     stats_bienvenida,
     buscar_juego_por_id,
@@ -22,6 +23,7 @@ from .developer import JuegoDevViewSet
 __all__ = [
     "listar_juegos",
     "detalle_juego",
+    "detalle_juegos_batch",
     "filtros_juegos",
     "stats_bienvenida",
     "buscar_juego_por_id",
@@ -1,6 +1,11 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
 urlpatterns = [
-    path('consultar/', views.consultar_precios, name='consultar_precios'),
+    path(
+        'consultar/',
+        views.consultar_precios_async if settings.VISTAS_ASYNC else views.consultar_precios,
+        name='consultar_precios',
+    ),
 ]
\ No newline at end of file
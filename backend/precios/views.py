@@ -1,3 +1,5 @@
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
@@ -18,3 +20,17 @@ def consultar_precios(request):
             return Response(data, status=resp.status_code)
     except httpx.HTTPError as e:
         return Response({"message": str(e)}, status=500)
+
+
+@require_GET
+async def consultar_precios_async(request):
+    """Igual que ``consultar_precios`` pero sin bloquear el worker (ASGI)."""
+    game = request.GET.get("game")
+    if not game:
+        return JsonResponse({"message": "Missing 'game' parameter"}, status=400)
+    try:
+        async with httpx.AsyncClient(timeout=60) as client:
+            resp = await client.get(FASTAPI_URL, params={"game": game})
+            return JsonResponse(resp.json(), status=resp.status_code, safe=False)
+    except httpx.HTTPError as e:
+        return JsonResponse({"message": str(e)}, status=500)
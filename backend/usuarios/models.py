@@ -1,6 +1,7 @@
 """Modelos para la aplicación de usuarios."""
 
 from django.contrib.auth.models import User  # Modelo base de Django
+from django.core.cache import cache
 from django.db import models
 import os  # Para construir la ruta de los avatares
 from django.utils.deconstruct import deconstructible
@@ -49,6 +50,32 @@ class Perfil(models.Model):
     # Tiempo total jugado en todos los juegos
     tiempo_total = models.DurationField(default=timedelta())
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        cache.set(_clave_filtro_adulto(self.user_id), self.filtro_adulto, FILTRO_ADULTO_TTL)
+
     def __str__(self) -> str:
         """Representación legible del perfil."""
         return f"{self.user.username} - {self.rol}"
+
+
+# El listado de juegos consulta ``filtro_adulto`` en cada petición; se guarda
+# en caché al guardar el perfil para no tener que leerlo de la DB
+FILTRO_ADULTO_TTL = 86400
+
+
+def _clave_filtro_adulto(user_id):
+    return f"perfil_filtro_adulto_{user_id}"
+
+
+def filtro_adulto_de(user):
+    """Preferencia de ocultar contenido adulto de ``user`` (siempre ``True`` si es anónimo)."""
+    if not user.is_authenticated:
+        return True
+    clave = _clave_filtro_adulto(user.pk)
+    valor = cache.get(clave)
+    if valor is None:
+        valor = Perfil.objects.filter(user=user).values_list("filtro_adulto", flat=True).first()
+        valor = True if valor is None else valor
+        cache.set(clave, valor, FILTRO_ADULTO_TTL)
+    return valor